@@ -1,12 +1,24 @@
 """Default execution entry point if running the package via python -m."""
-from dpp import runner
+import signal
 import sys
 
 
 def main():
     """Run dpp from script entry point."""
-    return runner.main()
+    # Abort program execution on ctrl+c
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+
+    # Forward command line calls to a running daemon which keeps the plugins loaded (see --serve). This happens before
+    # the runner is imported, since importing it loads Qt and the user interface.
+    if '--serve' not in sys.argv:
+        import dpp.client
+        exit_code = dpp.client.main(sys.argv[1:], is_required='--client' in sys.argv)
+        if exit_code is not None:
+            return exit_code
+
+    import dpp.runner
+    return dpp.runner.main()
 
 
 if __name__ == '__main__':
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
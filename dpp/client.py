@@ -0,0 +1,182 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# The client only depends on the standard library, so that it starts fast when the plugins are kept loaded by a daemon
+# (see dpp.core.daemon). Importing dpp.core would load Qt.
+import json
+import os
+import socket
+import stat
+import struct
+import sys
+import tempfile
+from typing import List, Optional, Tuple
+
+_LENGTH = struct.Struct('>I')
+
+# Arguments which are forwarded to the daemon, mapped to the type of action.
+_ACTIONS = {
+    '-e': 'encode', '--encode': 'encode',
+    '-d': 'decode', '--decode': 'decode',
+    '-h': 'hash', '--hash': 'hash',
+    '-s': 'script', '--script': 'script',
+}
+
+
+def socket_path() -> str:
+    """ :returns the path of the socket of the daemon, which is private to the current user. """
+    directory = os.environ.get('XDG_RUNTIME_DIR') or tempfile.gettempdir()
+    return os.path.join(directory, f'dpp-{os.getuid()}.sock')
+
+
+def verify_socket(path: str):
+    """
+    Verifies that the socket is owned by the current user and not accessible by others. Otherwise another user might
+    have created it within a shared directory (e.g. /tmp) to receive the input of all calls.
+    :raises FileNotFoundError when the socket does not exist.
+    :raises PermissionError when the socket is owned by another user or accessible by others.
+    """
+    status = os.lstat(path)
+    if not stat.S_ISSOCK(status.st_mode) or status.st_uid != os.getuid() or status.st_mode & 0o077:
+        raise PermissionError(f'Refusing to use {path}! Expected a socket which is private to the current user.')
+
+
+def send_frame(connection: socket.socket, data: bytes):
+    """ Sends the data prefixed by its length. """
+    connection.sendall(_LENGTH.pack(len(data)) + data)
+
+
+def _receive_exactly(connection: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        data = connection.recv(min(size - len(buffer), 1024 * 1024))
+        if not data:
+            raise ConnectionError('Connection closed unexpectedly!')
+        buffer += data
+    return bytes(buffer)
+
+
+def receive_frame(connection: socket.socket) -> bytes:
+    """ :returns the data of the next length-prefixed frame. """
+    length, = _LENGTH.unpack(_receive_exactly(connection, _LENGTH.size))
+    return _receive_exactly(connection, length)
+
+
+def request(actions: List[Tuple[str, List[str]]], data: bytes, path: str = None) -> bytes:
+    """
+    Runs the actions on the data using the daemon.
+    :param actions: the types of the actions together with the name of the plugin and its options
+                    (e.g. [('decode', ['base64']), ('script', ['search_and_replace', 'search_term=a'])]).
+    :param data: the input.
+    :param path: the path of the socket (default = socket_path()).
+    :returns the output.
+    :raises ConnectionError when the daemon is not running or the socket is not private to the current user.
+    :raises Exception when running the actions failed.
+    """
+    path = path or socket_path()
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        try:
+            verify_socket(path)
+            connection.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError) as err:
+            raise ConnectionError(f'Daemon is not running! {err}')
+        except PermissionError as err:
+            raise ConnectionError(str(err))
+        send_frame(connection, json.dumps({'actions': actions}).encode('utf-8'))
+        send_frame(connection, data)
+        header = json.loads(receive_frame(connection))
+        output = receive_frame(connection)
+    if header.get('error'):
+        raise Exception(header['error'])
+    return output
+
+
+def parse_arguments(arguments: List[str]) -> Optional[Tuple[List[Tuple[str, List[str]]], Optional[str], Optional[str]]]:
+    """
+    Parses the subset of the command line arguments of dpp which can be forwarded to the daemon.
+    :returns the actions, the input and the input file, or None when other arguments were specified.
+    """
+    actions, input_text, file = [], None, None
+    index = 0
+    while index < len(arguments):
+        argument = arguments[index]
+        index += 1
+        if argument == '--client':
+            continue
+        if argument in ('-f', '--file'):
+            if file is not None or index == len(arguments):
+                return None
+            file = arguments[index]
+            index += 1
+        elif argument in _ACTIONS:
+            values = []
+            # Scripts accept options (e.g. -s search_and_replace search_term=a), other actions a single name.
+            while index < len(arguments) and not arguments[index].startswith('-') and \
+                    (not values or _ACTIONS[argument] == 'script'):
+                values.append(arguments[index])
+                index += 1
+            if not values:
+                return None
+            actions.append((_ACTIONS[argument], values))
+        elif argument.startswith('-') or input_text is not None:
+            return None
+        else:
+            input_text = argument
+    if not actions:
+        return None
+    if input_text is None and file is None and actions[-1][0] == 'script' and len(actions[-1][1]) > 1:
+        # The same as dpp does, the last value of the last script is used as input.
+        input_text = actions[-1][1].pop()
+    return actions, input_text, file
+
+
+def main(arguments: List[str] = None, is_required: bool = True) -> Optional[int]:
+    """
+    Forwards the command line to the daemon.
+    :param arguments: the command line arguments (default = sys.argv[1:]).
+    :param is_required: whether to fail when the arguments can not be forwarded or the daemon is not running,
+                        otherwise None is returned so that the caller can process the arguments itself.
+    :returns the exit code.
+    """
+    parsed = parse_arguments(sys.argv[1:] if arguments is None else arguments)
+    if parsed is None or (parsed[1] is None and parsed[2] is None):
+        if not is_required:
+            return None
+        print('ERROR: Invalid arguments! Expected actions (-e/-d/-h/-s) and an input or --file.', file=sys.stderr)
+        return 1
+    actions, input_text, file = parsed
+    try:
+        if file is not None:
+            with open(file, 'rb') as f:
+                data = f.read()
+        else:
+            data = input_text.encode('utf-8', errors='surrogateescape')
+        output = request(actions, data)
+    except ConnectionError as err:
+        if not is_required:
+            return None
+        print(f'ERROR: {err}', file=sys.stderr)
+        return 1
+    except Exception as err:
+        print(f'ERROR: {err}', file=sys.stderr)
+        return 1
+    sys.stdout.buffer.write(output + b'\n')
+    sys.stdout.buffer.flush()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,332 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import atexit
+import collections
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Sequence, Union
+
+from dpp.core import batch
+
+
+class Chain:
+    """
+    Records a chain of actions using the same interface as the builder (see dpp.core.decoder_plus_plus). Plugins are
+    looked up when the chain is run, so that chains can be defined before the plugins are loaded.
+
+    Example:
+
+        Chain().decode().base64().script().search_and_replace(search_term='a', replace_term='o').hash().md5()
+    """
+
+    def __init__(self, actions: Sequence[batch.Action] = ()):
+        self._actions = tuple(actions)
+
+    @property
+    def actions(self) -> List[batch.Action]:
+        return list(self._actions)
+
+    def decode(self) -> '_Step':
+        """ Returns the decoder interface which encapsulates all possible decoding methods. """
+        return _Step(self, 'decode')
+
+    def encode(self) -> '_Step':
+        """ Returns the encoder interface which encapsulates all possible encoding methods. """
+        return _Step(self, 'encode')
+
+    def hash(self) -> '_Step':
+        """ Returns the hash interface which encapsulates all possible hashing methods. """
+        return _Step(self, 'hash')
+
+    def script(self) -> '_Step':
+        """ Returns the script interface which encapsulates all possible scripting methods. """
+        return _Step(self, 'script')
+
+    def __repr__(self) -> str:
+        return f'Chain({self.actions!r})'
+
+
+class _Step:
+    """ Adds an action of a specific type to a chain (e.g. base64 of Chain().decode()). """
+
+    def __init__(self, chain: Chain, type: str):
+        self._chain = chain
+        self._type = type
+
+    def __getattr__(self, name: str):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        def _action(**config) -> Chain:
+            return Chain(self._chain.actions + [batch.Action(batch.TYPES[self._type], name, config)])
+        return _action
+
+
+def _key(actions: List[batch.Action]) -> str:
+    """ :returns the structure of the chain, which identifies its configured plugins within the chain caches. """
+    return repr([(action.type, action.name, sorted(action.config.items())) for action in actions])
+
+
+def _transform(plugins: List['dpp.core.plugin.AbstractPlugin'], data: bytes, cancelled, slot: int) -> bytes:
+    """ Runs the plugins on the data. Stops before running the next plugin as soon as the call was cancelled. """
+    text = data.decode('utf-8', errors='surrogateescape')
+    for plugin in plugins:
+        if cancelled[slot]:
+            raise CancelledError()
+        text = plugin.run(text)
+    return text.encode('utf-8', errors='surrogateescape')
+
+
+_worker_chains: batch.ChainCache = None
+_worker_cancelled = None
+
+
+def _init_worker(app_id: str, app_path: str, cancelled):
+    """ Loads the plugins once per worker process. """
+    global _worker_chains, _worker_cancelled
+    from dpp.core import Context
+    _worker_chains = batch.ChainCache(Context(app_id, app_path))
+    _worker_cancelled = cancelled
+
+
+def _run_in_worker(key: str, actions: List[batch.Action], data: bytes, slot: int) -> bytes:
+    """ Executed within the process pool. """
+    return _transform(_worker_chains.get(key, lambda: actions), data, _worker_cancelled, slot)
+
+
+class _Slots:
+    """
+    Limits the number of calls in flight. Each call owns a slot until its work is done, which is used to signal the
+    cancellation of the call to the thread or process doing the work. Since slots are released by the threads of the
+    executors, the slots are thread-safe and can be acquired from any event loop.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self._lock = threading.Lock()
+        self._free = collections.deque(range(size))
+        self._waiters = collections.deque()
+
+    async def acquire(self) -> int:
+        with self._lock:
+            if self._free and not self._waiters:
+                return self._free.popleft()
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the call was cancelled.
+                self.release(waiter.result())
+            raise
+
+    def _hand_over(self, waiter: asyncio.Future, slot: int):
+        if waiter.done():
+            self.release(slot)
+        else:
+            waiter.set_result(slot)
+
+    def release(self, slot: int):
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter.get_loop().call_soon_threadsafe(self._hand_over, waiter, slot)
+                    return
+                except RuntimeError:
+                    # The event loop of the waiter was closed.
+                    continue
+            self._free.append(slot)
+
+
+class AsyncRunner:
+    """
+    Runs chains of plugins without blocking the event loop. Chains of plugins which release the GIL (e.g. hashlib or
+    zlib) are run by a pool of threads, all other chains by a pool of processes which load the plugins once. Each
+    thread and process configures its own copies of the plugins, since plugins are not thread-safe.
+
+    Calls which time out or are cancelled are cancelled within the executor as well. Work which already started stops
+    before running the next plugin of the chain, and keeps its slot of the concurrency limit until then.
+
+    Example:
+
+        async with AsyncRunner(context, timeout=5) as runner:
+            await runner.run(Chain().decode().base64().hash().md5(), 'aGVsbG8=')  # '5d41402abc4b2a76b9719d911017c592'
+    """
+
+    def __init__(self, context: 'dpp.core.context.Context', max_workers: int = None, max_concurrency: int = None,
+                 timeout: float = None):
+        """
+        :param context: the application context.
+        :param max_workers: the maximum number of threads and of processes (default = number of cpus). Chains are only
+                            run by processes when at least two workers are allowed.
+        :param max_concurrency: the maximum number of calls in flight (default = 2 * max_workers). Further calls wait.
+        :param timeout: the default timeout of calls in seconds (default = None = no timeout).
+        """
+        self._context = context
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._timeout = timeout
+        self._slots = _Slots(max_concurrency or 2 * self._max_workers)
+        self._cancelled = multiprocessing.RawArray('b', self._slots.size)
+        self._chains = batch.ChainCache(context)
+        self._threads = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix='dpp-aio')
+        self._processes = None
+        self._lock = threading.Lock()
+
+    def _process_pool(self, is_broken: bool = False) -> ProcessPoolExecutor:
+        with self._lock:
+            if is_broken and self._processes:
+                self._processes.shutdown(wait=False, cancel_futures=True)
+                self._processes = None
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self._max_workers, initializer=_init_worker,
+                    initargs=(self._context.getAppID(), self._context.getAppPath(), self._cancelled))
+            return self._processes
+
+    def _run_in_thread(self, key: str, actions: List[batch.Action], data: bytes, slot: int) -> bytes:
+        return _transform(self._chains.get(key, lambda: actions), data, self._cancelled, slot)
+
+    def _submit(self, plugins: List['dpp.core.plugin.AbstractPlugin'], key: str, actions: List[batch.Action],
+                data: bytes, slot: int) -> Future:
+        if self._max_workers < 2 or all(plugin.releases_gil for plugin in plugins):
+            return self._threads.submit(self._run_in_thread, key, actions, data, slot)
+        try:
+            return self._process_pool().submit(_run_in_worker, key, actions, data, slot)
+        except BrokenProcessPool:
+            # A worker died (e.g. it was killed), hence the pool is replaced.
+            return self._process_pool(is_broken=True).submit(_run_in_worker, key, actions, data, slot)
+
+    async def run(self, chain: Union[Chain, List[batch.Action]], data: Union[str, bytes],
+                  timeout: float = None) -> Union[str, bytes]:
+        """
+        Runs the chain on the data.
+        :param chain: the chain (e.g. Chain().decode().base64()) or its actions.
+        :param data: the input. Bytes which are not valid UTF-8 are preserved using surrogate escapes.
+        :param timeout: the timeout in seconds (default = the timeout of the runner).
+        :returns the output, which is of the same type as the input.
+        :raises TimeoutError when the call timed out.
+        :raises Exception when the chain is invalid or a plugin failed.
+        """
+        actions = chain.actions if isinstance(chain, Chain) else list(chain)
+        key = _key(actions)
+        # Validates the chain and determines the executor before the call waits for a slot.
+        plugins = self._chains.get(key, lambda: actions)
+        is_text = isinstance(data, str)
+        data = data.encode('utf-8', errors='surrogateescape') if is_text else bytes(data)
+
+        slot = await self._slots.acquire()
+        self._cancelled[slot] = 0
+        try:
+            future = self._submit(plugins, key, actions, data, slot)
+        except BaseException:
+            self._slots.release(slot)
+            raise
+        future.add_done_callback(lambda _: self._slots.release(slot))
+        try:
+            output = await asyncio.wait_for(asyncio.wrap_future(future),
+                                            self._timeout if timeout is None else timeout)
+        except (asyncio.CancelledError, asyncio.TimeoutError):
+            self._cancelled[slot] = 1
+            future.cancel()
+            raise
+        return output.decode('utf-8', errors='surrogateescape') if is_text else output
+
+    async def stream(self, chain: Union[Chain, List[batch.Action]], inputs: Union[Iterable, AsyncIterable],
+                     timeout: float = None) -> AsyncIterator[Union[str, bytes]]:
+        """
+        Runs the chain on each input concurrently.
+        :param chain: the chain (e.g. Chain().decode().base64()) or its actions.
+        :param inputs: the inputs, either an iterable or an async iterable (e.g. lines read from a socket).
+        :param timeout: the timeout of each input in seconds (default = the timeout of the runner).
+        :returns an async iterator over the outputs in the order of the inputs.
+        :raises TimeoutError when an input timed out.
+        :raises Exception when the chain is invalid or a plugin failed.
+        """
+        pending = collections.deque()
+        try:
+            async for data in _aiter(inputs):
+                pending.append(asyncio.ensure_future(self.run(chain, data, timeout)))
+                # Limit the number of inputs in flight to keep memory usage bounded.
+                while len(pending) >= self._slots.size:
+                    yield await pending.popleft()
+            while pending:
+                yield await pending.popleft()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def close(self):
+        """ Cancels all calls and shuts down the executors without waiting for them. """
+        self._cancelled[:] = [1] * self._slots.size
+        self._threads.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            processes, self._processes = self._processes, None
+        if processes:
+            processes.shutdown(wait=False, cancel_futures=True)
+
+    async def __aenter__(self) -> 'AsyncRunner':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+async def _aiter(inputs: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    if hasattr(inputs, '__aiter__'):
+        async for data in inputs:
+            yield data
+    else:
+        for data in inputs:
+            yield data
+
+
+@functools.lru_cache(maxsize=None)
+def default_runner() -> AsyncRunner:
+    """ :returns the runner which is shared by the whole application. """
+    from dpp import app_path
+    from dpp.core import Context
+    runner = AsyncRunner(Context('net.bytebutcher.decoder_plus_plus', app_path))
+    atexit.register(runner.close)
+    return runner
+
+
+async def arun(chain: Union[Chain, List[batch.Action]], data: Union[str, bytes],
+               timeout: float = None) -> Union[str, bytes]:
+    """
+    Runs the chain on the data using the default runner (see AsyncRunner.run).
+
+    Example:
+
+        await arun(Chain().decode().base64(), 'aGVsbG8=')  # 'hello'
+    """
+    return await default_runner().run(chain, data, timeout)
+
+
+def astream(chain: Union[Chain, List[batch.Action]], inputs: Union[Iterable, AsyncIterable],
+            timeout: float = None) -> AsyncIterator[Union[str, bytes]]:
+    """ Runs the chain on each input using the default runner (see AsyncRunner.stream). """
+    return default_runner().stream(chain, inputs, timeout)
@@ -0,0 +1,303 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import glob
+import os
+import re
+import threading
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from dpp.core.plugin import PluginType
+
+# Number of files per process which are submitted ahead, so that workers do not idle.
+PREFETCH = 4
+
+# Maximum number of chains of configured plugins which are cached per thread.
+CACHE_SIZE = 128
+
+_MAGIC = re.compile(r'[*?[]')
+
+# Types of actions as used on the command line, mapped to the types of plugins.
+TYPES = {
+    'encode': PluginType.ENCODER,
+    'decode': PluginType.DECODER,
+    'hash': PluginType.HASHER,
+    'script': PluginType.SCRIPT,
+}
+
+
+class Action(NamedTuple):
+    type: str
+    name: str
+    config: Dict[str, Any]
+
+
+def parse_config(arguments: Iterable[str]) -> Dict[str, Any]:
+    """
+    Parses plugin options the same as the command line does (e.g. ['search_term=a', 'is_regex=True']).
+    :raises ValueError when an argument is not of the form key=value.
+    """
+    config = {}
+    for argument in arguments:
+        sep_index = argument.find('=')
+        if sep_index < 1:
+            raise ValueError('Invalid argument specification! Expected key=value, got {}'.format(argument))
+        name, value = argument[:sep_index], argument[sep_index + 1:]
+        # Handle boolean values
+        if value == "True" or value == "False":
+            value = value == "True"
+        config[name] = value
+    return config
+
+
+def action(type: str, values: List[str]) -> Action:
+    """
+    :param type: the type of the action as used on the command line (e.g. 'decode', see TYPES).
+    :param values: the method name of the plugin followed by its options (e.g. ['search_and_replace', 'search_term=a']).
+    :raises ValueError when the type or the options are invalid.
+    """
+    if type not in TYPES:
+        raise ValueError(f'Invalid action "{type}"! Expected one of {", ".join(TYPES)}.')
+    if not values:
+        raise ValueError(f'No {type} specified!')
+    return Action(TYPES[type], values[0], parse_config(values[1:]))
+
+
+class FileResult(NamedTuple):
+    path: str
+    output_path: str
+    input_size: int
+    output_size: int
+    error: Optional[str]
+
+
+class Summary:
+    """ Aggregates the results of a batch, e.g. for reporting the throughput. """
+
+    def __init__(self):
+        self._start = time.monotonic()
+        self.files = 0
+        self.bytes = 0
+        self.failures: List[FileResult] = []
+
+    def add(self, result: FileResult):
+        self.files += 1
+        self.bytes += result.input_size
+        if result.error is not None:
+            self.failures.append(result)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._start
+
+    def __str__(self) -> str:
+        elapsed = self.elapsed or 1e-9
+        return (f'Processed {self.files} file(s) ({self.bytes / 1024 / 1024:.1f} MiB) in {self.elapsed:.1f}s '
+                f'({self.files / elapsed:.1f} files/s, {self.bytes / 1024 / 1024 / elapsed:.1f} MiB/s), '
+                f'{len(self.failures)} failed')
+
+
+def expand(pattern: str) -> Tuple[str, List[str]]:
+    """
+    Expands a glob pattern (e.g. 'captures/**/*.txt') into files.
+    :returns the directory in front of the first wildcard, which is used to derive output paths, and the sorted files.
+    """
+    parts = []
+    for part in pattern.split(os.sep):
+        if _MAGIC.search(part):
+            break
+        parts.append(part)
+    base = os.sep.join(parts) if len(parts) < len(pattern.split(os.sep)) else os.path.dirname(pattern)
+    return base or os.curdir, sorted(path for path in glob.glob(pattern, recursive=True) if os.path.isfile(path))
+
+
+def common_base(paths: List[str]) -> str:
+    """ :returns the deepest directory containing all files (e.g. of a file list read from stdin). """
+    if not paths:
+        return os.curdir
+    return os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths])
+
+
+def output_path(path: str, base: str, out_dir: str) -> str:
+    """ :returns the path of the output file, which mirrors the path of the input file relative to the base. """
+    return os.path.join(out_dir, os.path.relpath(os.path.abspath(path), os.path.abspath(base)))
+
+
+def _suggestion(name: str, choices: Iterable[str]) -> str:
+    """ :returns a hint naming the choice which is most similar to the name (e.g. ' Did you mean "base64"?'). """
+    # Load fuzzywuzzy while ignoring unnecessary warning about missing levenstein package.
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        from fuzzywuzzy import process
+    suggestions = process.extract(name, list(choices), limit=1)
+    return ' Did you mean "{}"?'.format(suggestions[0][0]) if suggestions else ''
+
+
+def find_plugin(context: 'dpp.core.context.Context', type: str, name: str) -> 'dpp.core.plugin.AbstractPlugin':
+    """
+    :param type: the type of the plugin (e.g. PluginType.DECODER).
+    :param name: the method name of the plugin (e.g. 'base64').
+    :returns the plugin, which is shared by the application and should be cloned before being configured.
+    :raises Exception naming the most similar plugin when there is no such plugin.
+    """
+    candidates = context.plugins().filter(type=type)
+    for plugin in candidates:
+        if plugin.method_name == name:
+            return plugin
+    raise Exception('No {} named "{}".{}'.format(
+        type.lower(), name, _suggestion(name, [plugin.method_name for plugin in candidates])))
+
+
+def update_config(plugin: 'dpp.core.plugin.AbstractPlugin', config: Dict[str, Any]):
+    """
+    Updates the options of the plugin (e.g. {'search_term': 'a'}).
+    :raises Exception naming the most similar option when an option does not exist.
+    """
+    invalid_keys = [key for key in config.keys() if key not in plugin.config.keys()]
+    if invalid_keys:
+        raise Exception('Invalid configuration option {}.{}'.format(
+            invalid_keys[0], _suggestion(invalid_keys[0], plugin.config.keys())))
+    plugin.config.update(config)
+
+
+def _natural_join(items: List[str]) -> str:
+    """ Joins a list of strings (e.g. ["1", "2", "3"] => "'1', '2' and '3'"). """
+    quoted = [f"'{item}'" for item in items]
+    return ' and '.join([', '.join(quoted[:-1]), quoted[-1]]) if len(quoted) > 1 else ''.join(quoted)
+
+
+def check_configured(plugin: 'dpp.core.plugin.AbstractPlugin'):
+    """ :raises Exception naming all required options of the plugin which are not configured. """
+    unconfigured = plugin.is_unconfigured()
+    if unconfigured:
+        raise Exception(f"Can not run '{plugin.safe_name}'! Missing required option {_natural_join(unconfigured)}.")
+
+
+def resolve(context: 'dpp.core.context.Context', actions: List[Action]) -> List['dpp.core.plugin.AbstractPlugin']:
+    """
+    :returns the configured plugins of the actions.
+    :raises Exception when a plugin does not exist or misses required options.
+    """
+    plugins = []
+    for action in actions:
+        plugin = find_plugin(context, action.type, action.name).clone()
+        update_config(plugin, action.config)
+        check_configured(plugin)
+        plugins.append(plugin)
+    return plugins
+
+
+class ChainCache:
+    """
+    Caches the configured plugins of chains of actions by their structure, so that plugins are only looked up and
+    configured once per chain. Since plugins are not thread-safe, each thread owns its own cache.
+    """
+
+    def __init__(self, context: 'dpp.core.context.Context', size: int = CACHE_SIZE):
+        self._context = context
+        self._size = size
+        self._local = threading.local()
+
+    def get(self, key: Hashable, actions: Callable[[], List[Action]]) -> List['dpp.core.plugin.AbstractPlugin']:
+        """
+        :param key: the structure of the chain (e.g. the serialized actions).
+        :param actions: the function which returns the actions of the chain when it is not cached yet.
+        :returns the configured plugins of the chain.
+        :raises Exception when the actions are invalid.
+        """
+        cache = self._local.__dict__.setdefault('chains', collections.OrderedDict())
+        plugins = cache.get(key)
+        if plugins is None:
+            plugins = cache[key] = resolve(self._context, actions())
+            if len(cache) > self._size:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return plugins
+
+
+def transform(plugins: List['dpp.core.plugin.AbstractPlugin'], data: bytes) -> bytes:
+    """ Runs the plugins on the data. Bytes which are not valid UTF-8 are preserved using surrogate escapes. """
+    text = data.decode('utf-8', errors='surrogateescape')
+    for plugin in plugins:
+        text = plugin.run(text)
+    return text.encode('utf-8', errors='surrogateescape')
+
+
+def _process(plugins: List['dpp.core.plugin.AbstractPlugin'], path: str, output_path: str) -> FileResult:
+    input_size = output_size = 0
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+        input_size = len(data)
+        output = transform(plugins, data)
+        os.makedirs(os.path.dirname(output_path) or os.curdir, exist_ok=True)
+        with open(output_path, 'wb') as f:
+            f.write(output)
+        output_size = len(output)
+        return FileResult(path, output_path, input_size, output_size, None)
+    except Exception as err:
+        return FileResult(path, output_path, input_size, output_size, str(err) or type(err).__name__)
+
+
+_worker_plugins: List['dpp.core.plugin.AbstractPlugin'] = []
+
+
+def _init_worker(app_id: str, app_path: str, actions: List[Action]):
+    """ Loads the plugins once per worker process. """
+    global _worker_plugins
+    from dpp.core import Context
+    _worker_plugins = resolve(Context(app_id, app_path), actions)
+
+
+def _process_file(path: str, output_path: str) -> FileResult:
+    """ Executed within the process pool. """
+    return _process(_worker_plugins, path, output_path)
+
+
+def run(context: 'dpp.core.context.Context', actions: List[Action], jobs: Iterable[Tuple[str, str]],
+        max_workers: int = None) -> Iterator[FileResult]:
+    """
+    Runs the actions on many files. Files are processed as binary by a process pool, in which each worker loads the
+    plugins once. Failures are returned as results instead of aborting the batch.
+    :param context: the application context.
+    :param actions: the plugins and their configuration which are applied to each file in order.
+    :param jobs: the paths of the input files together with the paths of their output files.
+    :param max_workers: the maximum number of processes (default = number of cpus).
+    :returns an iterator over the results in the order of the jobs.
+    :raises Exception when the actions are invalid.
+    """
+    plugins = resolve(context, actions)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 2:
+        for path, output_path in jobs:
+            yield _process(plugins, path, output_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(context.getAppID(), context.getAppPath(), actions)) as executor:
+        pending = collections.deque()
+        for path, output_path in jobs:
+            pending.append(executor.submit(_process_file, path, output_path))
+            # Limit the number of files in flight to keep memory usage bounded.
+            while len(pending) > PREFETCH * max_workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
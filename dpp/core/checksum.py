@@ -0,0 +1,182 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import mmap
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+# Reversed CRC-32 polynomial as used by zlib.
+CRC32_POLYNOMIAL = 0xedb88320
+
+# Largest prime smaller than 65536 as used by zlib.
+ADLER32_BASE = 65521
+
+
+def _multmodp(a: int, b: int) -> int:
+    """ Multiplies a and b modulo the CRC-32 polynomial (see zlib's crc32.c). """
+    m = 1 << 31
+    p = 0
+    while True:
+        if a & m:
+            p ^= b
+            if (a & (m - 1)) == 0:
+                break
+        m >>= 1
+        b = (b >> 1) ^ CRC32_POLYNOMIAL if b & 1 else b >> 1
+    return p
+
+
+def _init_x2n_table():
+    """ :returns a table containing x^2^n modulo the CRC-32 polynomial for n = 0..31. """
+    table = []
+    p = 1 << 30  # x^1
+    for _ in range(32):
+        table.append(p)
+        p = _multmodp(p, p)
+    return table
+
+
+_X2N_TABLE = _init_x2n_table()
+
+
+def _x2nmodp(n: int, k: int) -> int:
+    """ :returns x^(n * 2^k) modulo the CRC-32 polynomial. """
+    p = 1 << 31  # x^0 == 1
+    while n:
+        if n & 1:
+            p = _multmodp(_X2N_TABLE[k & 31], p)
+        n >>= 1
+        k += 1
+    return p
+
+
+def crc32_combine(crc1: int, crc2: int, len2: int) -> int:
+    """
+    Combines two CRC-32 checksums.
+    :param crc1: the CRC-32 of the first block.
+    :param crc2: the CRC-32 of the second block.
+    :param len2: the length of the second block in bytes.
+    :returns the CRC-32 of both blocks concatenated.
+    """
+    return _multmodp(_x2nmodp(len2, 3), crc1) ^ crc2
+
+
+def adler32_combine(adler1: int, adler2: int, len2: int) -> int:
+    """
+    Combines two Adler-32 checksums.
+    :param adler1: the Adler-32 of the first block.
+    :param adler2: the Adler-32 of the second block.
+    :param len2: the length of the second block in bytes.
+    :returns the Adler-32 of both blocks concatenated.
+    """
+    rem = len2 % ADLER32_BASE
+    sum1 = adler1 & 0xffff
+    sum2 = (rem * sum1) % ADLER32_BASE
+    sum1 += (adler2 & 0xffff) + ADLER32_BASE - 1
+    sum2 += ((adler1 >> 16) & 0xffff) + ((adler2 >> 16) & 0xffff) + ADLER32_BASE - rem
+    if sum1 >= ADLER32_BASE:
+        sum1 -= ADLER32_BASE
+    if sum1 >= ADLER32_BASE:
+        sum1 -= ADLER32_BASE
+    if sum2 >= (ADLER32_BASE << 1):
+        sum2 -= (ADLER32_BASE << 1)
+    if sum2 >= ADLER32_BASE:
+        sum2 -= ADLER32_BASE
+    return sum1 | (sum2 << 16)
+
+
+class Checksum:
+    """
+    Incremental checksum which splits large buffers into blocks, computes the checksum of each block on a thread
+    pool and merges the results using the combine function of the checksum.
+
+    Example:
+
+        checksum = CRC32()
+        checksum.update(b'abc')
+        checksum.update(b'def')
+        checksum.hexdigest()  # '0x4b8e39ef'
+    """
+
+    # Default size of the blocks which are computed in parallel.
+    BLOCK_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, function: Callable, combine: Callable, initial: int,
+                 block_size: int = BLOCK_SIZE, max_workers: int = None):
+        """
+        :param function: the checksum function (e.g. zlib.crc32).
+        :param combine: the function which combines the checksums of two consecutive blocks.
+        :param initial: the checksum of an empty input.
+        :param block_size: the size of the blocks which are computed in parallel.
+        :param max_workers: the maximum number of threads (default = number of cpus).
+        """
+        self._function = function
+        self._combine = combine
+        self._initial = initial
+        self._block_size = block_size
+        self._max_workers = max_workers or os.cpu_count() or 1
+        self._value = initial
+
+    @property
+    def value(self) -> int:
+        """ :returns the checksum of all data passed to update so far. """
+        return self._value
+
+    def hexdigest(self) -> str:
+        """ :returns the checksum as hex string (e.g. '0x4d9dcc47'). """
+        return hex(self._value)
+
+    def update(self, data):
+        """ Updates the checksum with the specified bytes-like object (e.g. bytes, memoryview or mmap). """
+        if len(data) < 2 * self._block_size or self._max_workers < 2:
+            # Not worth the overhead of splitting the data into blocks.
+            self._value = self._function(data, self._value)
+            return
+
+        with memoryview(data) as view:
+            blocks = [view[i:i + self._block_size] for i in range(0, len(view), self._block_size)]
+            try:
+                with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                    # zlib releases the GIL while computing checksums of large buffers.
+                    for block, value in zip(blocks, executor.map(self._function, blocks)):
+                        self._value = self._combine(self._value, value, len(block))
+            finally:
+                # Release the views so that memory-mapped data can be closed afterwards.
+                for block in blocks:
+                    block.release()
+
+    def update_file(self, path: str):
+        """ Updates the checksum with the contents of the specified file using a memory-map. """
+        with open(path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                # Empty files can not be memory-mapped.
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.update(m)
+
+
+class CRC32(Checksum):
+
+    def __init__(self, block_size: int = Checksum.BLOCK_SIZE, max_workers: int = None):
+        super().__init__(zlib.crc32, crc32_combine, 0, block_size, max_workers)
+
+
+class Adler32(Checksum):
+
+    def __init__(self, block_size: int = Checksum.BLOCK_SIZE, max_workers: int = None):
+        super().__init__(zlib.adler32, adler32_combine, 1, block_size, max_workers)
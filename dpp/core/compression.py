@@ -0,0 +1,273 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import codecs
+import collections
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator
+
+from dpp.core.checksum import crc32_combine, adler32_combine
+from dpp.core.exceptions import CodecException
+
+
+def decode_stream(chunks: Iterable[bytes]) -> Iterator[str]:
+    """
+    Decodes a stream of bytes as UTF-8 while preserving invalid bytes using surrogate escapes. Incomplete sequences at
+    the end of a chunk are carried over to the next chunk, so that the joined output equals decoding all bytes at once.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='surrogateescape')
+    for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    text = decoder.decode(b'', final=True)
+    if text:
+        yield text
+
+
+class Format:
+    AUTO = "auto"
+    GZIP = "gzip"
+    ZLIB = "zlib"
+    RAW = "raw"
+
+
+class ParallelDeflate:
+    """
+    Block-parallel deflate compressor in the style of pigz.
+
+    The input is split into blocks which are compressed independently on a thread pool. Each block is primed with the
+    tail of the previous block as dictionary, so back-references across block boundaries are still possible. All
+    blocks except the last one are terminated by a sync flush which aligns them to a byte boundary. Concatenated they
+    form a single deflate stream which is wrapped into a standard gzip or zlib container.
+
+    Example:
+
+        deflate = ParallelDeflate(Format.GZIP, level=9)
+        data = deflate.compress(b'abc')
+    """
+
+    # Default size of the blocks which are compressed in parallel (same as pigz).
+    BLOCK_SIZE = 128 * 1024
+
+    def __init__(self, format: str = Format.ZLIB, level: int = zlib.Z_DEFAULT_COMPRESSION,
+                 block_size: int = BLOCK_SIZE, window_bits: int = zlib.MAX_WBITS, max_workers: int = None):
+        """
+        :param format: the container format (either Format.GZIP, Format.ZLIB or Format.RAW).
+        :param level: the compression level (0-9, or -1 for the zlib default).
+        :param block_size: the size of the blocks which are compressed in parallel.
+        :param window_bits: the base two logarithm of the window size (9-15).
+        :param max_workers: the maximum number of threads (default = number of cpus).
+        """
+        if format not in (Format.GZIP, Format.ZLIB, Format.RAW):
+            raise Exception(f'Unknown compression format "{format}"!')
+        if not 9 <= window_bits <= zlib.MAX_WBITS:
+            raise Exception(f'Invalid window bits! Expected value between 9 and 15, got {window_bits}!')
+        if block_size <= 0:
+            raise Exception(f'Invalid block size! Expected value greater than 0, got {block_size}!')
+        self._format = format
+        self._level = level
+        self._block_size = block_size
+        self._window_bits = window_bits
+        self._max_workers = max_workers or os.cpu_count() or 1
+        if format == Format.GZIP:
+            self._check, self._combine, self._initial = zlib.crc32, crc32_combine, 0
+        else:
+            self._check, self._combine, self._initial = zlib.adler32, adler32_combine, 1
+
+    def _header(self) -> bytes:
+        if self._format == Format.GZIP:
+            # Magic, deflate, no flags, no modification time (keeps the output reproducible), extra flags, unknown OS.
+            extra_flags = 2 if self._level == 9 else 4 if self._level == 1 else 0
+            return struct.pack('<BBBBIBB', 0x1f, 0x8b, 8, 0, 0, extra_flags, 255)
+        if self._format == Format.ZLIB:
+            level = 6 if self._level == zlib.Z_DEFAULT_COMPRESSION else self._level
+            level_flags = 0 if level < 2 else 1 if level < 6 else 2 if level == 6 else 3
+            header = (((self._window_bits - 8) << 4 | 8) << 8) | (level_flags << 6)
+            return struct.pack('>H', header + 31 - header % 31)
+        return b''
+
+    def _trailer(self, check: int, length: int) -> bytes:
+        if self._format == Format.GZIP:
+            return struct.pack('<II', check, length & 0xffffffff)
+        if self._format == Format.ZLIB:
+            return struct.pack('>I', check)
+        return b''
+
+    def _deflate_block(self, block: bytes, dictionary: bytes, is_last: bool):
+        """ :returns the compressed block and its checksum. Executed within the thread pool. """
+        if dictionary:
+            compressor = zlib.compressobj(self._level, zlib.DEFLATED, -self._window_bits, zdict=dictionary)
+        else:
+            compressor = zlib.compressobj(self._level, zlib.DEFLATED, -self._window_bits)
+        data = compressor.compress(block) + compressor.flush(zlib.Z_FINISH if is_last else zlib.Z_SYNC_FLUSH)
+        return data, self._check(block)
+
+    def compress(self, data: bytes) -> bytes:
+        """ :returns the compressed data. """
+        return b''.join(self.compress_stream([data]))
+
+    def compress_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """ Compresses a stream of chunks and yields the compressed output as soon as it becomes available. """
+        window_size = 1 << self._window_bits
+        check, length = self._initial, 0
+        dictionary = b''
+        buffer = bytearray()
+        pending = collections.deque()
+
+        def _collect(item):
+            nonlocal check
+            future, block_length = item
+            data, block_check = future.result()
+            check = self._combine(check, block_check, block_length)
+            return data
+
+        def _submit(block, is_last):
+            nonlocal dictionary, length
+            pending.append((executor.submit(self._deflate_block, block, dictionary, is_last), len(block)))
+            dictionary = block[-window_size:]
+            length += len(block)
+
+        yield self._header()
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            for chunk in chunks:
+                buffer += chunk
+                # Always keep some data back, since the last block needs to be flagged as such.
+                while len(buffer) > self._block_size:
+                    _submit(bytes(buffer[:self._block_size]), is_last=False)
+                    del buffer[:self._block_size]
+                    # Limit the number of blocks in flight to keep memory usage bounded.
+                    while len(pending) > 2 * self._max_workers:
+                        yield _collect(pending.popleft())
+            _submit(bytes(buffer), is_last=True)
+            while pending:
+                yield _collect(pending.popleft())
+        yield self._trailer(check, length)
+
+
+class Inflate:
+    """
+    Incremental decompressor for gzip, zlib and raw deflate streams with limits on the output size and on the
+    expansion ratio. Decompression is aborted with a CodecException as soon as one of the limits is exceeded, which
+    protects against decompression bombs.
+
+    Example:
+
+        inflate = Inflate(max_output_size=1024 * 1024)
+        data = inflate.decompress(gzip.compress(b'abc'))
+    """
+
+    # Maximum size of the chunks which are emitted while decompressing.
+    CHUNK_SIZE = 64 * 1024
+
+    # Window bits passed to zlib.decompressobj for the individual formats.
+    WINDOW_BITS = {
+        Format.GZIP: 16 + zlib.MAX_WBITS,
+        Format.ZLIB: zlib.MAX_WBITS,
+        Format.RAW: -zlib.MAX_WBITS
+    }
+
+    def __init__(self, format: str = Format.AUTO, max_output_size: int = 0, max_ratio: int = 0):
+        """
+        :param format: the container format (either Format.AUTO, Format.GZIP, Format.ZLIB or Format.RAW).
+        :param max_output_size: the maximum number of decompressed bytes (0 = unlimited).
+        :param max_ratio: the maximum ratio between decompressed and compressed bytes (0 = unlimited).
+        """
+        if format != Format.AUTO and format not in Inflate.WINDOW_BITS:
+            raise Exception(f'Unknown compression format "{format}"!')
+        self._format = format
+        self._max_output_size = max_output_size
+        self._max_ratio = max_ratio
+
+    @staticmethod
+    def detect_format(data: bytes) -> str:
+        """ :returns the format of the compressed data based on its header (either GZIP, ZLIB or RAW). """
+        if data[:2] == b'\x1f\x8b':
+            return Format.GZIP
+        if len(data) >= 2 and data[0] & 0x0f == 8 and data[0] >> 4 <= 7 and (data[0] << 8 | data[1]) % 31 == 0:
+            return Format.ZLIB
+        return Format.RAW
+
+    def _limit(self, output: bytes, input_size: int, output_size: int) -> bytes:
+        """ :returns the part of the output which is within the limits. Sets the error when a limit is exceeded. """
+        if self._max_output_size and output_size + len(output) > self._max_output_size:
+            self._error = CodecException(
+                f'Decompression aborted! Output exceeds the maximum size of {self._max_output_size} bytes.')
+            return output[:self._max_output_size - output_size]
+        if self._max_ratio and output_size + len(output) > self._max_ratio * input_size:
+            self._error = CodecException(
+                f'Decompression aborted! Output exceeds the maximum expansion ratio of {self._max_ratio}.')
+            return output[:max(0, self._max_ratio * input_size - output_size)]
+        return output
+
+    def decompress(self, data: bytes) -> bytes:
+        """ :returns the decompressed data. """
+        return b''.join(self.decompress_stream([data]))
+
+    def decompress_stream(self, chunks: Iterable[bytes]) -> Iterator[bytes]:
+        """
+        Decompresses a stream of chunks and yields the decompressed output in chunks of at most CHUNK_SIZE bytes.
+        Concatenated gzip members are decompressed one after another.
+        :raises CodecException when a limit is exceeded or the stream is truncated.
+        """
+        self._error = None
+        format = None
+        decompressor = None
+        is_finished = False
+        head = b''
+        input_size = output_size = 0
+        for chunk in chunks:
+            input_size += len(chunk)
+            data = head + chunk if head else chunk
+            head = b''
+            while data and not is_finished:
+                if decompressor is None:
+                    if format == Format.GZIP:
+                        # Skip zero padding between or after gzip members.
+                        data = data.lstrip(b'\x00')
+                        if not data:
+                            break
+                    if len(data) < 2:
+                        # Wait for more data to detect the format.
+                        head = data
+                        break
+                    if format is None:
+                        format = self.detect_format(data) if self._format == Format.AUTO else self._format
+                    elif data[:2] != b'\x1f\x8b':
+                        # Ignore trailing garbage after the last gzip member.
+                        is_finished = True
+                        break
+                    decompressor = zlib.decompressobj(Inflate.WINDOW_BITS[format])
+
+                output = self._limit(decompressor.decompress(data, Inflate.CHUNK_SIZE), input_size, output_size)
+                data = decompressor.unconsumed_tail
+                if output:
+                    output_size += len(output)
+                    yield output
+                if self._error:
+                    raise self._error
+
+                if decompressor.eof:
+                    data = decompressor.unused_data
+                    decompressor = None
+                    # Only gzip allows multiple members within one stream.
+                    is_finished = format != Format.GZIP
+
+        if head or (decompressor is not None and not decompressor.eof):
+            raise CodecException('Decompression failed! Incomplete or truncated stream.')
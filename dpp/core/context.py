@@ -142,6 +142,10 @@ class Context(QObject):
         """ :returns the mode (see ``Context.Mode``) the application is currently running in or None if unspecified. """
         return self._mode
 
+    def isGUIMode(self) -> bool:
+        """ :returns True, when the application is running as graphical user interface, otherwise False. """
+        return self._mode in [Context.Mode.GUI_MODERN, Context.Mode.GUI_CLASSIC]
+
     def getLogLevel(self):
         """ :returns the current log level. """
         if self._trace_mode:
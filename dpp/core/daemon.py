@@ -0,0 +1,119 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from dpp.client import receive_frame, send_frame, socket_path, verify_socket
+from dpp.core import batch
+
+
+class Daemon:
+    """
+    Keeps the plugins loaded and runs the actions requested by clients (see dpp.client) on a pool of threads.
+    Requests consist of two length-prefixed frames, a JSON header containing the actions and the input. Responses
+    consist of a JSON header containing the error (if any) and the output.
+    """
+
+    def __init__(self, context: 'dpp.core.context.Context', path: str = None, max_workers: int = None):
+        """
+        :param context: the application context.
+        :param path: the path of the socket (default = dpp.client.socket_path()).
+        :param max_workers: the maximum number of clients which are served concurrently (default = number of cpus + 4).
+        """
+        self._context = context
+        self._path = path or socket_path()
+        self._max_workers = max_workers
+        self._chains = batch.ChainCache(context)
+        self._socket = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    def _plugins(self, header: bytes) -> List['dpp.core.plugin.AbstractPlugin']:
+        """ :returns the configured plugins of the actions specified within the header of a request. """
+        return self._chains.get(header, lambda: [
+            batch.action(type, values) for type, values in json.loads(header)['actions']])
+
+    def _handle(self, connection: socket.socket):
+        with connection:
+            try:
+                header = receive_frame(connection)
+                data = receive_frame(connection)
+            except (ConnectionError, OSError) as err:
+                self._context.logger.debug(f'Receiving request failed! {err}')
+                return
+            try:
+                output, error = batch.transform(self._plugins(header), data), None
+            except Exception as err:
+                output, error = b'', str(err) or type(err).__name__
+            try:
+                send_frame(connection, json.dumps({'error': error}).encode('utf-8'))
+                send_frame(connection, output)
+            except OSError as err:
+                self._context.logger.debug(f'Sending response failed! {err}')
+
+    def _listen(self) -> socket.socket:
+        if os.path.exists(self._path):
+            # A socket of another user is neither used nor removed.
+            verify_socket(self._path)
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.connect(self._path)
+                    raise Exception(f'Daemon is already running at {self._path}!')
+                except (ConnectionRefusedError, FileNotFoundError):
+                    # The socket was left behind by a daemon which did not shut down properly.
+                    os.unlink(self._path)
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # The socket is only accessible by the current user.
+        umask = os.umask(0o177)
+        try:
+            server.bind(self._path)
+        finally:
+            os.umask(umask)
+        server.listen(128)
+        return server
+
+    def serve_forever(self):
+        """ Accepts clients until shutdown is called. """
+        self._socket = self._listen()
+        self._context.logger.info(f'Listening on {self._path}')
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+                while True:
+                    try:
+                        connection, _ = self._socket.accept()
+                    except OSError:
+                        # The socket was closed by shutdown.
+                        return
+                    executor.submit(self._handle, connection)
+        finally:
+            if os.path.exists(self._path):
+                os.unlink(self._path)
+
+    def shutdown(self):
+        """ Stops accepting clients. Clients which are currently served are processed until done. """
+        if self._socket is not None:
+            try:
+                # Wakes up the thread which is waiting for clients.
+                self._socket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._socket.close()
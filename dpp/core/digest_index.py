@@ -0,0 +1,293 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import functools
+import glob
+import hashlib
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from dpp.core.lines import line_ranges
+
+# Identifies index files and their version.
+MAGIC = b'DPPIDX01'
+
+# Magic, algorithm, digest size, number of records and length of the wordlist path.
+_HEADER = struct.Struct('>8s16sHQH')
+
+# Size of the offset of a word within the wordlist, which is stored behind each digest.
+_OFFSET_SIZE = 8
+
+# Number of bytes of the wordlist which are hashed and sorted at once by a worker (one sorted run per chunk).
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Maximum number of runs which are merged at once. More runs are merged in multiple passes, so that the number of
+# open files stays bounded regardless of the size of the wordlist.
+MERGE_FAN_IN = 128
+
+# File extension of index files.
+EXTENSION = '.idx'
+
+
+@functools.lru_cache(maxsize=None)
+def _md4_constructor() -> Callable:
+    """ :returns the fastest available MD4 implementation, since OpenSSL 3 does not provide MD4 anymore. """
+    try:
+        from Crypto.Hash import MD4
+        return MD4.new
+    except ImportError:
+        from passlib.crypto.digest import lookup_hash
+        return lookup_hash('md4').const
+
+
+def _md4(word: bytes) -> bytes:
+    return _md4_constructor()(word).digest()
+
+
+def _nt(word: bytes) -> bytes:
+    return _md4(word.decode('utf-8', errors='surrogateescape').encode('utf-16-le', errors='surrogatepass'))
+
+
+def _lm(word: bytes) -> bytes:
+    from passlib.hash import lmhash
+    return lmhash.raw(word)
+
+
+def _hashlib(name: str) -> Callable[[bytes], bytes]:
+    return lambda word: hashlib.new(name, word).digest()
+
+
+# Unsalted digests which can be indexed, named after the hasher plugins computing them.
+ALGORITHMS: Dict[str, Callable[[bytes], bytes]] = {
+    'lm': _lm,
+    'md4': _md4,
+    'md5': _hashlib('md5'),
+    'nt': _nt,
+    'ripemd160': _hashlib('ripemd160'),
+    'sha1': _hashlib('sha1'),
+    'sha224': _hashlib('sha224'),
+    'sha256': _hashlib('sha256'),
+    'sha384': _hashlib('sha384'),
+    'sha512': _hashlib('sha512'),
+    'sha3_224': _hashlib('sha3_224'),
+    'sha3_256': _hashlib('sha3_256'),
+    'sha3_384': _hashlib('sha3_384'),
+    'sha3_512': _hashlib('sha3_512'),
+}
+
+
+def _digest_function(algorithm: str) -> Callable[[bytes], bytes]:
+    try:
+        return ALGORITHMS[algorithm]
+    except KeyError:
+        raise Exception(f'Unsupported algorithm "{algorithm}"! Expected one of {", ".join(sorted(ALGORITHMS))}.')
+
+
+def index_path(wordlist: str, algorithm: str) -> str:
+    """ :returns the default path of the index of a wordlist (e.g. rockyou.txt.md5.idx). """
+    return f'{wordlist}.{algorithm}{EXTENSION}'
+
+
+def index_paths(path: str) -> List[str]:
+    """
+    :param path: either an index file, a directory containing index files or a wordlist next to which index files
+                 were built.
+    :returns the paths of the index files.
+    """
+    if os.path.isdir(path):
+        return sorted(glob.glob(os.path.join(glob.escape(path), '*' + EXTENSION)))
+    if path.endswith(EXTENSION):
+        return [path]
+    return sorted(glob.glob(glob.escape(path) + '.*' + EXTENSION))
+
+
+def _sort_chunk(wordlist: str, algorithm: str, start: int, end: int, directory: str) -> Tuple[str, int]:
+    """ Hashes the words of a chunk and writes the sorted records to a run file. Executed within the process pool. """
+    digest = _digest_function(algorithm)
+    with open(wordlist, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    records = []
+    offset = start
+    for line in data.split(b'\n'):
+        word = line[:-1] if line.endswith(b'\r') else line
+        if word:
+            try:
+                records.append(digest(word) + offset.to_bytes(_OFFSET_SIZE, 'big'))
+            except Exception:
+                # Words which can not be hashed using this algorithm (e.g. invalid encoding) are skipped.
+                pass
+        offset += len(line) + 1
+    records.sort()
+    with tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.run', delete=False) as f:
+        f.write(b''.join(records))
+        return f.name, len(records)
+
+
+def _read_run(path: str, record_size: int) -> Iterator[bytes]:
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(record_size * 4096)
+            if not block:
+                return
+            for position in range(0, len(block), record_size):
+                yield block[position:position + record_size]
+
+
+def _merge_runs(runs: List[str], record_size: int, directory: str) -> str:
+    """ Merges sorted runs into a single sorted run file and removes the merged runs. """
+    with tempfile.NamedTemporaryFile('wb', dir=directory, suffix='.run', delete=False) as f:
+        f.writelines(heapq.merge(*[_read_run(run, record_size) for run in runs]))
+    for run in runs:
+        os.remove(run)
+    return f.name
+
+
+def build_index(wordlist: str, algorithm: str, path: str = None, max_workers: int = None,
+                chunk_size: int = CHUNK_SIZE, fan_in: int = MERGE_FAN_IN) -> str:
+    """
+    Builds a sorted index which maps the digests of the words of a wordlist to their offsets within the wordlist.
+    The wordlist is split into chunks which are hashed and sorted by a process pool. The sorted runs are stored as
+    temporary files and merged afterwards, so that wordlists larger than the available memory can be indexed.
+    When there are more runs than can be merged at once, they are merged in multiple passes.
+    Words with equal digests are indexed once.
+    :param wordlist: the path to the wordlist (one word per line).
+    :param algorithm: the algorithm of the digests (e.g. 'md5', see ALGORITHMS).
+    :param path: the path of the index file (default = <wordlist>.<algorithm>.idx).
+    :param max_workers: the maximum number of processes (default = number of cpus).
+    :param chunk_size: the number of bytes of the wordlist which are sorted at once.
+    :param fan_in: the maximum number of runs which are merged at once (at least 2).
+    :returns the path of the index file.
+    """
+    digest_size = len(_digest_function(algorithm)(b''))
+    record_size = digest_size + _OFFSET_SIZE
+    path = path or index_path(wordlist, algorithm)
+    wordlist_path = os.path.abspath(wordlist).encode('utf-8', errors='surrogateescape')
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.TemporaryDirectory(dir=directory) as temp_directory:
+        tasks = [(wordlist, algorithm, start, end, temp_directory) for start, end in line_ranges(wordlist, chunk_size)]
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers < 2 or len(tasks) < 2:
+            runs = [_sort_chunk(*task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                runs = list(executor.map(_sort_chunk, *zip(*tasks)))
+        runs = [run for run, _ in runs]
+        fan_in = max(fan_in, 2)
+        while len(runs) > fan_in:
+            runs = [_merge_runs(runs[start:start + fan_in], record_size, temp_directory)
+                    for start in range(0, len(runs), fan_in)]
+
+        count = 0
+        with open(path, 'wb') as f:
+            header = _HEADER.pack(MAGIC, algorithm.encode('ascii'), digest_size, 0, len(wordlist_path))
+            f.write(header + wordlist_path)
+            previous = None
+            buffer = []
+            for record in heapq.merge(*[_read_run(run, record_size) for run in runs]):
+                digest = record[:digest_size]
+                if digest == previous:
+                    continue
+                previous = digest
+                buffer.append(record)
+                if len(buffer) >= 65536:
+                    f.write(b''.join(buffer))
+                    count += len(buffer)
+                    buffer = []
+            f.write(b''.join(buffer))
+            count += len(buffer)
+            f.seek(0)
+            f.write(_HEADER.pack(MAGIC, algorithm.encode('ascii'), digest_size, count, len(wordlist_path)))
+    return path
+
+
+class DigestIndex:
+    """
+    Memory-mapped index built by build_index. Digests are looked up by binary search, so that lookups are fast
+    regardless of the size of the wordlist.
+
+    Example:
+
+        with DigestIndex('rockyou.txt.md5.idx') as index:
+            index.lookup(bytes.fromhex('5f4dcc3b5aa765d61d8327deb882cf99'))  # b'password'
+    """
+
+    def __init__(self, path: str):
+        """ :raises Exception when the file is not a valid index. """
+        self._file = open(path, 'rb')
+        try:
+            header = self._file.read(_HEADER.size)
+            if len(header) != _HEADER.size or not header.startswith(MAGIC):
+                raise Exception(f'Invalid index file "{path}"!')
+            _, algorithm, self._digest_size, self._count, length = _HEADER.unpack(header)
+            self._algorithm = algorithm.rstrip(b'\x00').decode('ascii')
+            self._wordlist = self._file.read(length).decode('utf-8', errors='surrogateescape')
+            self._start = _HEADER.size + length
+            self._record_size = self._digest_size + _OFFSET_SIZE
+            self._index = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self._count else b''
+            self._words = open(self._wordlist, 'rb')
+        except Exception:
+            self._file.close()
+            raise
+
+    @property
+    def algorithm(self) -> str:
+        return self._algorithm
+
+    @property
+    def digest_size(self) -> int:
+        return self._digest_size
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _digest(self, position: int) -> bytes:
+        start = self._start + position * self._record_size
+        return self._index[start:start + self._digest_size]
+
+    def lookup(self, digest: bytes) -> Optional[bytes]:
+        """ :returns the word of the digest, or None if the digest is not within the index. """
+        if len(digest) != self._digest_size:
+            return None
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._digest(middle) < digest:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count or self._digest(low) != digest:
+            return None
+        start = self._start + low * self._record_size + self._digest_size
+        self._words.seek(int.from_bytes(self._index[start:start + _OFFSET_SIZE], 'big'))
+        return self._words.readline().rstrip(b'\r\n')
+
+    def close(self):
+        if isinstance(self._index, mmap.mmap):
+            self._index.close()
+        self._file.close()
+        self._words.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
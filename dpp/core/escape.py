@@ -0,0 +1,133 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import itertools
+import re
+import unicodedata
+from typing import Callable, Dict, Pattern
+
+from dpp.core import radix
+
+# Matches runs of consecutive hex shell codes (e.g. \x61\x62).
+SHELL_PATTERN = re.compile(rb'(?:\\[Xx][0-9a-fA-F]{2})+')
+
+# Matches hex chars which are optionally followed by a space (e.g. 0x61).
+CHAR_PATTERN = re.compile(rb'0[Xx]([0-9a-fA-F]{2}) ?')
+
+# Matches the escape sequences known by python string literals.
+STRING_PATTERN = re.compile(
+    rb'\\(?:[Xx]([0-9a-fA-F]{2})|u([0-9a-fA-F]{4})|U([0-9a-fA-F]{8})|([0-7]{1,3})|N\{([^}]+)\}|(.))', re.DOTALL)
+
+# Simple escape sequences of python string literals (e.g. \n).
+_STRING_ESCAPES = {
+    b'\\': b'\\', b"'": b"'", b'"': b'"', b'\n': b'', b'a': b'\a', b'b': b'\b', b'f': b'\f', b'n': b'\n',
+    b'r': b'\r', b't': b'\t', b'v': b'\v'
+}
+
+
+def _init_hex_table() -> Dict[bytes, bytes]:
+    """ :returns a table mapping each two-digit hex code in any letter case to its byte (e.g. b'6A' => b'j'). """
+    digits = '0123456789abcdefABCDEF'
+    return {(a + b).encode('ascii'): bytes([int(a + b, 16)]) for a, b in itertools.product(digits, repeat=2)}
+
+
+_HEX_TABLE = _init_hex_table()
+
+
+def _encode(text: str) -> bytes:
+    return text.encode('utf-8', errors='surrogateescape')
+
+
+def _decode(data: bytes) -> str:
+    return data.decode('utf-8', errors='surrogateescape')
+
+
+def unescape(text: str, pattern: Pattern, replace: Callable[['re.Match'], bytes]) -> str:
+    """
+    Replaces all escape sequences of the text in a single pass. The text is tokenized once, all bytes are collected
+    in a buffer and decoded as UTF-8 at the end, so escaped multi-byte characters (e.g. \\xc2\\xb0) are decoded
+    correctly.
+    :param text: the text containing the escape sequences.
+    :param pattern: the compiled bytes pattern matching an escape sequence.
+    :param replace: the function which returns the bytes of a matched escape sequence.
+    :returns the unescaped text.
+    """
+    data = _encode(text)
+    output = bytearray()
+    position = 0
+    for match in pattern.finditer(data):
+        output += data[position:match.start()]
+        output += replace(match)
+        position = match.end()
+    output += data[position:]
+    return _decode(output)
+
+
+def _replace_hex_bytes(match: 're.Match') -> bytes:
+    # Strip the prefixes of the whole run, so that it can be converted at once.
+    return bytes.fromhex(match.group(0).translate(None, b'\\Xx').decode('ascii'))
+
+
+def _replace_hex_char(match: 're.Match') -> bytes:
+    return _encode(chr(int(match.group(1), 16)))
+
+
+def _replace_string_escape(match: 're.Match') -> bytes:
+    hex_byte, hex16, hex32, octal, name, char = match.groups()
+    if hex_byte:
+        return _HEX_TABLE[hex_byte]
+    if octal:
+        value = int(octal, 8)
+        return bytes([value]) if value < 256 else _encode(chr(value))
+    try:
+        if hex16 or hex32:
+            return chr(int(hex16 or hex32, 16)).encode('utf-8', errors='surrogatepass')
+        if name:
+            return _encode(unicodedata.lookup(name.decode('ascii')))
+    except (ValueError, KeyError, UnicodeDecodeError):
+        # Invalid code points or unknown names are kept as they are.
+        return match.group(0)
+    # Unknown escape sequences are kept as they are.
+    return _STRING_ESCAPES.get(char, match.group(0))
+
+
+def decode_shell(text: str) -> str:
+    """ :returns the text with all hex shell codes replaced by their bytes (e.g. '\\xc2\\xb0' => '°'). """
+    return unescape(text, SHELL_PATTERN, _replace_hex_bytes)
+
+
+def decode_chars(text: str) -> str:
+    """ :returns the text with all hex chars replaced by their characters (e.g. '0x61 0xb0' => 'a°'). """
+    return unescape(text, CHAR_PATTERN, _replace_hex_char)
+
+
+def decode_string(text: str) -> str:
+    """ :returns the text with all escape sequences of python string literals replaced (e.g. '\\n' => newline). """
+    return unescape(text, STRING_PATTERN, _replace_string_escape)
+
+
+def encode_shell(text: str) -> str:
+    """ :returns the UTF-8 bytes of the text as hex shell codes (e.g. '°' => '\\xc2\\xb0'). """
+    if not text:
+        return ''
+    return '\\x' + radix.encode_bytes(_encode(text), 16, width=2, separator='\\x')
+
+
+def encode_chars(text: str) -> str:
+    """ :returns the code points of the text as space separated hex chars (e.g. 'a°' => '0x61 0xb0'). """
+    if not text:
+        return ''
+    return '0x' + radix.encode_code_points(text, 16, separator=' 0x')
@@ -0,0 +1,142 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import stat
+import sys
+import time
+from typing import Callable, Iterable, Iterator, List
+
+# Maximum number of bytes which are read at once.
+READ_SIZE = 64 * 1024
+
+# Number of seconds to wait before checking a file for new data again.
+POLL_INTERVAL = 0.005
+
+
+class Follower:
+    """
+    Follows a growing file (like tail -F) or reads a pipe until it is closed. Only data which is appended after the
+    follower was started is returned. The follower survives log rotation: when the file is replaced, the remaining data
+    of the old file is read before switching to the new file, and when the file is truncated it is read from the start.
+
+    Example:
+
+        for chunk in Follower('app.log'):
+            ...
+    """
+
+    def __init__(self, path: str, from_start: bool = False, poll_interval: float = POLL_INTERVAL):
+        """
+        :param path: the path to the file or '-' for stdin.
+        :param from_start: whether to return the data which already exists (always the case for pipes).
+        :param poll_interval: the number of seconds to wait before checking a file for new data again.
+        """
+        self._path = path
+        self._poll_interval = poll_interval
+        if path == '-':
+            self._fd = sys.stdin.fileno()
+            self._is_pipe = True
+        else:
+            self._fd = os.open(path, os.O_RDONLY)
+            self._is_pipe = not stat.S_ISREG(os.fstat(self._fd).st_mode)
+        self._offset = 0 if self._is_pipe or from_start else os.lseek(self._fd, 0, os.SEEK_END)
+
+    @property
+    def offset(self) -> int:
+        """ :returns the number of bytes of the current file which were read. """
+        return self._offset
+
+    def _is_rotated(self) -> bool:
+        """ :returns whether the file was replaced or truncated. Reopens or rewinds the file accordingly. """
+        try:
+            current = os.stat(self._path)
+        except FileNotFoundError:
+            # The file was moved away, but the new file was not created yet.
+            return False
+        opened = os.fstat(self._fd)
+        if (current.st_ino, current.st_dev) != (opened.st_ino, opened.st_dev):
+            try:
+                fd = os.open(self._path, os.O_RDONLY)
+            except FileNotFoundError:
+                return False
+            os.close(self._fd)
+            self._fd, self._offset = fd, 0
+            return True
+        if current.st_size < self._offset:
+            self._offset = os.lseek(self._fd, 0, os.SEEK_SET)
+            return True
+        return False
+
+    def __iter__(self) -> Iterator[bytes]:
+        try:
+            while True:
+                data = os.read(self._fd, READ_SIZE)
+                if data:
+                    self._offset += len(data)
+                    yield data
+                elif self._is_pipe:
+                    return
+                elif not self._is_rotated():
+                    time.sleep(self._poll_interval)
+        finally:
+            self.close()
+
+    def close(self):
+        if self._fd is not None and self._path != '-':
+            os.close(self._fd)
+        self._fd = None
+
+
+def iter_line_batches(chunks: Iterable[bytes]) -> Iterator[List[bytes]]:
+    """
+    Splits a stream of chunks into batches of complete lines, one batch per chunk. Incomplete lines are kept until they
+    are completed by one of the next chunks.
+    :returns an iterator over the batches of lines without line breaks.
+    """
+    rest = b''
+    for chunk in chunks:
+        lines = (rest + chunk).split(b'\n')
+        rest = lines.pop()
+        if lines:
+            yield [line[:-1] if line.endswith(b'\r') else line for line in lines]
+    if rest:
+        yield [rest]
+
+
+def process(chunks: Iterable[bytes], transform: Callable[[bytes], bytes], write: Callable[[bytes], None],
+            per_line: bool = False, on_error: Callable[[bytes, Exception], None] = None):
+    """
+    Transforms the complete lines of each chunk and writes the output.
+    :param chunks: the appended data (e.g. of a Follower).
+    :param transform: the function which transforms the data.
+    :param write: the function which writes the output of a batch (e.g. including a flush).
+    :param per_line: whether each line is transformed individually, otherwise the lines of a batch are transformed at
+                     once.
+    :param on_error: an optional function which is called when transforming fails, otherwise the error is raised.
+    """
+    for lines in iter_line_batches(chunks):
+        blocks = lines if per_line else [b'\n'.join(lines)]
+        outputs = []
+        for block in blocks:
+            try:
+                outputs.append(transform(block) + b'\n')
+            except Exception as err:
+                if on_error is None:
+                    raise
+                on_error(block, err)
+        if outputs:
+            write(b''.join(outputs))
@@ -0,0 +1,161 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import functools
+import math
+import os
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+try:
+    from re import _parser as sre_parse  # Python >= 3.11
+except ImportError:
+    import sre_parse
+
+from dpp.core import pool
+
+# Name used for hashes which do not match any format.
+UNKNOWN = "Unknown"
+
+# Number of distinct hashes which are sent to a worker at once.
+BATCH_SIZE = 50000
+
+
+class _Prototype:
+    """ A hashid prototype together with its prefilter (length range, first character and required characters). """
+
+    def __init__(self, prototype):
+        self.regex = prototype.regex
+        self.modes = prototype.modes
+        self.min_length, self.max_length, self.first_char, self.required_chars = self._analyze(prototype.regex)
+
+    @staticmethod
+    def _analyze(regex) -> Tuple[int, float, Optional[str], FrozenSet[str]]:
+        """
+        :returns the minimum and maximum length of matching strings, their first character if it is fixed and the
+        characters which need to be contained.
+        """
+        try:
+            parsed = sre_parse.parse(regex.pattern, regex.flags)
+            ops = list(parsed)
+            min_length, max_length = parsed.getwidth()
+        except Exception:
+            return 0, math.inf, None, frozenset()
+        if ops and ops[0] == (sre_parse.AT, sre_parse.AT_BEGINNING):
+            ops = ops[1:]
+        # Without an anchor at the end a match may be followed by arbitrary characters.
+        if not ops or ops[-1] != (sre_parse.AT, sre_parse.AT_END) or max_length >= sre_parse.MAXREPEAT:
+            max_length = math.inf
+        first_char = None
+        if ops and ops[0][0] == sre_parse.LITERAL and ops[0][1] < 128:
+            first_char = chr(ops[0][1]).lower()
+        # Only special characters are considered, which are rare within hashes consisting of hex digits or base64.
+        required_chars = frozenset(chr(value) for op, value in ops
+                                   if op == sre_parse.LITERAL and value < 128 and not chr(value).isalnum())
+        return min_length, max_length, first_char, required_chars
+
+
+class HashIdentifier:
+    """
+    Identifies hash formats using the prototypes of hashid. Instead of trying all regular expressions for each hash,
+    the prototypes are grouped into buckets by the length, the first character and the special characters (e.g. '$')
+    of the hashes they can match. The buckets are built lazily and reused for all hashes of the same shape.
+
+    Example:
+
+        identifier = HashIdentifier()
+        identifier.names('5d41402abc4b2a76b9719d911017c592')  # ['Domain Cached Credentials', ..., 'MD5', ...]
+        identifier.summarize(['5d41402abc4b2a76b9719d911017c592', 'invalid'])  # Counter({'MD5': 1, ...})
+    """
+
+    def __init__(self, prototypes: List = None):
+        """ :param prototypes: the hashid prototypes (default = all prototypes known by hashid). """
+        if prototypes is None:
+            import hashid
+            prototypes = hashid.prototypes
+        self._prototypes = [_Prototype(prototype) for prototype in prototypes]
+        self._required_chars = sorted(frozenset().union(*(prototype.required_chars for prototype in self._prototypes)))
+        self._buckets: Dict[Tuple, List[_Prototype]] = {}
+
+    def _bucket(self, text: str) -> List[_Prototype]:
+        """ :returns the prototypes which might match the stripped hash. """
+        key = (len(text), text[:1].lower(), frozenset(char for char in self._required_chars if char in text))
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            length, first_char, chars = key
+            bucket = self._buckets[key] = [
+                prototype for prototype in self._prototypes
+                if prototype.min_length <= length <= prototype.max_length and
+                prototype.first_char in (None, first_char) and prototype.required_chars <= chars]
+        return bucket
+
+    def identify(self, text: str) -> List:
+        """ :returns the hashid modes (name, hashcat, john, extended) matching the hash, the same as hashid does. """
+        text = text.strip()
+        return [mode for prototype in self._bucket(text) if prototype.regex.match(text) for mode in prototype.modes]
+
+    def names(self, text: str) -> List[str]:
+        """ :returns the sorted names of the formats matching the hash. """
+        return sorted(mode.name for mode in self.identify(text))
+
+    def _summarize(self, counts: Iterable[Tuple[str, int]]) -> collections.Counter:
+        # Hashes matching the same prototypes are aggregated before the names of the formats are looked up.
+        matches = collections.Counter()
+        for text, count in counts:
+            matches[tuple(prototype for prototype in self._bucket(text) if prototype.regex.match(text))] += count
+        summary = collections.Counter()
+        for prototypes, count in matches.items():
+            names = {mode.name for prototype in prototypes for mode in prototype.modes}
+            for name in names or [UNKNOWN]:
+                summary[name] += count
+        return summary
+
+    def summarize(self, lines: Iterable[str], max_workers: int = 1) -> collections.Counter:
+        """
+        Classifies each line and aggregates the number of lines per format. Equal lines are identified only once.
+        Empty lines are ignored.
+        :param lines: the hashes, one per line.
+        :param max_workers: the number of processes of the shared pool used for large inputs (None = number of cpus).
+        :returns the number of lines per format name. Lines which do not match any format are counted as UNKNOWN.
+        """
+        counts = collections.Counter(line.strip() for line in lines)
+        counts.pop('', None)
+        max_workers = max_workers or os.cpu_count() or 1
+        if max_workers < 2 or len(counts) <= BATCH_SIZE:
+            return self._summarize(counts.items())
+        items = list(counts.items())
+        summary = collections.Counter()
+        executor = pool.process_pool(max_workers)
+        batches = [items[start:start + BATCH_SIZE] for start in range(0, len(items), BATCH_SIZE)]
+        try:
+            for result in executor.map(_summarize_batch, batches):
+                summary.update(result)
+        except BrokenProcessPool:
+            pool.discard(executor)
+            raise
+        return summary
+
+
+def _summarize_batch(counts: List[Tuple[str, int]]) -> collections.Counter:
+    """ :returns the number of lines per format name. Executed within the process pool. """
+    return hash_identifier()._summarize(counts)
+
+
+@functools.lru_cache(maxsize=None)
+def hash_identifier() -> HashIdentifier:
+    """ :returns the hash identifier which is shared by the whole application. """
+    return HashIdentifier()
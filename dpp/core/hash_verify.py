@@ -0,0 +1,135 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import itertools
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, NamedTuple, Tuple
+
+# Number of candidates which are verified by a worker at once.
+CHUNK_SIZE = 256
+
+# Number of work units per process which are submitted ahead, so that workers do not idle.
+PREFETCH = 2
+
+
+class Progress(NamedTuple):
+    tested: int
+    position: int
+    size: int
+    cracked: int
+    rate: float
+
+
+def handler(name: str):
+    """ :returns the passlib handler (e.g. 'phpass' => passlib.hash.phpass). """
+    import passlib.hash
+    return getattr(passlib.hash, name)
+
+
+def identify(hashes: List[str], handler_names: List[str]) -> Dict[str, List[str]]:
+    """ :returns the names of the handlers which are able to verify each hash. Unknown hashes are omitted. """
+    result = {}
+    for text in hashes:
+        names = [name for name in handler_names if handler(name).identify(text)]
+        if names:
+            result[text] = names
+    return result
+
+
+def _read_chunks(wordlist: str, chunk_size: int) -> Iterator[Tuple[List[bytes], int]]:
+    """ :returns the candidates of the wordlist in chunks together with the position after each chunk. """
+    with open(wordlist, 'rb') as f:
+        while True:
+            lines = list(itertools.islice(f, chunk_size))
+            if not lines:
+                return
+            yield [line.rstrip(b'\r\n') for line in lines], f.tell()
+
+
+def _verify_chunk(targets: Dict[str, List[str]], words: List[bytes]) -> Dict[str, bytes]:
+    """ Verifies the candidates against the hashes. Executed within the process pool. """
+    handlers = {text: [handler(name) for name in names] for text, names in targets.items()}
+    found = {}
+    for word in words:
+        for text, candidates in handlers.items():
+            if text not in found and any(candidate.verify(word, text) for candidate in candidates):
+                found[text] = word
+        if len(found) == len(handlers):
+            break
+    return found
+
+
+def verify(hashes: Dict[str, List[str]], wordlist: str, max_workers: int = None, chunk_size: int = CHUNK_SIZE,
+           progress: Callable[[Progress], None] = None) -> Dict[str, bytes]:
+    """
+    Verifies the candidates of a wordlist against salted hashes using passlib. The wordlist is read in chunks which are
+    distributed across a process pool. Hashes are not verified anymore as soon as a matching candidate was found and
+    the wordlist is not read any further when all hashes were cracked.
+    :param hashes: the hashes together with the names of the passlib handlers able to verify them (see identify).
+    :param wordlist: the path to the wordlist (one candidate per line).
+    :param max_workers: the maximum number of processes (default = number of cpus).
+    :param chunk_size: the number of candidates which are verified by a worker at once.
+    :param progress: an optional function which is called after each chunk.
+    :returns the matching candidates of the cracked hashes.
+    """
+    found = {}
+    size = os.path.getsize(wordlist)
+    start = time.monotonic()
+    tested = 0
+
+    def _update(words: List[bytes], position: int, result: Dict[str, bytes]):
+        nonlocal tested
+        tested += len(words)
+        for text, word in result.items():
+            found.setdefault(text, word)
+        if progress:
+            elapsed = time.monotonic() - start
+            progress(Progress(tested, position, size, len(found), tested / elapsed if elapsed else 0.0))
+
+    def _pending() -> Dict[str, List[str]]:
+        return {text: names for text, names in hashes.items() if text not in found}
+
+    chunks = _read_chunks(wordlist, chunk_size)
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 2:
+        for words, position in chunks:
+            if not _pending():
+                break
+            _update(words, position, _verify_chunk(_pending(), words))
+        return found
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        running = {}
+        while True:
+            # Keep the pool busy while hashes are left to crack.
+            targets = _pending()
+            while targets and len(running) < max_workers * PREFETCH:
+                words, position = next(chunks, (None, None))
+                if words is None:
+                    break
+                running[executor.submit(_verify_chunk, targets, words)] = (words, position)
+            if not running or not _pending():
+                return found
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                words, position = running.pop(future)
+                _update(words, position, future.result())
+    finally:
+        # Chunks which are still queued are not needed anymore when all hashes were cracked.
+        executor.shutdown(wait=True, cancel_futures=True)
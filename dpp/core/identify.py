@@ -0,0 +1,257 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import atexit
+import collections
+import contextlib
+import functools
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Tuple
+
+# Maximum number of identified contents which are cached.
+CACHE_SIZE = 4096
+
+# Number of files which are passed to the model at once.
+BATCH_SIZE = 1000
+
+# Number of leading bytes passed to libmagic, which equals the default number of bytes libmagic examines.
+MAGIC_WINDOW_SIZE = 1024 * 1024
+
+
+def _digest(data: bytes) -> bytes:
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def iter_files(paths: Iterable[str]) -> Iterator[str]:
+    """ :returns an iterator over the files, including those within directories (recursively) in sorted order. """
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file in sorted(files):
+                    yield os.path.join(root, file)
+        else:
+            yield path
+
+
+def iter_records(paths: Iterable[str]) -> Iterator[Tuple[str, bytes]]:
+    """
+    :returns an iterator over the non-empty lines of the files (see iter_files) without their line terminators,
+             together with their position (e.g. ('samples/a.txt:3', b'...')).
+    """
+    for path in iter_files(paths):
+        with open(path, 'rb') as f:
+            for number, line in enumerate(f, start=1):
+                line = line.rstrip(b'\r\n')
+                if line:
+                    yield f'{path}:{number}', line
+
+
+class ContentCache:
+    """ Thread-safe LRU cache which maps the digest of a content to its identified type. """
+
+    def __init__(self, size: int = CACHE_SIZE):
+        self._size = size
+        self._lock = threading.Lock()
+        self._items = collections.OrderedDict()
+
+    def get(self, digest: bytes):
+        with self._lock:
+            label = self._items.get(digest)
+            if label is not None:
+                self._items.move_to_end(digest)
+            return label
+
+    def put(self, digest: bytes, label: str):
+        with self._lock:
+            self._items[digest] = label
+            if len(self._items) > self._size:
+                self._items.popitem(last=False)
+
+
+class MagikaSession:
+    """
+    Shared Magika session. The model is loaded once, either in the background using warm_up or on first use, and is
+    reused by all subsequent identifications. Results are cached by the digest of the content.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._magika = None
+        self._cache = ContentCache()
+
+    def warm_up(self) -> threading.Thread:
+        """ Loads the model within a background thread, so that the first identification does not stall. """
+        thread = threading.Thread(target=self._model, name='magika-warm-up', daemon=True)
+        thread.start()
+        return thread
+
+    def _model(self):
+        with self._lock:
+            if self._magika is None:
+                from magika import Magika
+                self._magika = Magika()
+            return self._magika
+
+    @staticmethod
+    def _label(result) -> str:
+        output = result.output
+        # Magika < 0.6 uses ct_label, newer versions use label.
+        label = getattr(output, 'ct_label', None) or output.label
+        return str(label)
+
+    def identify(self, data: bytes) -> str:
+        """ :returns the content type label of the data (e.g. 'png'). """
+        digest = _digest(data)
+        label = self._cache.get(digest)
+        if label is None:
+            label = self._label(self._model().identify_bytes(data))
+            self._cache.put(digest, label)
+        return label
+
+    def identify_batch(self, items: List[bytes]) -> List[str]:
+        """
+        Identifies many in-memory contents (e.g. line-split records) using the shared session, so that the model is
+        loaded once for all of them. Equal contents are identified once.
+        :param items: the raw contents.
+        :returns the content type labels in the order of the items.
+        """
+        return [self.identify(data) for data in items]
+
+    def identify_paths(self, paths: List[str]) -> List[str]:
+        """ :returns the content type labels of the files, which are identified by the model in a single batch. """
+        return [self._label(result) for result in self._model().identify_paths([Path(path) for path in paths])]
+
+
+class MagicPool:
+    """
+    Pool of long-lived libmagic handles. Since a handle must not be used by multiple threads at once, a handle is
+    checked out for each identification and returned afterwards. Handles are opened lazily, but never more than the
+    size of the pool, which avoids loading the magic database on each identification.
+    """
+
+    def __init__(self, window_size: int = MAGIC_WINDOW_SIZE, size: int = None):
+        """
+        :param window_size: the number of leading bytes which are passed to libmagic.
+        :param size: the maximum number of handles and threads (default = number of cpus).
+        """
+        self._window_size = window_size
+        self._size = size or os.cpu_count() or 1
+        self._slots = threading.BoundedSemaphore(self._size)
+        self._lock = threading.Lock()
+        self._handles = set()
+        self._idle = []
+        self._executor = None
+
+    @contextlib.contextmanager
+    def _handle(self):
+        """ Checks out an idle handle or opens a new one. Waits when all handles of the pool are in use. """
+        with self._slots:
+            with self._lock:
+                handle = self._idle.pop() if self._idle else None
+            if handle is None:
+                import magic
+                handle = magic.Magic()
+                with self._lock:
+                    self._handles.add(handle)
+            try:
+                yield handle
+            finally:
+                with self._lock:
+                    is_open = handle in self._handles
+                    if is_open:
+                        self._idle.append(handle)
+                if not is_open:
+                    # The pool was closed while the handle was in use.
+                    handle.close()
+
+    def _identify_all(self, items: List[bytes]) -> List[str]:
+        with self._handle() as handle:
+            return [handle.id_buffer(data[:self._window_size]) for data in items]
+
+    def _identify_files(self, paths: List[str]) -> List[str]:
+        with self._handle() as handle:
+            return [handle.id_filename(path) for path in paths]
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._size, thread_name_prefix='dpp-magic')
+            return self._executor
+
+    def _map(self, identify: Callable[[List], List[str]], items: List, max_workers: int = None) -> List[str]:
+        """
+        Splits the items into one slice per thread, so that each thread reuses one handle for all items of its slice.
+        Since libmagic is called via ctypes, which releases the GIL, the threads run in parallel.
+        """
+        max_workers = min(max_workers or self._size, self._size, len(items))
+        if max_workers < 2:
+            return identify(items)
+        size = -(-len(items) // max_workers)
+        slices = self._thread_pool().map(identify, [items[start:start + size] for start in range(0, len(items), size)])
+        return [description for descriptions in slices for description in descriptions]
+
+    def identify(self, data: bytes) -> str:
+        """ :returns the description of the data by libmagic, which only examines the leading window of the data. """
+        return self._identify_all([data])[0]
+
+    def identify_batch(self, items: List[bytes], max_workers: int = None) -> List[str]:
+        """
+        Identifies many in-memory contents (e.g. line-split records) at once.
+        :param items: the raw contents.
+        :param max_workers: the maximum number of threads (default = size of the pool).
+        :returns the descriptions in the order of the items.
+        """
+        return self._map(self._identify_all, items, max_workers)
+
+    def identify_paths(self, paths: List[str], max_workers: int = None) -> List[str]:
+        """
+        Identifies many files at once. libmagic reads the head of each file itself.
+        :param paths: the paths of the files.
+        :param max_workers: the maximum number of threads (default = size of the pool).
+        :returns the descriptions in the order of the paths.
+        """
+        return self._map(self._identify_files, paths, max_workers)
+
+    def close(self):
+        """ Closes all handles. Handles which are in use are closed as soon as they are returned. """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+        with self._lock:
+            handles, self._handles, self._idle = self._idle, set(), []
+        for handle in handles:
+            handle.close()
+
+
+@functools.lru_cache(maxsize=None)
+def magic_pool() -> MagicPool:
+    """ :returns the pool of libmagic handles which is shared by the whole application. """
+    pool = MagicPool()
+    # Handles need to be closed explicitly before the interpreter shuts down.
+    atexit.register(pool.close)
+    return pool
+
+
+@functools.lru_cache(maxsize=None)
+def magika_session() -> MagikaSession:
+    """ :returns the Magika session which is shared by the whole application. """
+    return MagikaSession()
@@ -0,0 +1,254 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import functools
+import itertools
+import json
+import os
+import re
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+from dpp.core import pool
+from dpp.core.exceptions import CodecException
+from dpp.core.lines import iter_lines
+
+# Maximum number of compiled expressions which are cached.
+CACHE_SIZE = 128
+
+# Number of JSON lines which are sent to a worker at once.
+BATCH_SIZE = 1000
+
+# Minimum number of batches of JSON lines before the process pool is used. Smaller inputs are processed in-process.
+MIN_PARALLEL_BATCHES = 8
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+# Integers with this many digits might not fit into 64 bits, which orjson parses as floats.
+_LONG_NUMBER = re.compile(r'[0-9]{19}')
+
+
+class Language:
+    JQ = "jq"
+    JSONPATH = "jsonpath"
+
+
+class Format:
+    JSON = "JSON"
+    JSON_LINES = "JSON Lines"
+    JSON_ARRAY_ITEMS = "JSON Array Items"
+
+
+@functools.lru_cache(maxsize=None)
+def _fast_loads() -> Optional[Callable[[str], Any]]:
+    """ :returns orjson.loads if orjson is installed, otherwise None. """
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        return None
+
+
+def _loads(text: str) -> Any:
+    """
+    Parses a JSON document. orjson is used as fast path when it is installed. Documents which orjson rejects
+    (e.g. NaN, 1e400 or surrogate-escaped binary data) or which might contain integers exceeding 64 bits are parsed
+    by json, so that the result does not depend on whether orjson is installed.
+    :raises ValueError when the document is invalid.
+    """
+    fast_loads = _fast_loads()
+    if fast_loads is not None and not _LONG_NUMBER.search(text):
+        try:
+            return fast_loads(text)
+        except ValueError:
+            pass
+    return json.loads(text)
+
+
+# The default encoder uses the C-accelerated implementation of the json module and is shared by all calls.
+_dumps = json.JSONEncoder().encode
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile_jq(expression: str) -> Callable[[Any], Iterable[Any]]:
+    import pyjq
+    return pyjq.compile(expression).all
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile_jsonpath(expression: str) -> Callable[[Any], Iterable[Any]]:
+    from jsonpath_ng import parse
+    find = parse(expression).find
+    return lambda document: [match.value for match in find(document)]
+
+
+_COMPILERS = {
+    Language.JQ: _compile_jq,
+    Language.JSONPATH: _compile_jsonpath
+}
+
+
+def compile_expression(language: str, expression: str) -> Callable[[Any], Iterable[Any]]:
+    """
+    Compiles an expression. Compiled expressions are cached, so that they are not parsed again on each run.
+    :param language: the language of the expression (either Language.JQ or Language.JSONPATH).
+    :param expression: the expression (e.g. '.a[].b').
+    :returns a function which returns the results of the expression applied to a parsed JSON document.
+    :raises CodecException when the expression is invalid.
+    """
+    try:
+        return _COMPILERS[language](expression)
+    except Exception as err:
+        raise CodecException(f'Invalid {language} expression! {err}')
+
+
+def _query(find: Callable[[Any], Iterable[Any]], document: Any) -> List[str]:
+    try:
+        return [_dumps(item) for item in find(document)]
+    except Exception as err:
+        raise CodecException(f'Querying JSON failed! {err}')
+
+
+def _query_lines(language: str, expression: str, lines: List[str], line_number: int) -> List[str]:
+    """ :returns the serialized results of all JSON lines. Executed within the process pool. """
+    find = compile_expression(language, expression)
+    results = []
+    for line_number, line in enumerate(lines, start=line_number):
+        if not line.strip():
+            continue
+        try:
+            document = _loads(line)
+        except ValueError as err:
+            raise CodecException(f'Error decoding json in line {line_number}! {err}')
+        results.extend(_query(find, document))
+    return results
+
+
+def _iter_array_items(chunks: Iterable[str]) -> Iterator[Any]:
+    """ Parses the items of a top-level JSON array one by one without loading the whole array into memory. """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    position = 0
+    state = '['
+    chunks = iter(chunks)
+    is_exhausted = False
+    while True:
+        position = _WHITESPACE.match(buffer, position).end()
+        if position < len(buffer):
+            char = buffer[position]
+            if state == ',' and char == ',':
+                state, position = 'item', position + 1
+                continue
+            if state == '[':
+                if char != '[':
+                    raise CodecException('Error decoding json! Expected top-level array.')
+                state, position = 'item', position + 1
+                continue
+            if char == ']' and state in (',', 'item'):
+                return
+            if state == ',':
+                raise CodecException(f'Error decoding json! Expected "," or "]" at position {position}.')
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+                # Numbers at the end of the buffer might continue within the next chunk.
+                if end < len(buffer) or is_exhausted:
+                    yield item
+                    state, position = ',', end
+                    continue
+            except json.JSONDecodeError as err:
+                if is_exhausted:
+                    raise CodecException(f'Error decoding json! {err}')
+        elif is_exhausted:
+            raise CodecException('Error decoding json! Unexpected end of input.')
+
+        # More data is required.
+        chunk = next(chunks, None)
+        if chunk is None:
+            is_exhausted = True
+        else:
+            buffer = buffer[position:] + chunk
+            position = 0
+
+
+def query(language: str, expression: str, text: str, format: str = Format.JSON, max_workers: int = None) -> str:
+    """ :returns the results of the expression, one JSON value per line. See query_stream for the parameters. """
+    return os.linesep.join(query_stream(language, expression, [text], format, max_workers))
+
+
+def query_stream(language: str, expression: str, chunks: Iterable[str], format: str = Format.JSON,
+                 max_workers: int = None) -> Iterator[str]:
+    """
+    Applies an expression to a stream of JSON text chunks.
+    :param language: the language of the expression (either Language.JQ or Language.JSONPATH).
+    :param expression: the expression (e.g. '.a[].b').
+    :param chunks: the JSON text chunks.
+    :param format: how the input is structured. Format.JSON applies the expression to one document,
+                   Format.JSON_LINES applies the expression to each line and Format.JSON_ARRAY_ITEMS applies the
+                   expression to each item of a top-level array which is parsed incrementally.
+    :param max_workers: the maximum number of processes used for large JSON lines inputs (default = number of cpus).
+    :returns an iterator over the serialized results.
+    :raises CodecException when the input or the expression is invalid.
+    """
+    find = compile_expression(language, expression)
+    if format == Format.JSON:
+        try:
+            document = _loads(''.join(chunks))
+        except ValueError as err:
+            raise CodecException(f'Error decoding json! {err}')
+        yield from _query(find, document)
+    elif format == Format.JSON_ARRAY_ITEMS:
+        for item in _iter_array_items(chunks):
+            yield from _query(find, item)
+    elif format == Format.JSON_LINES:
+        batches = _batches(iter_lines(chunks))
+        max_workers = max_workers or os.cpu_count() or 1
+        # Small inputs do not outweigh the cost of sending them to other processes.
+        head = list(itertools.islice(batches, MIN_PARALLEL_BATCHES)) if max_workers >= 2 else []
+        if len(head) < MIN_PARALLEL_BATCHES:
+            for line_number, batch in itertools.chain(head, batches):
+                yield from _query_lines(language, expression, batch, line_number)
+            return
+        executor = pool.process_pool(max_workers)
+        pending = collections.deque()
+        try:
+            for line_number, batch in itertools.chain(head, batches):
+                pending.append(executor.submit(_query_lines, language, expression, batch, line_number))
+                # Limit the number of batches in flight to keep memory usage bounded.
+                while len(pending) > 2 * max_workers:
+                    yield from pending.popleft().result()
+            while pending:
+                yield from pending.popleft().result()
+        except BrokenProcessPool:
+            pool.discard(executor)
+            raise
+        finally:
+            # Batches which are not needed anymore (e.g. on error) should not keep the shared pool busy.
+            for future in pending:
+                future.cancel()
+    else:
+        raise CodecException(f'Unknown format "{format}"!')
+
+
+def _batches(lines: Iterator[str]) -> Iterator:
+    """ :returns an iterator over the line number of the first line of a batch and the batch of lines. """
+    line_number = 1
+    while True:
+        batch = list(itertools.islice(lines, BATCH_SIZE))
+        if not batch:
+            return
+        yield line_number, batch
+        line_number += len(batch)
@@ -0,0 +1,196 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import hashlib
+import json
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, wait
+from typing import Callable, Dict, List, Optional
+
+from dpp.core import pool
+
+# Number of characters of the input which are used to detect the format.
+SAMPLE_SIZE = 16 * 1024
+
+# Minimum number of characters of the sample from which formats are parsed by the process pool. Smaller samples are
+# parsed faster inline than they are sent to other processes.
+MIN_PARALLEL_SAMPLE_SIZE = 8 * 1024
+
+# Maximum number of detected formats which are cached.
+CACHE_SIZE = 128
+
+# Signature score from which a format which parses successfully is accepted without trying the remaining formats.
+HIGH_CONFIDENCE = 3
+
+_cache = collections.OrderedDict()
+
+
+def head_sample(text: str, size: int = SAMPLE_SIZE) -> str:
+    """ :returns the head of the text which is cut at the last complete line (e.g. for detecting the format). """
+    if len(text) <= size:
+        return text
+    end = text.rfind('\n', 0, size)
+    return text[:end] if end > 0 else text[:size]
+
+
+def _first_line(sample: str) -> str:
+    return next((line for line in sample.splitlines() if line.strip()), '')
+
+
+def _consistent_count(sample: str, char: str) -> bool:
+    """ :returns whether all non-comment lines contain the same number of the character (at least one). """
+    counts = {line.count(char) for line in sample.splitlines() if line and not line.startswith('#')}
+    return len(counts) == 1 and 0 not in counts
+
+
+def _fields(sample: str, count: int) -> bool:
+    """ :returns whether all lines contain the specified number of colon-separated fields (e.g. /etc/passwd). """
+    lines = [line for line in sample.splitlines() if line and not line.startswith('#')]
+    return bool(lines) and all(line.count(':') == count - 1 for line in lines)
+
+
+# Cheap signatures of formats, which return a score indicating how likely the sample is of the format.
+_SIGNATURES: Dict[str, Callable[[str], int]] = {
+    'cef': lambda sample: 3 if 'CEF:' in _first_line(sample) else 0,
+    'csv': lambda sample: 2 if _consistent_count(sample, ',') else 0,
+    'df': lambda sample: 3 if _first_line(sample).startswith('Filesystem') else 0,
+    'dig': lambda sample: 3 if '<<>> DiG' in sample else 0,
+    'email-address': lambda sample: 2 if re.fullmatch(r'[^@\s]+@[^@\s]+', sample.strip()) else 0,
+    'free': lambda sample: 3 if 'Mem:' in sample and 'total' in _first_line(sample) else 0,
+    'git-log': lambda sample: 3 if re.match(r'commit [0-9a-f]{7,40}\b', sample) else 0,
+    'group': lambda sample: 2 if _fields(sample, 4) else 0,
+    'ini': lambda sample: 2 if re.search(r'^\[[^\]\n]+\]\s*$', sample, re.MULTILINE) else 0,
+    'ip-address': lambda sample: 3 if re.fullmatch(r'[0-9a-fA-F.:/]+', sample.strip()) else 0,
+    'jwt': lambda sample: 3 if re.fullmatch(r'eyJ[\w-]*\.[\w-]*\.[\w-]*', sample.strip()) else 0,
+    'kv': lambda sample: 1 if _consistent_count(sample, '=') else 0,
+    'lsmod': lambda sample: 3 if _first_line(sample).startswith('Module') else 0,
+    'lsof': lambda sample: 3 if 'NODE NAME' in _first_line(sample) else 0,
+    'm3u': lambda sample: 3 if sample.startswith('#EXTM3U') else 0,
+    'ntpq': lambda sample: 2 if '=====' in sample else 0,
+    'passwd': lambda sample: 2 if _fields(sample, 7) else 0,
+    'ping': lambda sample: 3 if sample.startswith('PING ') else 0,
+    'plist': lambda sample: 4 if '<plist' in sample[:1024] else 0,
+    'ps': lambda sample: 2 if 'PID' in _first_line(sample) else 0,
+    'shadow': lambda sample: 2 if _fields(sample, 9) else 0,
+    'syslog': lambda sample: 2 if re.match(r'<\d{1,3}>', sample) else 0,
+    'traceroute': lambda sample: 3 if sample.startswith('traceroute') else 0,
+    'url': lambda sample: 3 if re.fullmatch(r'[a-zA-Z][\w+.-]*://\S+', sample.strip()) else 0,
+    'x509-cert': lambda sample: 3 if '-----BEGIN CERTIFICATE-----' in sample else 0,
+    'xml': lambda sample: 2 if sample.lstrip().startswith('<') else 0,
+    'yaml': lambda sample: 2 if sample.startswith('---') else 0,
+}
+
+
+def signature_score(input_format: str, sample: str) -> int:
+    """ :returns how likely the sample is of the format based on cheap signatures (0 = unknown). """
+    signature = _SIGNATURES.get(input_format)
+    try:
+        return signature(sample) if signature else 0
+    except Exception:
+        return 0
+
+
+def rank_formats(input_formats: List[str], sample: str) -> List[str]:
+    """ :returns the formats ordered by their signature score. Formats with equal scores keep their order. """
+    scores = {input_format: signature_score(input_format, sample) for input_format in input_formats}
+    return sorted(input_formats, key=lambda input_format: -scores[input_format])
+
+
+def parse_length(input_format: str, sample: str) -> int:
+    """
+    Parses the sample using jc. Executed within the process pool.
+    :returns the length of the JSON output, or 0 when parsing failed or contains unparsable lines.
+    """
+    try:
+        import jc
+        output_text = json.dumps(jc.parse(input_format, sample, quiet=True))
+    except Exception:
+        return 0
+    if '"unparsable"' in output_text:
+        return 0
+    return len(output_text)
+
+
+def _digest(text: str) -> bytes:
+    return hashlib.blake2b(text.encode('utf-8', errors='surrogateescape'), digest_size=16).digest()
+
+
+def detect_format(input_formats: List[str], text: str, pre_check: Callable[[str, str], bool] = None,
+                  max_workers: int = 1) -> Optional[str]:
+    """
+    Detects the format of the text by parsing a head sample with jc. Candidate formats are ordered by cheap
+    signatures and parsed one by one, or by the shared process pool when the sample is large. As soon as a format with a high signature score parses successfully it is
+    returned, otherwise the format with the highest signature score and the longest output wins. Results are cached per
+    input digest.
+    :param input_formats: the candidate formats.
+    :param text: the input text.
+    :param pre_check: an optional function which quickly rules out formats (input_format, sample) -> bool.
+    :param max_workers: the maximum number of processes used for large samples (default = 1 = no processes,
+                        0 = number of cpus).
+    :returns the detected format or None if no format could be detected.
+    """
+    key = (_digest(text), tuple(input_formats))
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    sample = head_sample(text)
+    candidates = [input_format for input_format in rank_formats(input_formats, sample)
+                  if not pre_check or pre_check(input_format, sample)]
+    scores = {input_format: signature_score(input_format, sample) for input_format in candidates}
+    lengths = {}
+
+    def _is_confident(input_format: str) -> bool:
+        return lengths[input_format] > 0 and scores[input_format] >= HIGH_CONFIDENCE
+
+    result = None
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 2 or len(sample) < MIN_PARALLEL_SAMPLE_SIZE:
+        for input_format in candidates:
+            lengths[input_format] = parse_length(input_format, sample)
+            if _is_confident(input_format):
+                result = input_format
+                break
+    else:
+        executor = pool.process_pool(max_workers)
+        pending = {}
+        try:
+            pending = {executor.submit(parse_length, input_format, sample): input_format
+                       for input_format in candidates}
+            while pending and not result:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    input_format = pending.pop(future)
+                    lengths[input_format] = future.result()
+                    if _is_confident(input_format) and (
+                            not result or candidates.index(input_format) < candidates.index(result)):
+                        result = input_format
+        finally:
+            # Formats which are still pending are not needed anymore when a confident match was found.
+            for future in pending:
+                future.cancel()
+
+    if not result:
+        # Prefer formats with matching signatures, then the longest output. Remaining ties are resolved by rank.
+        parsed = [input_format for input_format in candidates if lengths.get(input_format)]
+        result = max(parsed, key=lambda input_format: (scores[input_format], lengths[input_format]), default=None)
+
+    _cache[key] = result
+    if len(_cache) > CACHE_SIZE:
+        _cache.popitem(last=False)
+    return result
@@ -0,0 +1,139 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import base64
+import binascii
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, IO, List
+
+from dpp.core import batch
+
+# Encodings of the input and output within requests and responses.
+ENCODINGS = ('utf8', 'base64')
+
+
+def _actions(chain: Any) -> List[batch.Action]:
+    """
+    :param chain: the actions (e.g. [["decode", "base64"], ["script", "search_and_replace", "search_term=a"]]).
+                  Options may also be specified as object (e.g. ["script", "search_and_replace", {"search_term": "a"}]).
+    :raises ValueError when the chain is invalid.
+    """
+    if not isinstance(chain, list) or not chain:
+        raise ValueError('Invalid chain! Expected a list of actions (e.g. [["decode", "base64"]]).')
+    actions = []
+    for step in chain:
+        if not isinstance(step, list) or len(step) < 2 or not all(isinstance(value, str) for value in step[:2]):
+            raise ValueError(f'Invalid action {json.dumps(step)}! Expected ["<type>", "<name>", <options>...].')
+        values = step[1:]
+        if len(step) == 3 and isinstance(step[2], dict):
+            values = [step[1]] + [f'{key}={value}' for key, value in step[2].items()]
+        actions.append(batch.action(step[0], [str(value) for value in values]))
+    return actions
+
+
+def _decode(text: str, encoding: str) -> bytes:
+    if encoding == 'base64':
+        try:
+            return base64.b64decode(text, validate=True)
+        except binascii.Error as err:
+            raise ValueError(f'Invalid base64 input! {err}')
+    return text.encode('utf-8', errors='surrogateescape')
+
+
+def _encode(data: bytes, encoding: str) -> str:
+    if encoding == 'base64':
+        return base64.b64encode(data).decode('ascii')
+    return data.decode('utf-8', errors='replace')
+
+
+class Processor:
+    """
+    Processes requests of the JSON Lines protocol. Each request is a JSON object on a single line:
+
+        {"id": 1, "input": "aGVsbG8=", "input_encoding": "utf8", "chain": [["decode", "base64"], ["hash", "md5"]]}
+
+    Each response contains the id of the request and either the output or the error:
+
+        {"id": 1, "output": "5d41402abc4b2a76b9719d911017c592", "output_encoding": "utf8"}
+        {"id": 2, "error": "No decoder named \\"base65\\". Did you mean \\"base64\\"?"}
+
+    The input encoding is either utf8 (default) or base64. The output encoding defaults to the input encoding.
+    """
+
+    def __init__(self, context: 'dpp.core.context.Context'):
+        self._chains = batch.ChainCache(context)
+
+    def process(self, line: str) -> Dict[str, Any]:
+        """ :returns the response to the request, which contains an error when the request could not be processed. """
+        request_id = None
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as err:
+                raise ValueError(f'Invalid JSON! {err}')
+            if not isinstance(request, dict):
+                raise ValueError('Invalid request! Expected a JSON object.')
+            request_id = request.get('id')
+            input_encoding = request.get('input_encoding', 'utf8')
+            output_encoding = request.get('output_encoding', input_encoding)
+            for encoding in (input_encoding, output_encoding):
+                if encoding not in ENCODINGS:
+                    raise ValueError(f'Invalid encoding "{encoding}"! Expected one of {", ".join(ENCODINGS)}.')
+            if not isinstance(request.get('input'), str):
+                raise ValueError('Invalid input! Expected a string.')
+            chain = request.get('chain')
+            # Chains are cached by their structure, so that equal chains are looked up and configured only once.
+            plugins = self._chains.get(json.dumps(chain, sort_keys=True), lambda: _actions(chain))
+            output = batch.transform(plugins, _decode(request['input'], input_encoding))
+            return {'id': request_id, 'output': _encode(output, output_encoding), 'output_encoding': output_encoding}
+        except Exception as err:
+            return {'id': request_id, 'error': str(err) or type(err).__name__}
+
+
+def serve(context: 'dpp.core.context.Context', input: IO[str], output: IO[str], max_workers: int = None):
+    """
+    Reads requests from the input line by line and writes the responses to the output as soon as they are done, hence
+    responses may be written out of order. Requests are processed by a pool of threads, of which only a limited
+    number are in flight at once.
+    :param context: the application context.
+    :param input: the stream of requests (e.g. stdin).
+    :param output: the stream of responses (e.g. stdout).
+    :param max_workers: the maximum number of threads (default = number of cpus).
+    """
+    processor = Processor(context)
+    max_workers = max_workers or os.cpu_count() or 1
+    lock = threading.Lock()
+    # Limit the number of requests in flight to keep memory usage bounded.
+    slots = threading.BoundedSemaphore(2 * max_workers)
+
+    def _process(line: str):
+        try:
+            response = json.dumps(processor.process(line))
+            with lock:
+                output.write(response + '\n')
+                output.flush()
+        finally:
+            slots.release()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for line in input:
+            if not line.strip():
+                continue
+            slots.acquire()
+            executor.submit(_process, line)
@@ -0,0 +1,149 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import base64
+import hmac
+import json
+import mmap
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from dpp.core.exceptions import CodecException
+from dpp.core.lines import line_ranges
+
+# Number of bytes of the wordlist which are tested by a worker at once.
+CHUNK_SIZE = 1024 * 1024
+
+# Number of shards per process which are submitted ahead, so that workers do not idle.
+PREFETCH = 2
+
+# Digests of the HMAC-based JWT algorithms.
+ALGORITHMS = {
+    'HS256': 'sha256',
+    'HS384': 'sha384',
+    'HS512': 'sha512',
+}
+
+
+class Token(NamedTuple):
+    algorithm: str
+    signing_input: bytes
+    signature: bytes
+
+
+class Progress(NamedTuple):
+    tested: int
+    position: int
+    size: int
+    rate: float
+
+
+def _base64url_decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + '=' * (-len(text) % 4))
+
+
+def parse_token(text: str) -> Token:
+    """
+    Parses a JSON Web Token which is signed using HMAC.
+    :returns the algorithm, the signing input (header and payload) and the signature of the token.
+    :raises CodecException when the token is invalid or not signed using HMAC.
+    """
+    try:
+        header, payload, signature = text.strip().split('.')
+        algorithm = json.loads(_base64url_decode(header)).get('alg')
+        signature = _base64url_decode(signature)
+        signing_input = f'{header}.{payload}'.encode('ascii')
+    except Exception:
+        raise CodecException('Invalid JSON Web Token!')
+    if algorithm not in ALGORITHMS:
+        raise CodecException(f'Unsupported algorithm "{algorithm}"! Expected one of {", ".join(ALGORITHMS)}.')
+    return Token(algorithm, signing_input, signature)
+
+
+def _test_shard(token: Token, wordlist: str, start: int, end: int) -> Tuple[Optional[bytes], int]:
+    """
+    Tests the candidates of a line-aligned range of the wordlist. Executed within the process pool.
+    :returns the secret (or None if the range does not contain it) and the number of tested candidates.
+    """
+    digest, signing_input, signature = ALGORITHMS[token.algorithm], token.signing_input, token.signature
+    with open(wordlist, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        words = data[start:end].split(b'\n')
+    if words and not words[-1]:
+        words.pop()
+    for tested, word in enumerate(words, 1):
+        if word.endswith(b'\r'):
+            word = word[:-1]
+        if hmac.compare_digest(hmac.digest(word, signing_input, digest), signature):
+            return word, tested
+    return None, len(words)
+
+
+def crack(token: Token, wordlist: str, max_workers: int = None, chunk_size: int = CHUNK_SIZE,
+          progress: Callable[[Progress], None] = None) -> Optional[bytes]:
+    """
+    Tests the candidates of a wordlist as HMAC secret of a token. Instead of decoding the token for each candidate, the
+    signature of the precomputed signing input is compared with the expected one. The wordlist is split into shards
+    which are tested by a process pool. Shards which were not tested yet are cancelled as soon as the secret was found.
+    :param token: the parsed token (see parse_token).
+    :param wordlist: the path to the wordlist (one candidate per line).
+    :param max_workers: the maximum number of processes (default = number of cpus).
+    :param chunk_size: the number of bytes of the wordlist which are tested at once.
+    :param progress: an optional function which is called after each shard.
+    :returns the secret, or None if the wordlist does not contain it.
+    """
+    size = os.path.getsize(wordlist)
+    start = time.monotonic()
+    tested = 0
+
+    def _update(count: int, position: int):
+        nonlocal tested
+        tested += count
+        if progress:
+            elapsed = time.monotonic() - start
+            progress(Progress(tested, position, size, tested / elapsed if elapsed else 0.0))
+
+    shards = iter(line_ranges(wordlist, chunk_size))
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 2:
+        for shard_start, shard_end in shards:
+            secret, count = _test_shard(token, wordlist, shard_start, shard_end)
+            _update(count, shard_end)
+            if secret is not None:
+                return secret
+        return None
+
+    executor = ProcessPoolExecutor(max_workers=max_workers)
+    try:
+        running = {}
+        while True:
+            while len(running) < max_workers * PREFETCH:
+                shard_start, shard_end = next(shards, (None, None))
+                if shard_start is None:
+                    break
+                running[executor.submit(_test_shard, token, wordlist, shard_start, shard_end)] = shard_end
+            if not running:
+                return None
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                secret, count = future.result()
+                _update(count, running.pop(future))
+                if secret is not None:
+                    return secret
+    finally:
+        # Shards which are still queued are not needed anymore when the secret was found.
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,147 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import re
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Characters at which str.splitlines splits a text.
+LINE_BREAKS = '\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029'
+
+
+class Match:
+    ANY = "any"
+    ALL = "all"
+
+
+def iter_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Splits a stream of text chunks into lines. Lines may span multiple chunks.
+    :param chunks: the text chunks.
+    :returns an iterator over the lines without line breaks, the same as ''.join(chunks).splitlines() would return.
+    """
+    rest = ''
+    for chunk in chunks:
+        text = rest + chunk if rest else chunk
+        if not text:
+            continue
+        lines = text.splitlines()
+        if text[-1] == '\r':
+            # The line break might be continued by a '\n' within the next chunk.
+            rest = lines.pop() + '\r'
+        elif text[-1] not in LINE_BREAKS:
+            rest = lines.pop()
+        else:
+            rest = ''
+        yield from lines
+    if rest:
+        yield from rest.splitlines()
+
+
+def line_ranges(path: str, chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Splits a file into byte ranges of about the specified size which are aligned to line boundaries, so that the ranges
+    can be processed independently (e.g. by a process pool).
+    :param path: the path to the file.
+    :param chunk_size: the minimum number of bytes of each range (except the last).
+    :returns the start and end offsets of the ranges.
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_size, size))
+            f.readline()
+            end = min(f.tell(), size)
+            ranges.append((start, end))
+            start = end
+    return ranges
+
+
+def trie_pattern(terms: List[str]) -> str:
+    """
+    :returns a regular expression matching any of the terms which is structured as trie (e.g. ['ab', 'ac'] =>
+    'a(?:b|c)'), so that the regex engine only needs to follow a single branch per character.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def _pattern(node: Dict) -> str:
+        is_end = '' in node
+        branches = [re.escape(char) + _pattern(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        pattern = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if is_end:
+            return ('(?:' + pattern + ')?') if len(branches) == 1 else pattern + '?'
+        return pattern
+
+    return _pattern(trie)
+
+
+def compile_filter(terms: List[str], is_regex: bool = False, should_match_case: bool = True,
+                   should_invert_match: bool = False, match: str = Match.ANY) -> Callable[[str], Optional[str]]:
+    """
+    Compiles the filter terms into a predicate which is applied to each line.
+
+    Regular expressions need to match at the start of the line. When a line is matched by a single or any-of
+    regular expression, only the matched part of the line is returned.
+
+    :param terms: the terms to filter by.
+    :param is_regex: whether the terms are regular expressions.
+    :param should_match_case: whether the terms are case-sensitive.
+    :param should_invert_match: whether lines which are not matched should be returned.
+    :param match: whether any (Match.ANY) or all (Match.ALL) of the terms need to match.
+    :returns a function which returns the line (or the matched part of it) when it passes the filter, otherwise None.
+    :raises re.error when a term is not a valid regular expression.
+    """
+    flags = 0 if should_match_case else re.IGNORECASE
+    if is_regex:
+        if match == Match.ALL:
+            patterns = [re.compile(term, flags) for term in terms]
+            predicate = lambda line: all(pattern.match(line) for pattern in patterns)
+        else:
+            pattern = re.compile(terms[0] if len(terms) == 1 else '|'.join(f'(?:{term})' for term in terms), flags)
+            if not should_invert_match:
+                def _extract(line: str) -> Optional[str]:
+                    result = pattern.match(line)
+                    return result.group(0) if result else None
+                return _extract
+            predicate = lambda line: pattern.match(line) is not None
+    elif match == Match.ALL:
+        if should_match_case:
+            predicate = lambda line: all(term in line for term in terms)
+        else:
+            folded_terms = [term.lower() for term in terms]
+
+            def predicate(line: str) -> bool:
+                line = line.lower()
+                return all(term in line for term in folded_terms)
+    elif len(terms) == 1 and should_match_case:
+        term = terms[0]
+        predicate = lambda line: term in line
+    else:
+        search = re.compile(trie_pattern(terms), flags).search
+        predicate = lambda line: search(line) is not None
+
+    if should_invert_match:
+        return lambda line: None if predicate(line) else line
+    return lambda line: line if predicate(line) else None
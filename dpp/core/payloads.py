@@ -0,0 +1,167 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import fnmatch
+import hashlib
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple
+
+from dpp.core.exceptions import CodecException
+
+# Number of payloads which are encoded by a worker at once.
+BATCH_SIZE = 256
+
+
+class Format:
+    TSV = "TSV"
+    JSONL = "JSONL"
+
+
+class Result(NamedTuple):
+    payload: str
+    chain: Tuple[str, ...]
+    output: str
+
+
+def encoder_chains(names: Iterable[str], depth: int, include: Iterable[str] = (),
+                   exclude: Iterable[str] = ()) -> List[Tuple[str, ...]]:
+    """
+    Enumerates the chains of encoders up to the specified depth, shorter chains first.
+    :param names: the method names of the encoders (e.g. ['url', 'html', ...]).
+    :param depth: the maximum number of encoders within a chain.
+    :param include: patterns of the encoders to use (e.g. ['url*', 'html']). All encoders are used when empty.
+    :param exclude: patterns of the encoders to skip (e.g. ['gzip']).
+    :returns the chains (e.g. [('url',), ('html',), ('url', 'url'), ('url', 'html'), ...]).
+    """
+    include, exclude = list(include), list(exclude)
+    names = [name for name in names
+             if (not include or any(fnmatch.fnmatchcase(name, pattern) for pattern in include)) and
+             not any(fnmatch.fnmatchcase(name, pattern) for pattern in exclude)]
+    return [chain for length in range(1, depth + 1) for chain in itertools.product(names, repeat=length)]
+
+
+_worker_encoders: Dict[str, Callable[[str], str]] = {}
+
+
+def _init_worker(app_id: str, app_path: str, configs: Dict[str, Dict[str, Any]]):
+    """ Loads the plugins once per worker process and configures the encoders the same as within the parent. """
+    global _worker_encoders
+    from dpp.core import Context
+    from dpp.core.plugin import PluginType
+    context = Context(app_id, app_path)
+    plugins = {plugin.method_name: plugin for plugin in context.plugins().filter(type=PluginType.ENCODER)}
+    _worker_encoders = {}
+    for name, config in configs.items():
+        plugin = plugins[name].clone()
+        plugin.config.update(config)
+        _worker_encoders[name] = plugin.run
+
+
+def _encode(encoders: Dict[str, Callable[[str], str]], chains: List[Tuple[str, ...]],
+            payloads: List[str]) -> List[Result]:
+    """
+    Applies all chains to each payload. Since chains are ordered by length, the output of the prefix of a chain is
+    always computed beforehand and only the last encoder needs to be applied. Chains whose prefix failed are skipped.
+    """
+    results = []
+    for payload in payloads:
+        outputs = {(): payload}
+        for chain in chains:
+            text = outputs.get(chain[:-1])
+            if text is None:
+                continue
+            try:
+                output = outputs[chain] = encoders[chain[-1]](text)
+            except Exception:
+                continue
+            results.append(Result(payload, chain, output))
+    return results
+
+
+def _encode_batch(chains: List[Tuple[str, ...]], payloads: List[str]) -> List[Result]:
+    """ Executed within the process pool. """
+    return _encode(_worker_encoders, chains, payloads)
+
+
+def _digest(text: str) -> int:
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8', errors='surrogateescape'), digest_size=8).digest(), 'big')
+
+
+def generate(context: 'dpp.core.context.Context', payloads: Iterable[str], chains: List[Tuple[str, ...]],
+             max_workers: int = None) -> Iterator[Result]:
+    """
+    Encodes each payload by each chain of encoders. Payloads are read lazily and encoded in batches by a process pool,
+    of which only a few are in flight at once. Identical outputs are yielded once, which is tracked by a set of 64-bit
+    digests instead of the outputs themselves. Still, each distinct output costs about 50-70 bytes (an int object plus
+    its slot within the set), i.e. roughly 70 MB per million distinct outputs.
+    :param context: the application context, whose encoder plugins are used as currently configured.
+    :param payloads: the payloads (e.g. the lines of a file). Empty payloads are skipped.
+    :param chains: the chains of encoders (see encoder_chains).
+    :param max_workers: the maximum number of processes (default = number of cpus).
+    :returns an iterator over the distinct results in the order of the payloads and chains.
+    """
+    from dpp.core.plugin import PluginType
+    plugins = {plugin.method_name: plugin for plugin in context.plugins().filter(type=PluginType.ENCODER)}
+    names = {name for chain in chains for name in chain}
+    unknown = sorted(names - plugins.keys())
+    if unknown:
+        raise CodecException(f'Unknown encoder "{unknown[0]}"!')
+    encoders = {name: plugins[name].run for name in names}
+    payloads = (payload for payload in payloads if payload)
+    batches = iter(lambda: list(itertools.islice(payloads, BATCH_SIZE)), [])
+    seen = set()
+
+    def _distinct(results: List[Result]) -> Iterator[Result]:
+        for result in results:
+            digest = _digest(result.output)
+            if digest not in seen:
+                seen.add(digest)
+                yield result
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers < 2:
+        for batch in batches:
+            yield from _distinct(_encode(encoders, chains, batch))
+        return
+
+    configs = {name: {key: option.value for key, option in plugins[name].config.items()} for name in names}
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(context.getAppID(), context.getAppPath(), configs)) as executor:
+        pending = collections.deque()
+        for batch in batches:
+            pending.append(executor.submit(_encode_batch, chains, batch))
+            # Limit the number of batches in flight to keep memory usage bounded.
+            while len(pending) > 2 * max_workers:
+                yield from _distinct(pending.popleft().result())
+        while pending:
+            yield from _distinct(pending.popleft().result())
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n').replace('\r', '\\r')
+
+
+def format_result(result: Result, format: str) -> str:
+    """ :returns the result as a tab-separated line of payload, chain and output, or as a JSON line. """
+    if format == Format.TSV:
+        return '\t'.join([_escape(result.payload), ','.join(result.chain), _escape(result.output)])
+    if format == Format.JSONL:
+        return json.dumps({'payload': result.payload, 'chain': list(result.chain), 'output': result.output})
+    raise CodecException(f'Unknown format "{format}"!')
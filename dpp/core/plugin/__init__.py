@@ -20,7 +20,7 @@ import importlib.util
 import logging
 import os
 import sys
-from typing import List
+from typing import Iterable, Iterator, List, Optional
 
 from dpp.core.assertions import assert_type
 from dpp.core.listener import Signal
@@ -192,6 +192,21 @@ class AbstractPlugin:
         """ The main method of the plugin which must be implemented by the plugin. """
         raise NotImplementedError('Method must be implemented by the upper class')
 
+    def run_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """ Runs the plugin over a stream of text chunks and yields the output chunk by chunk.
+
+        By default all chunks are joined and passed to run. Plugins which are able to process their input
+        incrementally should override this method.
+        """
+        yield self.run(''.join(chunks))
+
+    def warm_up(self):
+        """ Prepares expensive resources (e.g. models) ahead of the first run. Called once when the GUI is idle.
+
+        By default nothing is done. Plugins should not block, but load their resources in the background.
+        """
+        pass
+
     def _run_lines(self, text: str, callback):
         """ Helper method which executes a callback for each line of text. """
         lines = []
@@ -251,6 +266,16 @@ class AbstractPlugin:
         """ :returns whether the plugin can be run. Usually true, except for NullPlugin. """
         return True
 
+    @property
+    def releases_gil(self) -> bool:
+        """ Returns whether the plugin spends most of its time in C code which releases the GIL (e.g. hashlib or zlib).
+
+        Such plugins can be run by threads in parallel, while other plugins need to be run by processes.
+
+        returns: False by default.
+        """
+        return False
+
     def set_enabled(self, status):
         """ Sets the status of the plugin to enabled/disabled. """
         self._context.config.setPluginStatus(self.full_name, status)
@@ -329,6 +354,16 @@ class HasherPlugin(AbstractPlugin):
         """
         super().__init__(name, PluginType.HASHER, author, dependencies, context, icon)
 
+    @property
+    def passlib_handler(self) -> Optional[str]:
+        """ Returns the name of the passlib handler which computes the hashes of this plugin (e.g. 'phpass').
+
+        Hashers which specify a handler can be used for verifying hashes against wordlists.
+
+        returns: None by default.
+        """
+        return None
+
 
 class ScriptPlugin(AbstractPlugin):
 
@@ -73,6 +73,27 @@ class Option:
     key = property(fget=_key)
 
 
+def integer_validator(config: 'PluginConfig', label: Label, minimum: int = 0):
+    """
+    Returns a validator which checks that the value of an option is an integer greater than or equal to minimum.
+
+    Example:
+        self.config.add(Integer(...), validator=integer_validator(self.config, Plugin.Option.Workers))
+    """
+    name = label.name.rstrip(':')
+
+    def _validate(input_text: str):
+        try:
+            value = int(config.value(label))
+        except (TypeError, ValueError):
+            raise ValidationError(f"{name} should be an integer.")
+        if value < minimum:
+            if minimum == 0:
+                raise ValidationError(f"{name} should not be negative.")
+            raise ValidationError(f"{name} should be at least {minimum}.")
+    return _validate
+
+
 class PluginConfig:
     """ A customizable list of configuration options for a plugin. """
 
@@ -0,0 +1,54 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict
+
+_lock = threading.Lock()
+_executors: Dict[int, ProcessPoolExecutor] = {}
+
+
+def process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    :returns the process pool with the specified number of workers which is shared by the whole application. The pool
+             is created on first use, so that workers are spawned once instead of on each run.
+    """
+    with _lock:
+        executor = _executors.get(max_workers)
+        if executor is None:
+            executor = _executors[max_workers] = ProcessPoolExecutor(max_workers=max_workers)
+        return executor
+
+
+def discard(executor: ProcessPoolExecutor):
+    """ Shuts down a pool which is broken (e.g. a worker was killed), so that the next run creates a new one. """
+    with _lock:
+        for max_workers, other in list(_executors.items()):
+            if other is executor:
+                del _executors[max_workers]
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+@atexit.register
+def shutdown():
+    """ Shuts down all pools. New pools are created by the next run which requires them. """
+    with _lock:
+        executors = list(_executors.values())
+        _executors.clear()
+    for executor in executors:
+        executor.shutdown(wait=False, cancel_futures=True)
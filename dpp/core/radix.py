@@ -0,0 +1,219 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import functools
+import itertools
+import os
+from typing import Callable, Iterable, List
+
+# Format specifiers of the supported bases.
+_FORMAT_SPEC = {2: 'b', 8: 'o', 10: 'd', 16: 'x'}
+
+# Inputs smaller than this are not worth the overhead of NumPy.
+NUMPY_THRESHOLD = 64 * 1024
+
+# Number of bytes which are processed by NumPy at once to keep memory usage bounded.
+NUMPY_BLOCK_SIZE = 1024 * 1024
+
+
+def _numpy():
+    """ :returns the numpy module or None if it is not installed. """
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def byte_table(base: int, width: int = 0) -> List[str]:
+    """ :returns a table mapping each byte to its string representation (e.g. byte_table(2, 8)[97] == '01100001'). """
+    return [format(i, f'0{width}{_FORMAT_SPEC[base]}') for i in range(256)]
+
+
+@functools.lru_cache(maxsize=None)
+def _numpy_byte_table(base: int, width: int, separator: str):
+    """ :returns the byte table as NumPy array of fixed-size, zero-padded byte strings, and whether padding exists. """
+    numpy = _numpy()
+    entries = [(entry + separator).encode('ascii') for entry in byte_table(base, width)]
+    max_length = max(len(entry) for entry in entries)
+    return numpy.array(entries, dtype=f'S{max_length}'), any(len(entry) != max_length for entry in entries)
+
+
+def encode_bytes(data: bytes, base: int, width: int = 0, separator: str = '') -> str:
+    """
+    Encodes each byte as a number of the specified base.
+    :param data: the bytes to encode.
+    :param base: the base of the numbers (either 2, 8, 10 or 16).
+    :param width: the minimum number of digits of each number (zero-padded).
+    :param separator: the string which is placed between the numbers.
+    :returns the encoded bytes (e.g. encode_bytes(b'ab', 10, separator=',') == '97,98').
+    """
+    numpy = _numpy()
+    if numpy is None or len(data) < NUMPY_THRESHOLD:
+        return separator.join(map(byte_table(base, width).__getitem__, data))
+
+    table, is_padded = _numpy_byte_table(base, width, separator)
+    values = numpy.frombuffer(data, dtype=numpy.uint8)
+    if is_padded:
+        # Gather the entries block by block and remove the zero-padding of shorter entries.
+        output = b''.join(numpy.take(table, values[i:i + NUMPY_BLOCK_SIZE]).tobytes().translate(None, b'\0')
+                          for i in range(0, len(values), NUMPY_BLOCK_SIZE))
+    else:
+        output = memoryview(numpy.take(table, values).view(numpy.uint8))
+    # Decode without the trailing separator.
+    return str(output[:len(output) - len(separator)], 'ascii')
+
+
+def encode_code_points(text: str, base: int, width: int = 0, separator: str = '') -> str:
+    """ Encodes each character by its code point. See encode_bytes for a description of the parameters. """
+    try:
+        return encode_bytes(text.encode('latin-1'), base, width, separator)
+    except UnicodeEncodeError:
+        # The text contains code points above 255 which are not covered by the table.
+        table = byte_table(base, width)
+        spec = f'0{width}{_FORMAT_SPEC[base]}'
+        return separator.join([table[c] if c < 256 else format(c, spec) for c in map(ord, text)])
+
+
+def _code_points_to_str(values: List[int]) -> str:
+    """ :returns the string of the specified code points (e.g. [97, 98] => 'ab'). """
+    if values and max(values) < 256 and min(values) >= 0:
+        return bytes(values).decode('latin-1')
+    return ''.join(map(chr, values))
+
+
+def _decode_fixed_width_numpy(numpy, data: bytes, base: int, width: int):
+    digits = numpy.frombuffer(data, dtype=numpy.uint8).reshape(-1, width).astype(numpy.int64) - ord('0')
+    return digits @ (base ** numpy.arange(width - 1, -1, -1, dtype=numpy.int64))
+
+
+def _decode_separated_numpy(numpy, data: bytes, base: int, separator: int):
+    chars = numpy.frombuffer(data, dtype=numpy.uint8)
+    separator_indexes = numpy.flatnonzero(chars == separator)
+    starts = numpy.concatenate(([0], separator_indexes + 1))
+    ends = numpy.concatenate((separator_indexes, [len(chars)]))
+    lengths = ends - starts
+    max_length = int(lengths.max())
+    if max_length > 18:
+        # Numbers with more digits might not fit into 64 bits.
+        return None
+    dtype = numpy.int32 if base ** max_length < 2 ** 31 else numpy.int64
+    values = numpy.zeros(len(starts), dtype=dtype)
+    for k in range(max_length):
+        # Add the k-th digit of each number counted from its end.
+        digits = chars[ends - 1 - k].astype(dtype) - ord('0')
+        values += numpy.where(lengths > k, digits, 0) * dtype(base ** k)
+    return values
+
+
+def _decode_code_points_numpy(numpy, data: bytes, base: int, width: int, separator: str):
+    """ Decodes the numbers block by block. :returns the decoded string or None if numbers are too large. """
+    blocks = []
+    start = 0
+    while start < len(data):
+        if width:
+            end = min(len(data), start + NUMPY_BLOCK_SIZE // width * width)
+            values = _decode_fixed_width_numpy(numpy, data[start:end], base, width)
+        else:
+            # Blocks need to end at a separator.
+            end = data.find(separator.encode('ascii'), start + NUMPY_BLOCK_SIZE)
+            end = len(data) if end == -1 else end
+            values = _decode_separated_numpy(numpy, data[start:end], base, ord(separator))
+            if values is None:
+                return None
+            end += len(separator)
+        blocks.append(values)
+        start = end
+    values = numpy.concatenate(blocks)
+    if values.max() < 256:
+        return values.astype(numpy.uint8).tobytes().decode('latin-1')
+    return ''.join(map(chr, values.tolist()))
+
+
+def _is_valid_numbers(data: bytes, base: int, width: int, separator: str) -> bool:
+    """ :returns whether the data only consists of valid numbers of the specified width or separated by separator. """
+    digits = '0123456789abcdef'[:base].encode('ascii')
+    if width:
+        return len(data) % width == 0 and not data.translate(None, digits)
+    separator = separator.encode('ascii')
+    return not data.translate(None, digits + separator) and separator * 2 not in data \
+        and not data.startswith(separator) and not data.endswith(separator)
+
+
+def decode_code_points(text: str, base: int, width: int = 0, separator: str = '') -> str:
+    """
+    Decodes a string of code points which are either of fixed width or separated by a separator.
+    :param text: the text to decode (e.g. '97,98').
+    :param base: the base of the numbers (either 2, 8, 10 or 16).
+    :param width: the number of digits of each number (0 = numbers are separated by the separator).
+    :param separator: the string which separates the numbers.
+    :returns the decoded string (e.g. 'ab').
+    :raises ValueError when the text contains invalid numbers.
+    """
+    numpy = _numpy()
+    if numpy is not None and len(text) >= NUMPY_THRESHOLD and (width or len(separator) == 1) and text.isascii():
+        data = text.encode('ascii')
+        if _is_valid_numbers(data, base, width, separator):
+            output = _decode_code_points_numpy(numpy, data, base, width, separator)
+            if output is not None:
+                return output
+
+    # Fallback which is also used to report invalid numbers.
+    if width:
+        tokens = [text[i:i + width] for i in range(0, len(text), width)]
+    else:
+        tokens = text.split(separator)
+    return _code_points_to_str(list(map(int, tokens, itertools.repeat(base))))
+
+
+def decode_bits(text: str) -> bytes:
+    """
+    Decodes a string of bits into bytes. Whitespace is ignored and bits are aligned to the right. Leading zeros are
+    kept, so that leading zero bytes (e.g. '00000000 01000001' = b'\\x00A') survive a round-trip through encode_bytes.
+    :param text: the bits to decode (e.g. '1100001 1100010').
+    :returns the decoded bytes (e.g. b'ab').
+    :raises ValueError when the text contains characters other than 0, 1 or whitespace.
+    """
+    try:
+        bits = text.encode('ascii').translate(None, b' \t\n\r\x0b\x0c')
+    except UnicodeEncodeError:
+        bits = None
+    if bits is None or bits.translate(None, b'01'):
+        raise ValueError(f'invalid literal for int() with base 2: {text!r}')
+
+    numpy = _numpy()
+    if numpy is None or len(bits) < NUMPY_THRESHOLD:
+        # Converting power-of-two bases is linear in CPython.
+        return int(bits or b'0', 2).to_bytes((len(bits) + 7) // 8, 'big')
+    # Bits are aligned to the right, so padding is required on the left.
+    padding = -len(bits) % 8
+    values = numpy.zeros(padding + len(bits), dtype=numpy.uint8)
+    values[padding:] = numpy.frombuffer(bits, dtype=numpy.uint8) - ord('0')
+    return numpy.packbits(values).tobytes()
+
+
+def convert_tokens(text: str, convert: Callable[[Iterable[str]], Iterable[str]]) -> str:
+    """
+    Converts all whitespace separated tokens of all lines at once while preserving the line structure.
+    :param text: the text containing the tokens.
+    :param convert: a function which converts an iterable of tokens into an iterable of strings
+                    (e.g. lambda tokens: map(hex, map(int, tokens))).
+    :returns the converted tokens separated by space, and the lines separated by the os specific line separator.
+    """
+    lines = [line.split() for line in text.splitlines()]
+    results = iter(convert(itertools.chain.from_iterable(lines)))
+    return os.linesep.join([' '.join(itertools.islice(results, len(line))) for line in lines])
@@ -0,0 +1,170 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import re
+from typing import Iterable, Iterator, List, NamedTuple
+
+from dpp.core.lines import trie_pattern
+
+
+class Rule(NamedTuple):
+    search: str
+    replace: str
+
+
+def load_rules(path: str) -> List[Rule]:
+    """
+    Loads a rule table from a file. Each line contains a search and a replace term separated by a tab.
+    Empty lines are ignored.
+    :param path: the path to the file.
+    :returns the rules.
+    :raises Exception when a line does not contain a tab.
+    """
+    rules = []
+    with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+        for line_number, line in enumerate(f.read().splitlines(), start=1):
+            if not line:
+                continue
+            if '\t' not in line:
+                raise Exception(f'Invalid rule in line {line_number}! Expected tab-separated search and replace term.')
+            rules.append(Rule(*line.split('\t', 1)))
+    return rules
+
+
+class Replacer:
+    """
+    Replaces the search terms of a rule table in a single pass. All rules are compiled into one combined regular
+    expression. The replacement of a match is looked up in a dispatch dictionary (literal rules) or by the name of the
+    group which matched (regular expressions).
+
+    Literal rules prefer the longest search term when multiple terms match at the same position. Regular expressions
+    are tried in the order of the rules. Backreferences within combined regular expressions are not supported, while
+    the replace terms may reference the groups of their search term (e.g. \\1).
+
+    Example:
+
+        replacer = Replacer([Rule('a', 'b'), Rule('b', 'a')])
+        replacer.replace('ab')  # 'ba'
+        replacer.hits           # [1, 1]
+    """
+
+    # Number of characters which are buffered when streaming before they are processed.
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, rules: List[Rule], is_regex: bool = False, should_match_case: bool = True):
+        """
+        :param rules: the rules which are applied.
+        :param is_regex: whether the search terms are regular expressions.
+        :param should_match_case: whether the search terms are case-sensitive.
+        :raises re.error when a search term is not a valid regular expression.
+        """
+        self._rules = [rule for rule in rules if rule.search]
+        self._is_regex = is_regex
+        self._should_match_case = should_match_case
+        self._hits = [0] * len(self._rules)
+        flags = 0 if should_match_case else re.IGNORECASE
+        if is_regex:
+            self._patterns = [re.compile(rule.search, flags) for rule in self._rules]
+            if len(self._patterns) == 1:
+                self._pattern = self._patterns[0]
+            else:
+                self._pattern = re.compile('|'.join(
+                    f'(?P<r{index}>{rule.search})' for index, rule in enumerate(self._rules)), flags)
+        else:
+            # The first rule wins when search terms are equal (or equal when ignoring the case).
+            self._dispatch = {}
+            for index, rule in enumerate(self._rules):
+                self._dispatch.setdefault(self._key(rule.search), index)
+            self._pattern = re.compile(trie_pattern([rule.search for rule in self._rules]), flags)
+            self._max_length = max((len(rule.search) for rule in self._rules), default=0)
+
+    @property
+    def rules(self) -> List[Rule]:
+        return self._rules
+
+    @property
+    def hits(self) -> List[int]:
+        """ :returns the number of replacements of each rule since the replacer was created. """
+        return self._hits
+
+    def _key(self, text: str) -> str:
+        return text if self._should_match_case else text.lower()
+
+    def _index(self, match: 're.Match') -> int:
+        if self._is_regex:
+            return 0 if len(self._rules) == 1 else int(match.lastgroup[1:])
+        index = self._dispatch.get(self._key(match.group(0)))
+        if index is None:
+            # Case-insensitive matching of the regex engine might differ from str.lower (e.g. for the Kelvin sign).
+            index = next(i for i, rule in enumerate(self._rules)
+                         if re.fullmatch(re.escape(rule.search), match.group(0), re.IGNORECASE))
+        return index
+
+    def _replacement(self, match: 're.Match') -> str:
+        index = self._index(match)
+        self._hits[index] += 1
+        replace = self._rules[index].replace
+        if not self._is_regex:
+            return replace
+        if len(self._rules) == 1:
+            return match.expand(replace)
+        if '\\' not in replace:
+            return replace
+        # Expand the replace term using the groups of the individual search term.
+        return self._patterns[index].match(match.string, match.start()).expand(replace)
+
+    def replace(self, text: str) -> str:
+        """ :returns the text with all search terms replaced. """
+        if not self._rules:
+            return text
+        return self._pattern.sub(self._replacement, text)
+
+    def replace_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Replaces the search terms within a stream of text chunks. Literal search terms are also found when they span
+        multiple chunks. Regular expressions are applied to blocks of complete lines, hence they should neither match
+        line breaks nor use anchors when streaming.
+        """
+        buffer = ''
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) < self.CHUNK_SIZE:
+                continue
+            output, buffer = self._replace_head(buffer)
+            yield output
+        yield self.replace(buffer)
+
+    def _replace_head(self, buffer: str):
+        """ :returns the head of the buffer with all search terms replaced, and the tail which needs more data. """
+        if not self._rules:
+            return buffer, ''
+        if self._is_regex:
+            end = buffer.rfind('\n') + 1
+            return self.replace(buffer[:end]), buffer[end:]
+
+        # Matches which start before the end of the safe area are complete, since no search term is longer.
+        safe = len(buffer) - self._max_length + 1
+        output = []
+        position = 0
+        for match in self._pattern.finditer(buffer):
+            if match.start() >= safe:
+                break
+            output.append(buffer[position:match.start()])
+            output.append(self._replacement(match))
+            position = match.end()
+        end = max(position, safe)
+        output.append(buffer[position:end])
+        return ''.join(output), buffer[end:]
@@ -0,0 +1,108 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import functools
+import math
+import string
+from typing import Dict, List, Tuple
+
+# Alphabets which are rotated by the individual ciphers.
+LETTERS = (string.ascii_lowercase, string.ascii_uppercase)
+DIGITS = (string.digits,)
+PRINTABLE = (''.join(map(chr, range(33, 127))),)
+
+# Frequency of the letters a-z used in English, taken from Wikipedia (http://en.wikipedia.org/wiki/Letter_frequency).
+ENGLISH_LETTER_FREQUENCY = [
+    0.08167, 0.01492, 0.02782, 0.04253, 0.130001, 0.02228, 0.02015, 0.06094, 0.06966, 0.00153, 0.00772, 0.04025,
+    0.02406, 0.06749, 0.07507, 0.01929, 0.00095, 0.05987, 0.06327, 0.09056, 0.02758, 0.00978, 0.02360, 0.00150,
+    0.01974, 0.00074
+]
+
+# Inputs smaller than this are not worth the overhead of NumPy.
+NUMPY_THRESHOLD = 64 * 1024
+
+
+class Scoring:
+    CHI_SQUARED = "chi-squared"
+    LOG_LIKELIHOOD = "log-likelihood"
+
+
+@functools.lru_cache(maxsize=None)
+def _rotation_table(shift: int, alphabets: Tuple[str, ...]) -> Dict[int, int]:
+    table = {}
+    for alphabet in alphabets:
+        offset = shift % len(alphabet)
+        table.update(str.maketrans(alphabet, alphabet[offset:] + alphabet[:offset]))
+    return table
+
+
+def rotate(text: str, shift: int, alphabets: Tuple[str, ...] = LETTERS) -> str:
+    """
+    Rotates each character of the text which is part of one of the alphabets by the specified shift.
+    :param text: the text to rotate.
+    :param shift: the number of positions each character is shifted (e.g. 13 for ROT13).
+    :param alphabets: the alphabets to rotate (e.g. LETTERS, DIGITS or PRINTABLE).
+    :returns the rotated text (e.g. rotate('abc', 1) == 'bcd').
+    """
+    return text.translate(_rotation_table(shift, alphabets))
+
+
+def letter_histogram(text: str) -> List[int]:
+    """ :returns the number of occurrences of each letter a-z within the text, ignoring the case. """
+    data = text.encode('utf-8', errors='surrogateescape')
+    try:
+        import numpy
+    except ImportError:
+        numpy = None
+    if numpy is not None and len(data) >= NUMPY_THRESHOLD:
+        counts = numpy.bincount(numpy.frombuffer(data, dtype=numpy.uint8), minlength=256).tolist()
+    else:
+        counter = collections.Counter(data)
+        counts = [counter[i] for i in range(256)]
+    return [counts[ord('a') + i] + counts[ord('A') + i] for i in range(26)]
+
+
+def _score(histogram: List[int], shift: int, scoring: str, frequency: List[float]) -> float:
+    """ :returns the score of the letter distribution after rotating the histogram by the shift. """
+    total = sum(histogram)
+    # The i-th letter after rotating is the (i - shift)-th letter before rotating.
+    observed = [histogram[(i - shift) % 26] for i in range(26)]
+    if scoring == Scoring.CHI_SQUARED:
+        return sum((o - total * f) ** 2 / (total * f) for o, f in zip(observed, frequency)) if total else 0.0
+    if scoring == Scoring.LOG_LIKELIHOOD:
+        return sum(o * math.log(f) for o, f in zip(observed, frequency))
+    raise Exception(f'Unknown scoring "{scoring}"!')
+
+
+def score_shifts(histogram: List[int], scoring: str = Scoring.CHI_SQUARED,
+                 frequency: List[float] = None) -> List[Tuple[int, float]]:
+    """
+    Scores all shifts by comparing the rotated letter histogram with the expected letter frequency.
+    :param histogram: the letter histogram of the ciphertext (see letter_histogram).
+    :param scoring: the scoring method (either Scoring.CHI_SQUARED or Scoring.LOG_LIKELIHOOD).
+    :param frequency: the expected frequency of the letters a-z (default = ENGLISH_LETTER_FREQUENCY).
+    :returns a list of shifts which decipher the text and their scores, ranked from the most to the least likely.
+    """
+    frequency = frequency or ENGLISH_LETTER_FREQUENCY
+    scores = [(shift, _score(histogram, shift, scoring, frequency)) for shift in range(26)]
+    # Lower chi-squared values are better, while higher log-likelihoods are better.
+    return sorted(scores, key=lambda item: item[1], reverse=scoring == Scoring.LOG_LIKELIHOOD)
+
+
+def calculate_shift(text: str, scoring: str = Scoring.CHI_SQUARED) -> int:
+    """ :returns the shift which most likely deciphers the text using the specified scoring method. """
+    return score_shifts(letter_histogram(text), scoring)[0][0]
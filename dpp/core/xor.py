@@ -0,0 +1,181 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import collections
+import functools
+import math
+import os
+import string
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Tuple
+
+from dpp.core.rotation import ENGLISH_LETTER_FREQUENCY
+
+# Number of bytes used to estimate the key length.
+KEY_LENGTH_SAMPLE_SIZE = 64 * 1024
+
+# Number of bytes used to score the candidate keys.
+SCORE_SAMPLE_SIZE = 1024 * 1024
+
+
+class Candidate(NamedTuple):
+    key: bytes
+    score: float  # Average log-likelihood of the deciphered bytes (higher is better).
+    preview: bytes
+
+
+def _numpy():
+    """ :returns the numpy module or None if it is not installed. """
+    try:
+        import numpy
+        return numpy
+    except ImportError:
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def _english_byte_weights() -> Tuple[float, ...]:
+    """ :returns the log-probability of each byte to occur within english text. """
+    probabilities = [1e-6] * 256
+    probabilities[ord(' ')] = 0.15
+    for i, frequency in enumerate(ENGLISH_LETTER_FREQUENCY):
+        probabilities[ord('a') + i] = 0.7 * frequency
+        probabilities[ord('A') + i] = 0.05 * frequency
+    others = string.digits + string.punctuation + '\t\n\r'
+    for char in others:
+        probabilities[ord(char)] = 0.1 / len(others)
+    return tuple(math.log(probability) for probability in probabilities)
+
+
+def xor(data: bytes, key: bytes) -> bytes:
+    """ :returns the data xor-ed with the repeated key (e.g. xor(b'abc', b'\\x01') == b'`cb'). """
+    if not data or not key:
+        return data
+    numpy = _numpy()
+    if numpy is not None:
+        values = numpy.frombuffer(data, dtype=numpy.uint8)
+        return (values ^ numpy.resize(numpy.frombuffer(key, dtype=numpy.uint8), len(values))).tobytes()
+    # Xor-ing two big integers is done in C and hence a lot faster than xor-ing byte by byte in python.
+    stream = (key * (len(data) // len(key) + 1))[:len(data)]
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(stream, 'big')).to_bytes(len(data), 'big')
+
+
+def hamming_distance(a: bytes, b: bytes) -> int:
+    """ :returns the number of differing bits of two byte strings of equal length. """
+    return bin(int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).count('1')
+
+
+def estimate_key_lengths(data: bytes, max_key_length: int = 40) -> List[Tuple[int, float]]:
+    """
+    Estimates the length of a repeating xor key by the normalized hamming distance of consecutive blocks. Since bytes
+    enciphered with the same key byte keep the distance of their plaintext, the correct key length usually shows the
+    lowest distance.
+    :param data: the enciphered data.
+    :param max_key_length: the maximum key length to consider.
+    :returns a list of key lengths and their normalized distances, ranked from the most to the least likely.
+    """
+    sample = data[:KEY_LENGTH_SAMPLE_SIZE]
+    distances = []
+    for length in range(1, min(max_key_length, len(sample) // 2) + 1):
+        size = len(sample) // length * length
+        # Compares each block with the next one at once.
+        distance = hamming_distance(sample[:size - length], sample[length:size])
+        distances.append((length, distance / (size - length)))
+    return sorted(distances, key=lambda item: item[1])
+
+
+def _histogram(column) -> List[int]:
+    """ :returns the number of occurrences of each byte within the bytes or NumPy array of bytes. """
+    numpy = _numpy()
+    if numpy is not None:
+        if not isinstance(column, numpy.ndarray):
+            column = numpy.frombuffer(column, dtype=numpy.uint8)
+        return numpy.bincount(column, minlength=256).tolist()
+    counter = collections.Counter(column)
+    return [counter[i] for i in range(256)]
+
+
+def score_key_bytes(column) -> List[Tuple[int, float]]:
+    """
+    Scores all candidate key bytes of a column of bytes which were enciphered with the same key byte.
+    :param column: the bytes enciphered with the same key byte (either bytes or a NumPy array).
+    :returns a list of key bytes and their average log-likelihood, ranked from the most to the least likely.
+    """
+    weights = _english_byte_weights()
+    histogram = _histogram(column)
+    numpy = _numpy()
+    if numpy is not None:
+        # The plaintext byte c deciphered with key k originates from the ciphertext byte c ^ k.
+        indexes = numpy.arange(256)
+        scores = (numpy.array(weights)[indexes[None, :] ^ indexes[:, None]] @ numpy.array(histogram)).tolist()
+    else:
+        scores = [sum(histogram[c] * weights[c ^ k] for c in range(256) if histogram[c]) for k in range(256)]
+    return sorted(((k, score / max(1, len(column))) for k, score in enumerate(scores)), key=lambda item: -item[1])
+
+
+def _score(data: bytes) -> float:
+    """ :returns the average log-likelihood of the data to be english text. """
+    weights = _english_byte_weights()
+    histogram = _histogram(data)
+    return sum(count * weight for count, weight in zip(histogram, weights) if count) / max(1, len(data))
+
+
+def _shortest_period(key: bytes) -> bytes:
+    """ :returns the shortest key which repeated equals the specified key (e.g. b'abab' => b'ab'). """
+    for length in range(1, len(key)):
+        if len(key) % length == 0 and key[:length] * (len(key) // length) == key:
+            return key[:length]
+    return key
+
+
+def recover_keys(data: bytes, max_key_length: int = 40, key_lengths: int = 3, top: int = 5,
+                 preview_size: int = 64, max_workers: int = None) -> List[Candidate]:
+    """
+    Recovers the most likely keys of data which was enciphered with a repeating xor key and contains english text.
+    :param data: the enciphered data.
+    :param max_key_length: the maximum key length (1 = single-byte key).
+    :param key_lengths: the number of most likely key lengths which are examined.
+    :param top: the maximum number of keys which are returned.
+    :param preview_size: the number of bytes of each deciphered preview.
+    :param max_workers: the maximum number of threads (default = number of cpus).
+    :returns a list of candidates, ranked from the most to the least likely.
+    """
+    sample = data[:SCORE_SAMPLE_SIZE]
+    if not sample:
+        return []
+    numpy = _numpy()
+    values = numpy.frombuffer(sample, dtype=numpy.uint8) if numpy is not None else sample
+
+    def _candidates(length: int) -> List[bytes]:
+        # Columns are extracted by slicing with a stride, which results in views when using NumPy.
+        columns = [score_key_bytes(values[i::length]) for i in range(length)]
+        best = bytes(column[0][0] for column in columns)
+        if length > 1:
+            return [_shortest_period(best)]
+        # Single-byte keys are cheap to score, hence the top keys of the column are returned.
+        return [bytes([k]) for k, _ in columns[0][:top]]
+
+    def _candidate(key: bytes) -> Candidate:
+        return Candidate(key, _score(xor(sample, key)), xor(data[:preview_size], key))
+
+    if max_key_length <= 1:
+        lengths = [1]
+    else:
+        lengths = [length for length, _ in estimate_key_lengths(sample, max_key_length)[:key_lengths]]
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 1) as executor:
+        keys = list(dict.fromkeys(key for keys in executor.map(_candidates, lengths) for key in keys))
+        candidates = list(executor.map(_candidate, keys))
+    return sorted(candidates, key=lambda candidate: -candidate.score)[:top]
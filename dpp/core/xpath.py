@@ -0,0 +1,114 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import functools
+import itertools
+from typing import Any, Iterable, Iterator
+
+from dpp.core.exceptions import CodecException
+
+# Maximum number of compiled expressions which are cached.
+CACHE_SIZE = 128
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile(expression: str):
+    from lxml import etree
+    return etree.XPath(expression)
+
+
+def compile_expression(expression: str):
+    """
+    Compiles an XPath expression. Compiled expressions are cached, so that they are not parsed again on each run.
+    :param expression: the XPath expression (e.g. '//b').
+    :returns the compiled expression (lxml.etree.XPath).
+    :raises CodecException when the expression is invalid.
+    """
+    try:
+        return _compile(expression)
+    except Exception as err:
+        raise CodecException(f'Invalid XPath expression! {err}')
+
+
+def _serialize(result: Any) -> str:
+    from lxml import etree
+    if isinstance(result, etree._Element):
+        # The tail belongs to the parent, hence it is not part of the result.
+        return etree.tostring(result, with_tail=False).decode('utf-8', errors='surrogateescape')
+    if isinstance(result, bool):
+        return str(result).lower()
+    if isinstance(result, float) and result.is_integer():
+        return str(int(result))
+    return str(result)
+
+
+def _evaluate(xpath, element) -> Iterator[str]:
+    try:
+        results = xpath(element)
+    except Exception as err:
+        raise CodecException(f'Evaluating XPath expression failed! {err}')
+    if isinstance(results, list):
+        yield from map(_serialize, results)
+    else:
+        # Expressions like count(//b) return a single value.
+        yield _serialize(results)
+
+
+def query(data: bytes, expression: str) -> Iterator[str]:
+    """
+    Applies an XPath expression to a XML document.
+    :param data: the XML document. Passing bytes lets lxml detect the encoding using the XML declaration.
+    :param expression: the XPath expression (e.g. '//b').
+    :returns an iterator over the serialized results.
+    :raises CodecException when the document or the expression is invalid.
+    """
+    from lxml import etree
+    xpath = compile_expression(expression)
+    try:
+        root = etree.fromstring(data)
+    except etree.XMLSyntaxError as err:
+        raise CodecException(f'Error decoding XML! {err}')
+    yield from _evaluate(xpath, root)
+
+
+def query_stream(chunks: Iterable[bytes], expression: str, record_tag: str) -> Iterator[str]:
+    """
+    Applies a relative XPath expression to each record of a XML document which is parsed incrementally. Records which
+    were processed are cleared, so that memory usage stays flat regardless of the size of the document.
+    :param chunks: the chunks of the XML document.
+    :param expression: the XPath expression relative to the record (e.g. './name/text()').
+    :param record_tag: the tag of the records (e.g. 'item', '{http://example.com}item' or '{*}item').
+    :returns an iterator over the serialized results.
+    :raises CodecException when the document or the expression is invalid.
+    """
+    from lxml import etree
+    xpath = compile_expression(expression)
+    # The pull parser is the feed-based equivalent of iterparse.
+    parser = etree.XMLPullParser(events=('end',), tag=record_tag)
+    try:
+        for chunk in itertools.chain(chunks, [None]):
+            if chunk is None:
+                parser.close()
+            else:
+                parser.feed(chunk)
+            for _, element in parser.read_events():
+                yield from _evaluate(xpath, element)
+                # Release the record and all records which were processed before.
+                element.clear(keep_tail=True)
+                while element.getprevious() is not None:
+                    del element.getparent()[0]
+    except etree.XMLSyntaxError as err:
+        raise CodecException(f'Error decoding XML! {err}')
@@ -36,6 +36,16 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('Adler-32', "Thomas Engel", ["zlib"], context)
 
+    @property
+    def releases_gil(self) -> bool:
+        return True
+
     def run(self, input_text: str) -> str:
-        import zlib
-        return hex(zlib.adler32(input_text.encode('utf-8', errors='surrogateescape')))
+        return next(self.run_stream([input_text]))
+
+    def run_stream(self, chunks):
+        from dpp.core.checksum import Adler32
+        checksum = Adler32()
+        for chunk in chunks:
+            checksum.update(chunk.encode('utf-8', errors='surrogateescape'))
+        yield checksum.hexdigest()
@@ -36,6 +36,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('Apache-MD5', "Thomas Engel", ["passlib"], context)
 
+    @property
+    def passlib_handler(self) -> str:
+        return 'apr_md5_crypt'
+
     def run(self, input_text: str) -> str:
         from passlib.hash import apr_md5_crypt
         return apr_md5_crypt.encrypt(input_text.encode('utf-8', errors='surrogateescape'))
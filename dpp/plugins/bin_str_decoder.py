@@ -14,6 +14,7 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from dpp.core import radix
 from dpp.core.plugin import DecoderPlugin
 
 
@@ -40,5 +41,4 @@ class Plugin(DecoderPlugin):
         super().__init__('BIN (str)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        n = int(input_text.replace(' ', ''), 2)
-        return n.to_bytes((n.bit_length() + 7) // 8, 'big').decode("utf-8", "surrogateescape") or '\0'
+        return radix.decode_bits(input_text).decode("utf-8", "surrogateescape") or '\0'
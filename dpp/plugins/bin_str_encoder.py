@@ -14,6 +14,7 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from dpp.core import radix
 from dpp.core.plugin import EncoderPlugin
 
 
@@ -40,8 +41,4 @@ class Plugin(EncoderPlugin):
         super().__init__('BIN (str)', "Thomas Engel", ["codecs"], context)
 
     def run(self, input_text: str) -> str:
-        bits = bin(int.from_bytes(input_text.encode('utf-8', 'surrogateescape'), 'big'))[2:]
-        return ' '.join(self._chunk_string(bits.zfill(8 * ((len(bits) + 7) // 8)), 8))
-
-    def _chunk_string(self, string, length):
-        return [string[0 + i:length + i] for i in range(0, len(string), length)]
+        return radix.encode_bytes(input_text.encode('utf-8', 'surrogateescape'), 2, width=8, separator=' ')
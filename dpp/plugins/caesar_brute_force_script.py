@@ -0,0 +1,68 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from dpp.core.icons import Icon
+from dpp.core.plugin import ScriptPlugin
+from dpp.core.plugin.config import Label, integer_validator
+from dpp.core.plugin.config.options import ComboBox, Integer
+
+
+class Plugin(ScriptPlugin):
+    """
+    Deciphers the input using all shifts of the caesar cipher and ranks the results by the frequency of english letters.
+
+    Example:
+
+        Input:
+            Uryyb Jbeyq, guvf vf n frperg zrffntr.
+
+        Output:
+            13	14.77	Hello World, this is a secret message.
+            ...
+    """
+
+    class Option(object):
+        Scoring = Label("scoring", "Scoring:")
+        Preview = Label("preview", "Preview:")
+
+    def __init__(self, context: 'dpp.core.context.Context'):
+        # Name, Author, Dependencies, Icon
+        super().__init__('Caesar Brute Force', "Thomas Engel", [], context, Icon.EDIT)
+        self._init_config()
+
+    def _init_config(self):
+        self.config.add(ComboBox(
+            label=Plugin.Option.Scoring,
+            value="chi-squared",
+            values=["chi-squared", "log-likelihood"],
+            description="the method used to compare the letters of each shift with the frequency of english letters.",
+            is_required=True
+        ))
+        self.config.add(Integer(
+            label=Plugin.Option.Preview,
+            value=80,
+            description="the number of characters of each deciphered text to show (0 = all).",
+            is_required=True
+        ), validator=integer_validator(self.config, Plugin.Option.Preview, 0))
+
+    def run(self, input_text: str) -> str:
+        from dpp.core import rotation
+        # The scores are calculated over the whole input, while only the preview of each shift is deciphered.
+        scores = rotation.score_shifts(rotation.letter_histogram(input_text), self.config.value(Plugin.Option.Scoring))
+        preview = int(self.config.value(Plugin.Option.Preview))
+        # Line breaks would break the table, hence the deciphered texts are joined into a single line.
+        text = ' '.join((input_text[:preview] if preview else input_text).splitlines())
+        return '\n'.join(f'{shift}\t{score:.2f}\t{rotation.rotate(text, shift)}' for shift, score in scores)
@@ -14,6 +14,7 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from dpp.core import radix
 from dpp.core.plugin import EncoderPlugin
 
 
@@ -41,4 +42,4 @@ class Plugin(EncoderPlugin):
         super().__init__('DEC (str)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        return ",".join(str(ord(c)) for c in input_text)
+        return radix.encode_code_points(input_text, 10, separator=",")
@@ -14,13 +14,16 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import itertools
 import os
 import re
+from typing import Callable, Iterable, Iterator, Optional
 
+from dpp.core.exceptions import CodecException, ValidationError
 from dpp.core.icons import Icon
 from dpp.core.plugin import ScriptPlugin, PluginConfig
 from dpp.core.plugin.config import Label
-from dpp.core.plugin.config.options import String, Boolean
+from dpp.core.plugin.config.options import String, Boolean, ComboBox
 
 
 class Plugin(ScriptPlugin):
@@ -33,47 +36,63 @@ class Plugin(ScriptPlugin):
         Should_Match_Case = Label("should_match_case", "Match Case")
         Should_Invert_Match = Label("should_invert_match", "Invert Lines")
         Is_Regex = Label("is_regex", "Regex")
+        Terms = Label("terms", "Terms:")
+        Term_Separator = Label("term_separator", "Separator:")
+
+    class Terms(object):
+        SINGLE = "Single Term"
+        ANY_OF = "Any Of"
+        ALL_OF = "All Of"
 
     class FilterCodec:
 
-        def run(self, config: PluginConfig, text: str):
-            lines = []
-            filter_term = config.value(Plugin.Option.Filter_Term)
-            is_regex = config.value(Plugin.Option.Is_Regex)
-            should_match_case = config.value(Plugin.Option.Should_Match_Case)
-            for text_line in text.splitlines():
-                try:
-                    if self._should_filter(text_line, config):
-                        if is_regex and should_match_case:
-                            match = re.match(filter_term, text_line)
-                            lines.append(match.group(0))
-                        elif is_regex:
-                            match = re.match(filter_term, text_line, flags=re.IGNORECASE)
-                            lines.append(match.group(0))
-                        else:
-                            lines.append(text_line)
-                except Exception as e:
-                    # Ignore exceptions - most likely an error in the regex filter string
-                    pass
-            return os.linesep.join(lines)
-
-        def _should_filter(self, text_line: str, config: PluginConfig):
+        # Number of lines which are emitted at once when streaming.
+        BATCH_SIZE = 10000
+
+        def compile(self, config: PluginConfig) -> Callable[[str], Optional[str]]:
+            """ :returns the filter compiled into a function which is applied to each line. """
+            from dpp.core import lines
             filter_term = config.value(Plugin.Option.Filter_Term)
-            is_regex = config.value(Plugin.Option.Is_Regex)
-            should_match_case = config.value(Plugin.Option.Should_Match_Case)
-            should_invert_match = config.value(Plugin.Option.Should_Invert_Match)
-            if is_regex and should_match_case:
-                result = re.match(filter_term, text_line, flags=re.IGNORECASE) is not None
-            elif is_regex:
-                result = re.match(filter_term, text_line) is not None
-            elif should_match_case:
-                result = filter_term in text_line
-            else:
-                result = filter_term.lower() in text_line.lower()
-            if should_invert_match:
-                return not result
+            terms = config.value(Plugin.Option.Terms)
+            if terms == Plugin.Terms.SINGLE:
+                filter_terms = [filter_term]
             else:
-                return result
+                term_separator = config.value(Plugin.Option.Term_Separator)
+                if not term_separator:
+                    raise CodecException('Term separator should not be empty.')
+                filter_terms = [term for term in filter_term.split(term_separator) if term]
+            try:
+                return lines.compile_filter(
+                    filter_terms,
+                    is_regex=config.value(Plugin.Option.Is_Regex),
+                    should_match_case=config.value(Plugin.Option.Should_Match_Case),
+                    should_invert_match=config.value(Plugin.Option.Should_Invert_Match),
+                    match=lines.Match.ALL if terms == Plugin.Terms.ALL_OF else lines.Match.ANY
+                )
+            except re.error as err:
+                raise CodecException(f'Filtering lines failed! Invalid regular expression: {err}')
+
+        def run_lines(self, config: PluginConfig, text_lines: Iterable[str]) -> Iterator[str]:
+            """ :returns the lines (or the matched part of the lines) which pass the filter. """
+            line_filter = self.compile(config)
+            for text_line in text_lines:
+                line = line_filter(text_line)
+                if line is not None:
+                    yield line
+
+        def run(self, config: PluginConfig, text: str):
+            return os.linesep.join(self.run_lines(config, text.splitlines()))
+
+        def run_stream(self, config: PluginConfig, chunks: Iterable[str]) -> Iterator[str]:
+            from dpp.core import lines
+            filtered_lines = self.run_lines(config, lines.iter_lines(chunks))
+            separator = ''
+            while True:
+                batch = list(itertools.islice(filtered_lines, self.BATCH_SIZE))
+                if not batch:
+                    break
+                yield separator + os.linesep.join(batch)
+                separator = os.linesep
 
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies
@@ -85,7 +104,7 @@ class Plugin(ScriptPlugin):
             value="",
             description="term to filter by",
             is_required=True
-        ))
+        ), validator=self._validate_filter_term)
         self.config.add(Boolean(
             label=Plugin.Option.Should_Match_Case,
             value=True,
@@ -104,6 +123,30 @@ class Plugin(ScriptPlugin):
             description="defines whether filter term is a regex",
             is_required=False
         ))
+        self.config.add(ComboBox(
+            label=Plugin.Option.Terms,
+            value=Plugin.Terms.SINGLE,
+            values=[Plugin.Terms.SINGLE, Plugin.Terms.ANY_OF, Plugin.Terms.ALL_OF],
+            description="defines whether any or all terms of a separated list of terms should match",
+            is_required=True
+        ))
+        self.config.add(String(
+            label=Plugin.Option.Term_Separator,
+            value=",",
+            description="separator of the terms when filtering by a list of terms",
+            is_required=False
+        ), validator=self._validate_term_separator)
+
+    def _validate_filter_term(self, input_text: str):
+        try:
+            self._codec.compile(self.config)
+        except CodecException as err:
+            raise ValidationError(str(err))
+
+    def _validate_term_separator(self, input_text: str):
+        if self.config.value(Plugin.Option.Terms) != Plugin.Terms.SINGLE \
+                and not self.config.value(Plugin.Option.Term_Separator):
+            raise ValidationError("Term separator should not be empty.")
 
     @property
     def title(self):
@@ -120,8 +163,13 @@ class Plugin(ScriptPlugin):
             options.append('Regular Expression')
         if self.config.value(Plugin.Option.Should_Invert_Match):
             options.append('Invert Match')
+        if self.config.value(Plugin.Option.Terms) != Plugin.Terms.SINGLE:
+            options.append(self.config.value(Plugin.Option.Terms))
 
         return self._join_options_as_human_readable_string(options)
 
     def run(self, input_text: str) -> str:
         return self._codec.run(self.config, input_text)
+
+    def run_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        return self._codec.run_stream(self.config, chunks)
@@ -36,6 +36,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('FreeBSD NT', "Thomas Engel", ["passlib"], context)
 
+    @property
+    def passlib_handler(self) -> str:
+        return 'bsd_nthash'
+
     def run(self, input_text: str) -> str:
         from passlib.hash import bsd_nthash
         return bsd_nthash.encrypt(input_text.encode('utf-8', errors='surrogateescape'))
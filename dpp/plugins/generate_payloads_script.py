@@ -0,0 +1,127 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from typing import Iterable, Iterator, List
+
+from dpp.core.icons import Icon
+from dpp.core.plugin import ScriptPlugin
+from dpp.core.plugin.config import Label, integer_validator
+from dpp.core.plugin.config.options import String, ComboBox, Integer
+
+
+class Plugin(ScriptPlugin):
+    """
+    Encodes each line of the input by each chain of encoders up to a certain depth (e.g. for testing filters).
+
+    Example:
+
+        Input:
+            <a b>
+
+        Options:
+
+            encoders: url,html
+            depth: 2
+
+        Output:
+            <a b>	html	&lt;a b&gt;
+            <a b>	url	%3Ca%20b%3E
+            <a b>	html,html	&amp;lt;a b&amp;gt;
+            <a b>	html,url	%26lt%3Ba%20b%26gt%3B
+            <a b>	url,url	%253Ca%2520b%253E
+    """
+
+    class Option(object):
+        Encoders = Label("encoders", "Encoders:")
+        Exclude = Label("exclude", "Exclude:")
+        Depth = Label("depth", "Depth:")
+        Format = Label("format", "Format:")
+        Workers = Label("workers", "Workers:")
+
+    def __init__(self, context: 'dpp.core.context.Context'):
+        # Name, Author, Dependencies, Icon
+        super().__init__('Generate Payloads', "Thomas Engel", [], context, Icon.EDIT)
+        self._init_config()
+
+    def _init_config(self):
+        self.config.add(String(
+            label=Plugin.Option.Encoders,
+            value="url,url_plus,html,base64,hex_shell",
+            description="comma-separated patterns of the encoders to use (e.g. url*,html or * for all encoders)",
+            is_required=True
+        ))
+        self.config.add(String(
+            label=Plugin.Option.Exclude,
+            value="",
+            description="comma-separated patterns of the encoders to skip (e.g. gzip,zlib)",
+            is_required=False
+        ))
+        self.config.add(Integer(
+            label=Plugin.Option.Depth,
+            value=2,
+            description="maximum number of encoders which are chained",
+            is_required=True
+        ), validator=integer_validator(self.config, Plugin.Option.Depth, 1))
+        self.config.add(ComboBox(
+            label=Plugin.Option.Format,
+            value="TSV",
+            values=["TSV", "JSONL"],
+            description="output each payload, chain and output as tab-separated line or as JSON line",
+            is_required=True
+        ))
+        self.config.add(Integer(
+            label=Plugin.Option.Workers,
+            value=0,
+            description="number of processes (0 = number of cpus)",
+            is_required=True
+        ), validator=integer_validator(self.config, Plugin.Option.Workers, 0))
+
+    @property
+    def title(self) -> str:
+        return "Generate Payloads using '{}' up to depth {}".format(
+            self.config.value(Plugin.Option.Encoders), self.config.value(Plugin.Option.Depth))
+
+    @staticmethod
+    def _patterns(text: str) -> List[str]:
+        return [pattern.strip() for pattern in text.split(',') if pattern.strip()]
+
+    def _chains(self) -> List[tuple]:
+        from dpp.core import payloads
+        from dpp.core.plugin import PluginType
+        names = [plugin.method_name for plugin in self._context.plugins().filter(type=PluginType.ENCODER)]
+        return payloads.encoder_chains(
+            names,
+            int(self.config.value(Plugin.Option.Depth)),
+            include=self._patterns(self.config.value(Plugin.Option.Encoders)),
+            exclude=self._patterns(self.config.value(Plugin.Option.Exclude)))
+
+    def run(self, input_text: str) -> str:
+        return os.linesep.join(self.run_lines(input_text.splitlines()))
+
+    def run_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        """ :returns an iterator over the formatted results of the payloads. """
+        from dpp.core import payloads
+        format = self.config.value(Plugin.Option.Format)
+        # Worker processes are not spawned from within the GUI.
+        max_workers = 1 if self._context.isGUIMode() else int(self.config.value(Plugin.Option.Workers))
+        for result in payloads.generate(self._context, lines, self._chains(), max_workers=max_workers):
+            yield payloads.format_result(result, format)
+
+    def run_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        from dpp.core.lines import iter_lines
+        for index, line in enumerate(self.run_lines(iter_lines(chunks))):
+            yield os.linesep + line if index else line
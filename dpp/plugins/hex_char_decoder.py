@@ -41,18 +41,8 @@ class Plugin(DecoderPlugin):
         super().__init__('Hex (char)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        if input_text:
-            import re
-            output = input_text
-            for hex_code in set(sorted(re.findall(r'0[Xx][0-9a-fA-F][0-9a-fA-F][ ]?', input_text))):
-                try:
-                    output = output.replace(hex_code, chr(int(hex_code.strip(), 16)))
-                except:
-                    # Hex codes which can not be transformed to ascii are not replaced.
-                    pass
-            return output
-        else:
-            return ""
+        from dpp.core import escape
+        return escape.decode_chars(input_text)
 
     def can_decode_input(self, input_text: str) -> bool:
         contains_hex = re.findall(r'0[Xx][0-9a-fA-F][0-9a-fA-F]', input_text)
@@ -41,7 +41,8 @@ class Plugin(EncoderPlugin):
         super().__init__('Hex (char)', "Thomas Engel", [], context)
 
     def _run_line(self, line) -> str:
-        return ' '.join([hex(ord(char)) for char in line])
+        from dpp.core import escape
+        return escape.encode_chars(line)
 
     def run(self, input_text: str) -> str:
         return self._run_lines(input_text, self._run_line)
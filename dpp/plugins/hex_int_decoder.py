@@ -15,7 +15,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import re
+from itertools import repeat
 
+from dpp.core import radix
 from dpp.core.plugin import DecoderPlugin
 
 
@@ -37,7 +39,7 @@ class Plugin(DecoderPlugin):
         super().__init__('Hex (int)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        return self._run_lines(input_text, lambda text_part: str(int(text_part, 16)))
+        return radix.convert_tokens(input_text, lambda tokens: map(str, map(int, tokens, repeat(16))))
 
     def can_decode_input(self, input_text):
         if len(input_text) % 2 == 0:
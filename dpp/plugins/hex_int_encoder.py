@@ -14,6 +14,7 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from dpp.core import radix
 from dpp.core.plugin import EncoderPlugin
 
 
@@ -35,4 +36,4 @@ class Plugin(EncoderPlugin):
         super().__init__('Hex (int)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        return self._run_lines(input_text, lambda text_part: hex(int(text_part)))
+        return radix.convert_tokens(input_text, lambda tokens: map(hex, map(int, tokens)))
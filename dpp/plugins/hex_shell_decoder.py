@@ -14,8 +14,6 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import re
-
 from dpp.core.plugin import DecoderPlugin
 
 
@@ -41,24 +39,12 @@ class Plugin(DecoderPlugin):
 
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies
-        super().__init__('Hex (shell)', "Thomas Engel", ["codecs"], context)
+        super().__init__('Hex (shell)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        if input_text:
-            import codecs
-            import re
-            output = input_text
-            for hex_code in set(sorted(re.findall(r'\\[Xx][0-9a-fA-F][0-9a-fA-F]', input_text))):
-                try:
-                    output = output.replace(hex_code, codecs.decode(hex_code[-2:], 'hex').decode('utf-8', errors='surrogateescape'))
-                except:
-                    pass
-            return output
-        else:
-            return ""
+        from dpp.core import escape
+        return escape.decode_shell(input_text)
 
     def can_decode_input(self, input_text: str) -> bool:
-        contains_hex = re.findall(r'\\[Xx][0-9a-fA-F][0-9a-fA-F]', input_text)
-        if contains_hex:
-            return True
-        return False
+        from dpp.core import escape
+        return escape.SHELL_PATTERN.search(input_text.encode('utf-8', errors='surrogateescape')) is not None
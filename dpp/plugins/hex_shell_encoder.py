@@ -39,13 +39,8 @@ class Plugin(EncoderPlugin):
 
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies
-        super().__init__('Hex (shell)', "Thomas Engel", ["codecs"], context)
+        super().__init__('Hex (shell)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        if input_text:
-            import codecs
-            output = codecs.encode(input_text.encode('utf-8', errors='surrogateescape'), 'hex') \
-                .decode('utf-8', errors='surrogateescape')
-            return "\\x" + "\\x".join([i + j for i, j in zip(output[::2], output[1::2])])
-        else:
-            return ""
+        from dpp.core import escape
+        return escape.encode_shell(input_text)
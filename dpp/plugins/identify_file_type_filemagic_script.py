@@ -28,9 +28,9 @@ class Plugin(IdentifyPlugin):
         super().__init__('Identify File Type (filemagic)', "Thomas Engel", ["filemagic"], context, icon=Icon.IDENTIFY_FORMAT)
 
     def _detect_magic_bytes(self, input_text: str) -> str:
-        import magic
-        with magic.Magic() as m:
-            return m.id_buffer(input_text)
+        from dpp.core import identify
+        # Binary content is preserved by the surrogateescape error handler.
+        return identify.magic_pool().identify(input_text.encode('utf-8', errors='surrogateescape'))
 
     def run(self, input_text: str) -> str:
-        return self._detect_magic_bytes(input_text)
\ No newline at end of file
+        return self._detect_magic_bytes(input_text)
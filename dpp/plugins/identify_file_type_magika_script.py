@@ -26,13 +26,16 @@ class Plugin(IdentifyPlugin):
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies
         super().__init__('Identify File Type (magika)', "Thomas Engel", ["magika"], context, icon=Icon.IDENTIFY_FORMAT)
-        self._magika = None
+
+    def warm_up(self):
+        if not self.check_dependencies():
+            from dpp.core import identify
+            identify.magika_session().warm_up()
 
     def _detect_file_type(self, input_text: str) -> str:
-        if not self._magika:
-            from magika import Magika
-            self._magika = Magika()
-        return self._magika.identify_bytes(str.encode(input_text)).output.ct_label
+        from dpp.core import identify
+        # Binary content is preserved by the surrogateescape error handler.
+        return identify.magika_session().identify(input_text.encode('utf-8', errors='surrogateescape'))
 
     def run(self, input_text: str) -> str:
-        return self._detect_file_type(input_text)
\ No newline at end of file
+        return self._detect_file_type(input_text)
@@ -14,6 +14,8 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from typing import List
+
 from dpp.core.icons import Icon
 from dpp.core.plugin import IdentifyPlugin
 
@@ -21,6 +23,9 @@ from dpp.core.plugin import IdentifyPlugin
 class Plugin(IdentifyPlugin):
     """
     Identifies the hash format of the input text based on structure.
+
+    When the input contains multiple lines, each line is classified and a summary of the number of lines per format
+    is returned (e.g. "MD5<TAB>1000").
     """
 
     def __init__(self, context: 'dpp.core.context.Context'):
@@ -28,8 +33,19 @@ class Plugin(IdentifyPlugin):
         super().__init__('Identify Hash Format', "Thomas Engel", ["hashid"], context, icon=Icon.IDENTIFY_HASH)
 
     def _detect_hash_format(self, input_text: str) -> str:
-        from hashid import HashID
-        return "\n".join(sorted([item.name for item in HashID().identifyHash(input_text)]))
+        from dpp.core import hash_format
+        return "\n".join(hash_format.hash_identifier().names(input_text))
+
+    def _summarize_hash_formats(self, lines: List[str]) -> str:
+        from dpp.core import hash_format
+        # Worker processes are not spawned from within the GUI.
+        max_workers = 1 if self._context.isGUIMode() else None
+        summary = hash_format.hash_identifier().summarize(lines, max_workers=max_workers)
+        rows = sorted(summary.items(), key=lambda item: (-item[1], item[0]))
+        return "\n".join(f'{name}\t{count}' for name, count in rows)
 
     def run(self, input_text: str) -> str:
+        lines = [line for line in input_text.splitlines() if line.strip()]
+        if len(lines) > 1:
+            return self._summarize_hash_formats(lines)
         return self._detect_hash_format(input_text)
@@ -14,15 +14,14 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-import json
-from json import JSONDecodeError
 import os
+from typing import Iterable, Iterator
 
-
+from dpp.core.exceptions import CodecException, ValidationError
 from dpp.core.icons import Icon
 from dpp.core.plugin import ScriptPlugin, PluginConfig
-from dpp.core.plugin.config import Label
-from dpp.core.plugin.config.options import String
+from dpp.core.plugin.config import Label, integer_validator
+from dpp.core.plugin.config.options import String, ComboBox, Integer
 
 
 class Plugin(ScriptPlugin):
@@ -45,33 +44,62 @@ class Plugin(ScriptPlugin):
 
 	class Option(object):
 		Expression = Label("expression", "Expression:")
+		Format = Label("format", "Format:")
+		Workers = Label("workers", "Workers:")
 
 	class Codec:
 
+		def __init__(self, context: 'dpp.core.context.Context'):
+			self._context = context
+
 		def run(self, config: PluginConfig, text: str):
-			try:
-				import pyjq as pyjq
-				expression = config.value(Plugin.Option.Expression)
-				return os.linesep.join([
-					json.dumps(item) for item in pyjq.all(expression, json.loads(text))
-				])
-			except JSONDecodeError as e:
-				raise Exception("Error decoding json!")
-			except Exception as e:
-				# Ignore exceptions - most likely an error in the jq expression
-				pass
+			return os.linesep.join(self.run_stream(config, [text]))
+
+		def run_stream(self, config: PluginConfig, chunks: Iterable[str]) -> Iterator[str]:
+			from dpp.core import json_query
+			return json_query.query_stream(
+				json_query.Language.JQ,
+				config.value(Plugin.Option.Expression),
+				chunks,
+				format=config.value(Plugin.Option.Format),
+				# Worker processes are not spawned from within the GUI.
+				max_workers=1 if self._context.isGUIMode() else int(config.value(Plugin.Option.Workers))
+			)
 
 	def __init__(self, context: 'dpp.core.context.Context'):
 		# Name, Author, Dependencies, Icon
 		super().__init__('JQ', "Thomas Engel", ["pyjq"], context, Icon.FILTER)
 		self._context = context
-		self._codec = Plugin.Codec()
+		self._codec = Plugin.Codec(context)
+		self._init_config()
+
+	def _init_config(self):
+		def _validate_expression(input_text: str):
+			from dpp.core import json_query
+			try:
+				json_query.compile_expression(json_query.Language.JQ, self.config.value(Plugin.Option.Expression))
+			except CodecException as err:
+				raise ValidationError(str(err))
+
 		self.config.add(String(
 			label=Plugin.Option.Expression,
 			value="",
 			description="jq expression to filter by",
 			is_required=True
+		), validator=_validate_expression)
+		self.config.add(ComboBox(
+			label=Plugin.Option.Format,
+			value="JSON",
+			values=["JSON", "JSON Lines", "JSON Array Items"],
+			description="apply the expression to the document, to each line or to each array item",
+			is_required=True
 		))
+		self.config.add(Integer(
+			label=Plugin.Option.Workers,
+			value=0,
+			description="number of processes used for JSON Lines (0 = number of cpus)",
+			is_required=True
+		), validator=integer_validator(self.config, Plugin.Option.Workers, 0))
 
 	@property
 	def title(self) -> str:
@@ -79,3 +107,9 @@ class Plugin(ScriptPlugin):
 
 	def run(self, input_text: str) -> str:
 		return self._codec.run(self.config, input_text)
+
+	def run_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+		separator = ''
+		for result in self._codec.run_stream(self.config, chunks):
+			yield separator + result
+			separator = os.linesep
@@ -18,7 +18,7 @@ import json
 import logging
 import os.path
 from abc import abstractmethod
-from typing import Callable
+from typing import Any, Callable, Iterable, Iterator
 
 from lxml import etree
 
@@ -36,6 +36,7 @@ class Plugin(plugin.ScriptPlugin):
 
     class Option(object):
         Format = plugin.config.Label("format", "Format:")
+        Pretty = plugin.config.Label("pretty", "Pretty")
 
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies
@@ -168,11 +169,18 @@ class Plugin(plugin.ScriptPlugin):
             description="the format of the input text.",
             is_required=True,
         ))
+        self.config.add(plugin.config.options.Boolean(
+            label=Plugin.Option.Pretty,
+            value=False,
+            description="whether the JSON output should be indented.",
+            is_required=False
+        ))
         self._codec = JC()
 
     def _create_options_layout(self, input_text: str) -> Layout:
         return HBoxLayout(widgets=[
             Option(Plugin.Option.Format),
+            Option(Plugin.Option.Pretty),
             Button(
                 label="Auto-Detect",
                 on_click=lambda event: self._auto_detect_format(self._config, input_text)
@@ -180,7 +188,9 @@ class Plugin(plugin.ScriptPlugin):
         ])
 
     def _auto_detect_format(self, config, input_text):
-        input_format = self._codec.auto_detect_format(config, input_text)
+        # Worker processes are not spawned from within the GUI.
+        input_format = self._codec.auto_detect_format(config, input_text,
+                                                      max_workers=1 if self._context.isGUIMode() else 0)
         if input_format:
             config.update({Plugin.Option.Format.key: input_format})
 
@@ -191,6 +201,12 @@ class Plugin(plugin.ScriptPlugin):
     def run(self, input_text: str) -> str:
         return self._codec.run(self.config, input_text)
 
+    def run_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        separator = ''
+        for result in self._codec.run_stream(self.config, chunks):
+            yield separator + result
+            separator = os.linesep
+
 
 class JC:
     """ Codec for transforming various file formats into JSON using jc. """
@@ -251,6 +267,11 @@ class JC:
             super().__init__(input_format, input_text)
             self._callback = callback
 
+        def pre_check(self) -> bool:
+            if self._callback:
+                return self._check_true(self._callback)
+            return True
+
         def check(self) -> bool:
             if self._callback:
                 return self._callback()
@@ -331,6 +352,7 @@ class JC:
     def __init__(self):
         import validators
         self._logger = logging.getLogger(__name__)
+        self._streaming_formats = None
         self._auto_detect_skip_list = [
             'airport-s',
             'asciitable',
@@ -354,9 +376,9 @@ class JC:
             'lsof': lambda input_text: JC.Parser('lsof', input_text, callback=lambda: 'NODE NAME' in input_text),
             'ls': lambda input_text: JC.LsParser('ls', input_text),
             'ip-address': lambda input_text: JC.IpAddressParser('ip-address', input_text),
-            'ntpq': lambda input_text: JC.Parser('ntpq', lambda: '==========' in input_text),
-            'ps': lambda input_text: JC.Parser('ps', lambda: 'PID' in input_text),
-            'url': lambda input_text: JC.Parser('url', lambda: validators.url(input_text)),
+            'ntpq': lambda input_text: JC.Parser('ntpq', input_text, callback=lambda: '==========' in input_text),
+            'ps': lambda input_text: JC.Parser('ps', input_text, callback=lambda: 'PID' in input_text),
+            'url': lambda input_text: JC.Parser('url', input_text, callback=lambda: validators.url(input_text)),
             'xml': lambda input_text: JC.XmlParser('xml', input_text),
             'yaml': lambda input_text: JC.YamlParser('yaml', input_text)
         }
@@ -368,59 +390,87 @@ class JC:
             self._logger.trace(err)
             return False
 
-    def auto_detect_format(self, config, input_text) -> str:
+    def _pre_check(self, input_format, sample) -> bool:
+        """ Quickly rules out formats which are known not to match the sample without parsing it. """
+        if input_format not in self._pre_validators:
+            return True
+        try:
+            return bool(self._pre_validators[input_format](sample).pre_check())
+        except Exception as err:
+            self._logger.trace(err)
+            return False
+
+    def auto_detect_format(self, config, input_text, max_workers: int = 1) -> str:
         """
-        Tries to auto-detect the format.
+        Tries to auto-detect the format using a head sample of the input text.
         :param config: the configuration containing all available formats.
         :param input_text: the input string.
+        :param max_workers: the maximum number of processes used for large samples (0 = number of cpus).
         :return: the auto-detected format or None if no format could be detected.
         """
-        self._logger.debug(f'Looking for matching formats for "{input_text}" ...')
-        input_formats = config.option(Plugin.Option.Format).values
-        best_candidate_input_format = ''
-        best_candidate_output_text = ''
-        for input_format in input_formats:
-            try:
-                self._logger.debug(f'Checking for {input_format} ...')
-                if input_format in self._auto_detect_skip_list:
-                    self._logger.debug(f'Skipping {input_format} ...')
-                    continue
-                if input_format in self._pre_validators:
-                    parser = self._pre_validators[input_format](input_text)
-                else:
-                    parser = JC.Parser(input_format, input_text)
-
-                if not parser.check():
-                    self._logger.debug(f'Input text seems not to be {input_format}! Skipping ...')
-                    continue
-
-                output_text = parser.parse()
-                self._logger.debug(f'Transforming to {input_format} succeeded!')
-
-                if len(output_text) > len(best_candidate_output_text):
-                    self._logger.debug(f'Choosing {input_format} temporarily as best candidate ...')
-                    best_candidate_output_text = output_text
-                    best_candidate_input_format = input_format
-            except:
-                self._logger.debug(f'Transforming to {input_format} failed!')
-                continue
-
-        return best_candidate_input_format
-
-    def _run(self, input_format, input_text):
+        from dpp.core import jsonify
+        input_formats = [input_format for input_format in config.option(Plugin.Option.Format).values
+                         if input_format not in self._auto_detect_skip_list and not self.is_streaming(input_format)]
+        self._logger.debug(f'Looking for matching formats within {len(input_formats)} candidates ...')
+        input_format = jsonify.detect_format(input_formats, input_text, pre_check=self._pre_check,
+                                             max_workers=max_workers)
+        self._logger.debug(f'Auto-detected format: {input_format}')
+        return input_format
+
+    def is_streaming(self, input_format: str) -> bool:
+        """ :returns whether jc parses the format line by line (e.g. csv-s or syslog-s). """
+        if self._streaming_formats is None:
+            import jc.lib
+            self._streaming_formats = set(jc.lib.streaming_parser_mod_list())
+        return input_format.replace('-', '_') in self._streaming_formats
+
+    def _dumps(self, config) -> Callable[[Any], str]:
+        if config.value(Plugin.Option.Pretty):
+            return lambda value: json.dumps(value, indent=4)
+        return json.dumps
+
+    def _run(self, input_format, input_text, dumps=json.dumps):
         import jc
-        return json.dumps(jc.parse(input_format, input_text))
+        return dumps(jc.parse(input_format, input_text))
 
     def run(self, config, input_text):
         """
         Transforms the input text to JSON.
         :param config: the input parameters.
         :param input_text: the input string.
-        :return: JSON.
+        :return: JSON, or one JSON record per line when using a streaming parser.
+        """
+        input_format = config.value(Plugin.Option.Format)
+        if self.is_streaming(input_format):
+            return os.linesep.join(self.run_stream(config, [input_text]))
+        try:
+            return self._run(input_format, input_text, self._dumps(config))
+        except Exception as err:
+            self._logger.debug(err, exc_info=True)
+            raise CodecException(f'Transforming input from {input_format} to JSON failed!')
+
+    def run_stream(self, config, chunks: Iterable[str]) -> Iterator[str]:
+        """
+        Transforms a stream of text chunks to JSON. Streaming parsers (e.g. csv-s) are fed line by line and each
+        record is returned as soon as it is parsed, so that memory usage stays flat regardless of the input size.
+        Other parsers require the whole input.
+        :param config: the input parameters.
+        :param chunks: the input text chunks.
+        :return: an iterator over the JSON records.
         """
         input_format = config.value(Plugin.Option.Format)
+        if not self.is_streaming(input_format):
+            yield self.run(config, ''.join(chunks))
+            return
+
+        import jc
+        from dpp.core.lines import iter_lines
+        dumps = self._dumps(config)
         try:
-            return self._run(input_format, input_text)
+            for record in jc.parse(input_format, iter_lines(chunks)):
+                yield dumps(record)
+        except CodecException:
+            raise
         except Exception as err:
             self._logger.debug(err, exc_info=True)
             raise CodecException(f'Transforming input from {input_format} to JSON failed!')
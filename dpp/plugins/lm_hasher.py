@@ -36,6 +36,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('LM', "Thomas Engel", ["passlib"], context)
 
+    @property
+    def passlib_handler(self) -> str:
+        return 'lmhash'
+
     def run(self, input_text: str) -> str:
         from passlib.hash import lmhash
         return lmhash.encrypt(input_text.encode('utf-8', errors='surrogateescape'))
@@ -36,6 +36,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('NT', "Thomas Engel", ["passlib"], context)
 
+    @property
+    def passlib_handler(self) -> str:
+        return 'nthash'
+
     def run(self, input_text: str) -> str:
         from passlib.hash import nthash
         return nthash.encrypt(input_text.encode('utf-8', errors='surrogateescape'))
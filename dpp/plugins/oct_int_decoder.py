@@ -14,6 +14,9 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from itertools import repeat
+
+from dpp.core import radix
 from dpp.core.plugin import DecoderPlugin
 
 
@@ -35,4 +38,4 @@ class Plugin(DecoderPlugin):
         super().__init__('OCT (int)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        return self._run_lines(input_text, lambda text_part: str(int(text_part, 8)))
+        return radix.convert_tokens(input_text, lambda tokens: map(str, map(int, tokens, repeat(8))))
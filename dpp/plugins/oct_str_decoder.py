@@ -14,8 +14,7 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-from typing import List
-
+from dpp.core import radix
 from dpp.core.plugin import DecoderPlugin
 
 
@@ -45,7 +44,4 @@ class Plugin(DecoderPlugin):
         super().__init__('OCT (str)', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        return ''.join([chr(int(chunk, 8)) for chunk in self._chunk_string(input_text, 3)])
-
-    def _chunk_string(self, string: str, length: int) -> List[str]:
-        return [string[0 + i:length + i] for i in range(0, len(string), length)]
\ No newline at end of file
+        return radix.decode_code_points(input_text, 8, width=3)
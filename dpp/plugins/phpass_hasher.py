@@ -36,6 +36,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('PHPass', "Thomas Engel", ["passlib"], context)
 
+    @property
+    def passlib_handler(self) -> str:
+        return 'phpass'
+
     def run(self, input_text: str) -> str:
         from passlib.hash import phpass
         return phpass.encrypt(input_text.encode('utf-8', errors='surrogateescape'))
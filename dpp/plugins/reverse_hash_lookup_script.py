@@ -0,0 +1,115 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+from typing import Iterable, Iterator, List, Optional
+
+from dpp.core.exceptions import CodecException, ValidationError
+from dpp.core.icons import Icon
+from dpp.core.plugin import ScriptPlugin, PluginConfig
+from dpp.core.plugin.config import Label
+from dpp.core.plugin.config.options import String
+
+
+class Plugin(ScriptPlugin):
+    """
+    Reverses unsalted hashes (e.g. md5, sha1, nt or lm) using pre-computed wordlist indexes.
+
+    Each line of the input is looked up within the indexes matching the size of the digest. Resolved lines are
+    returned as "hash:word", other lines are returned unchanged. Indexes are built using "dpp --build-index".
+    """
+
+    class Option(object):
+        Index = Label("index", "Index:")
+
+    class ReverseHashLookupCodec:
+
+        def _indexes(self, config: PluginConfig) -> List['dpp.core.digest_index.DigestIndex']:
+            from dpp.core import digest_index
+            paths = digest_index.index_paths(config.value(Plugin.Option.Index))
+            if not paths:
+                raise CodecException('Reverse hash lookup failed! No index found.')
+            indexes = []
+            try:
+                for path in paths:
+                    indexes.append(digest_index.DigestIndex(path))
+            except Exception as err:
+                for index in indexes:
+                    index.close()
+                raise CodecException(f'Reverse hash lookup failed! {err}')
+            return indexes
+
+        @staticmethod
+        def _lookup(indexes: List['dpp.core.digest_index.DigestIndex'], line: str) -> Optional[str]:
+            try:
+                digest = bytes.fromhex(line.strip())
+            except ValueError:
+                return None
+            for index in indexes:
+                word = index.lookup(digest)
+                if word is not None:
+                    return word.decode('utf-8', errors='surrogateescape')
+            return None
+
+        def _resolve(self, config: PluginConfig, lines: Iterable[str]) -> Iterator[str]:
+            indexes = self._indexes(config)
+            try:
+                for line in lines:
+                    word = self._lookup(indexes, line)
+                    yield line if word is None else f'{line.strip()}:{word}'
+            finally:
+                for index in indexes:
+                    index.close()
+
+        def run(self, config: PluginConfig, input_text: str) -> str:
+            return os.linesep.join(self._resolve(config, input_text.splitlines()))
+
+        def run_stream(self, config: PluginConfig, chunks: Iterable[str]) -> Iterator[str]:
+            from dpp.core.lines import iter_lines
+            for index, line in enumerate(self._resolve(config, iter_lines(chunks))):
+                yield os.linesep + line if index else line
+
+    def __init__(self, context: 'dpp.core.context.Context'):
+        # Name, Author, Dependencies, Icon
+        super().__init__('Reverse Hash Lookup', "Thomas Engel", [], context, Icon.IDENTIFY_HASH)
+        self._codec = Plugin.ReverseHashLookupCodec()
+        self.config.add(String(
+            label=Plugin.Option.Index,
+            value="",
+            description="an index file, a directory containing index files or a wordlist next to which index files "
+                        "were built using --build-index",
+            is_required=True
+        ), validator=self._validate_index)
+
+    def _validate_index(self, input_text: str):
+        from dpp.core import digest_index
+        path = self.config.value(Plugin.Option.Index)
+        if not path:
+            raise ValidationError("Index should not be empty.")
+        if not os.path.exists(path):
+            raise ValidationError("Index does not exist.")
+        if not digest_index.index_paths(path):
+            raise ValidationError("No index found.")
+
+    @property
+    def title(self) -> str:
+        return "Reverse Hash Lookup using '{}'".format(os.path.basename(self.config.value(Plugin.Option.Index)))
+
+    def run(self, input_text: str) -> str:
+        return self._codec.run(self.config, input_text)
+
+    def run_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        return self._codec.run_stream(self.config, chunks)
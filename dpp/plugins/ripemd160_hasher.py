@@ -42,6 +42,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('RIPEMD160', "Tim Menapace", ["pycryptodome"], context)
 
+    @property
+    def releases_gil(self) -> bool:
+        return True
+
     def run(self, input_text: str) -> str:
         from Crypto.Hash import RIPEMD160
         return RIPEMD160.new(input_text.encode('utf-8', errors='surrogateescape')).hexdigest()
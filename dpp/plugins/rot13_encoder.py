@@ -36,8 +36,8 @@ class Plugin(EncoderPlugin):
 
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies
-        super().__init__('ROT13', "Robin Krumnow", ["codecs"], context)
+        super().__init__('ROT13', "Robin Krumnow", [], context)
 
     def run(self, input_text: str) -> str:
-        import codecs
-        return codecs.encode(input_text, 'rot_13')
+        from dpp.core import rotation
+        return rotation.rotate(input_text, 13)
@@ -14,9 +14,11 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import re
+from typing import Iterable, Iterator
 
-from dpp.core.exceptions import ValidationError
+from dpp.core.exceptions import CodecException, ValidationError
 from dpp.core.icons import Icon
 from dpp.core.plugin import ScriptPlugin, PluginConfig
 from dpp.core.plugin.config import Label
@@ -33,34 +35,67 @@ class Plugin(ScriptPlugin):
         ReplaceTerm = Label("replace_term", "Replace:")
         ShouldMatchCase = Label("should_match_case", "Match Case")
         IsRegex = Label("is_regex", "Regex")
+        RulesFile = Label("rules_file", "Rules File:")
 
     class SearchAndReplaceCodec:
 
-        def run(self, config, input_text):
-            is_regex = config.value(Plugin.Option.IsRegex)
-            should_match_case = config.value(Plugin.Option.ShouldMatchCase)
-            search_term = config.value(Plugin.Option.SearchTerm)
-            replace_term = config.value(Plugin.Option.ReplaceTerm)
-            if is_regex and should_match_case:
-                return re.sub(search_term, replace_term, input_text, flags=re.IGNORECASE)
-            elif is_regex:
-                return re.sub(search_term, replace_term, input_text)
-            elif should_match_case:
-                return input_text.replace(search_term, replace_term)
-            else:
-                regexp = re.compile(re.escape(search_term), re.IGNORECASE)
-                return regexp.sub(search_term, input_text)
+        def __init__(self, context: 'dpp.core.context.Context'):
+            self._context = context
+
+        def replacer(self, config: PluginConfig) -> 'dpp.core.replace.Replacer':
+            """ :returns the rules compiled into a replacer. """
+            from dpp.core import replace
+            rules_file = config.value(Plugin.Option.RulesFile)
+            try:
+                if rules_file:
+                    rules = replace.load_rules(rules_file)
+                else:
+                    rules = [replace.Rule(
+                        config.value(Plugin.Option.SearchTerm), config.value(Plugin.Option.ReplaceTerm))]
+                return replace.Replacer(
+                    rules,
+                    is_regex=config.value(Plugin.Option.IsRegex),
+                    should_match_case=config.value(Plugin.Option.ShouldMatchCase)
+                )
+            except re.error as err:
+                raise CodecException(f'Search and replace failed! Invalid regular expression: {err}')
+            except Exception as err:
+                raise CodecException(f'Search and replace failed! {err}')
+
+        def _log_hits(self, replacer: 'dpp.core.replace.Replacer'):
+            for rule, hits in zip(replacer.rules, replacer.hits):
+                self._context.logger.debug(f"Search and Replace: '{rule.search}' with '{rule.replace}': {hits} hit(s)")
+            self._context.logger.info(f'Search and Replace: {sum(replacer.hits)} replacement(s) using '
+                                      f'{sum(1 for hits in replacer.hits if hits)} of {len(replacer.rules)} rule(s)')
+
+        def run(self, config: PluginConfig, input_text: str) -> str:
+            replacer = self.replacer(config)
+            output = replacer.replace(input_text)
+            self._log_hits(replacer)
+            return output
+
+        def run_stream(self, config: PluginConfig, chunks: Iterable[str]) -> Iterator[str]:
+            replacer = self.replacer(config)
+            yield from replacer.replace_stream(chunks)
+            self._log_hits(replacer)
 
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies, Icon
         super().__init__('Search & Replace', "Thomas Engel", [], context, Icon.SEARCH)
-        self._codec = Plugin.SearchAndReplaceCodec()
+        self._codec = Plugin.SearchAndReplaceCodec(context)
         self._init_config()
 
     def _init_config(self):
         def _validate_search_term(input_text: str):
-            if not self.config.value(Plugin.Option.SearchTerm):
+            if not self.config.value(Plugin.Option.SearchTerm) and not self.config.value(Plugin.Option.RulesFile):
                 raise ValidationError("Search term should not be empty.")
+            self._validate_rules()
+
+        def _validate_rules_file(input_text: str):
+            rules_file = self.config.value(Plugin.Option.RulesFile)
+            if rules_file and not os.path.isfile(rules_file):
+                raise ValidationError("Rules file does not exist.")
+            self._validate_rules()
 
         self.config.add(String(
             label=Plugin.Option.SearchTerm,
@@ -86,9 +121,26 @@ class Plugin(ScriptPlugin):
             description="defines whether the search term is a regular expression",
             is_required=False
         ))
+        self.config.add(String(
+            label=Plugin.Option.RulesFile,
+            value="",
+            description="a file containing one search and replace term separated by tab per line, "
+                        "which is used instead of the search and replace term",
+            is_required=False
+        ), validator=_validate_rules_file)
+
+    def _validate_rules(self):
+        try:
+            self._codec.replacer(self.config)
+        except CodecException as err:
+            raise ValidationError(str(err))
 
     @property
     def title(self) -> str:
+        if self.config.value(Plugin.Option.RulesFile):
+            return "Search and Replace rules of '{}' using {}".format(
+                os.path.basename(self.config.value(Plugin.Option.RulesFile)),
+                self._get_option_as_human_readable_string())
         return "Search and Replace '{}' with '{}' using {}".format(
             self._get_search_term(), self._get_replace_term(), self._get_option_as_human_readable_string())
 
@@ -114,3 +166,6 @@ class Plugin(ScriptPlugin):
 
     def run(self, input_text: str) -> str:
         return self._codec.run(self.config, input_text)
+
+    def run_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+        return self._codec.run_stream(self.config, chunks)
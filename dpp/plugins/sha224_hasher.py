@@ -37,6 +37,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('SHA224', "Thomas Engel", ["hashlib"], context)
 
+    @property
+    def releases_gil(self) -> bool:
+        return True
+
     def run(self, input_text: str) -> str:
         import hashlib
         return hashlib.sha224(input_text.encode('utf-8', errors='surrogateescape')).hexdigest()
@@ -36,6 +36,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('SHA3 224', "Thomas Engel", [], context)
 
+    @property
+    def releases_gil(self) -> bool:
+        return True
+
     def run(self, input_text: str) -> str:
         import hashlib
         return hashlib.sha3_224(input_text.encode('utf-8', errors='surrogateescape')).hexdigest()
@@ -38,5 +38,9 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('SHA3 256', "Thomas Engel", [], context)
 
+    @property
+    def releases_gil(self) -> bool:
+        return True
+
     def run(self, input_text: str) -> str:
         return hashlib.sha3_256(input_text.encode('utf-8', errors='surrogateescape')).hexdigest()
@@ -38,5 +38,9 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('SHA3 384', "Thomas Engel", [], context)
 
+    @property
+    def releases_gil(self) -> bool:
+        return True
+
     def run(self, input_text: str) -> str:
         return hashlib.sha3_384(input_text.encode('utf-8', errors='surrogateescape')).hexdigest()
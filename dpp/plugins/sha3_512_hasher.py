@@ -39,5 +39,9 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('SHA3 512', "Thomas Engel", [], context)
 
+    @property
+    def releases_gil(self) -> bool:
+        return True
+
     def run(self, input_text: str) -> str:
         return hashlib.sha3_512(input_text.encode('utf-8', errors='surrogateescape')).hexdigest()
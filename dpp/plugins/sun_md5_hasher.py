@@ -36,6 +36,10 @@ class Plugin(HasherPlugin):
         # Name, Author, Dependencies
         super().__init__('Sun-MD5', "Thomas Engel", ["passlib"], context)
 
+    @property
+    def passlib_handler(self) -> str:
+        return 'sun_md5_crypt'
+
     def run(self, input_text: str) -> str:
         from passlib.hash import sun_md5_crypt
         return sun_md5_crypt.encrypt(input_text.encode('utf-8', errors='surrogateescape'))
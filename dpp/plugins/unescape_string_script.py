@@ -27,4 +27,5 @@ class Plugin(ScriptPlugin):
         super().__init__('Unescape String', "Thomas Engel", [], context)
 
     def run(self, input_text: str) -> str:
-        return input_text.encode('utf-8').decode('unicode_escape')
+        from dpp.core import escape
+        return escape.decode_string(input_text)
@@ -0,0 +1,91 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import time
+from typing import List
+
+from dpp.core.exceptions import CodecException, ValidationError
+from dpp.core.icons import Icon
+from dpp.core.plugin import ScriptPlugin, PluginType
+from dpp.core.plugin.config import Label
+from dpp.core.plugin.config.options import String
+
+
+class Plugin(ScriptPlugin):
+    """
+    Verifies salted hashes (e.g. phpass, Apache-MD5 or Sun-MD5) against the candidates of a wordlist using passlib.
+
+    Each line of the input is verified using the hashers which specify a passlib handler able to identify it. Cracked
+    lines are returned as "hash:word", other lines are returned unchanged. The candidates are verified in parallel.
+    """
+
+    class Option(object):
+        Wordlist = Label("wordlist", "Wordlist:")
+
+    def __init__(self, context: 'dpp.core.context.Context'):
+        # Name, Author, Dependencies, Icon
+        super().__init__('Verify Hashes', "Thomas Engel", ["passlib"], context, Icon.IDENTIFY_HASH)
+        self.config.add(String(
+            label=Plugin.Option.Wordlist,
+            value="",
+            description="a file containing one candidate per line",
+            is_required=True
+        ), validator=self._validate_wordlist)
+
+    def _validate_wordlist(self, input_text: str):
+        wordlist = self.config.value(Plugin.Option.Wordlist)
+        if not wordlist:
+            raise ValidationError("Wordlist should not be empty.")
+        if not os.path.isfile(wordlist):
+            raise ValidationError("Wordlist does not exist.")
+
+    @property
+    def title(self) -> str:
+        return "Verify Hashes using '{}'".format(os.path.basename(self.config.value(Plugin.Option.Wordlist)))
+
+    def _handler_names(self) -> List[str]:
+        """ :returns the names of the passlib handlers of all hashers (e.g. ['phpass', 'apr_md5_crypt', ...]). """
+        handler_names = []
+        for plugin in self._context.plugins().filter(type=PluginType.HASHER):
+            if plugin.passlib_handler and plugin.passlib_handler not in handler_names:
+                handler_names.append(plugin.passlib_handler)
+        return handler_names
+
+    def _log_progress(self, progress: 'dpp.core.hash_verify.Progress'):
+        now = time.monotonic()
+        if now - self._last_progress >= 1:
+            self._last_progress = now
+            percent = 100 * progress.position / progress.size if progress.size else 100
+            self._context.logger.info(f'Verify Hashes: {percent:.1f}% ({progress.tested} candidates, '
+                                      f'{progress.rate:.0f}/s), cracked {progress.cracked} hash(es)')
+
+    def run(self, input_text: str) -> str:
+        from dpp.core import hash_verify
+        lines = input_text.splitlines()
+        hashes = hash_verify.identify(list(dict.fromkeys(line.strip() for line in lines if line.strip())),
+                                      self._handler_names())
+        if not hashes:
+            raise CodecException('Verify Hashes failed! No supported hash found.')
+        self._last_progress = time.monotonic()
+        try:
+            found = hash_verify.verify(hashes, self.config.value(Plugin.Option.Wordlist), progress=self._log_progress)
+        except OSError as err:
+            raise CodecException(f'Verify Hashes failed! {err}')
+        self._context.logger.info(f'Verify Hashes: cracked {len(found)} of {len(hashes)} hash(es)')
+        return os.linesep.join(
+            f'{line.strip()}:{found[line.strip()].decode("utf-8", errors="surrogateescape")}'
+            if line.strip() in found else line for line in lines)
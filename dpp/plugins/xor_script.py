@@ -0,0 +1,150 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import logging
+
+from dpp.core.exceptions import CodecException, ValidationError
+from dpp.core.icons import Icon
+from dpp.core.plugin import ScriptPlugin
+from dpp.core.plugin.config import Label, integer_validator
+from dpp.core.plugin.config.options import ComboBox, Integer, String
+
+
+class Plugin(ScriptPlugin):
+    """
+    Applies a known xor key or recovers single-byte and repeating multi-byte xor keys of english text.
+
+    Example 1:
+
+        Mode: Apply Key, Key: 01 (hex)
+
+        Input:
+            abc
+
+        Output:
+            `cb
+
+    Example 2:
+
+        Mode: Recover Repeating Key
+
+        Input:
+            <text xor-ed with the key "secret">
+
+        Output:
+            736563726574	-3.74	...
+            ...
+    """
+
+    class Mode:
+        APPLY_KEY = "Apply Key"
+        RECOVER_SINGLE_BYTE_KEY = "Recover Single-Byte Key"
+        RECOVER_REPEATING_KEY = "Recover Repeating Key"
+
+    class KeyFormat:
+        HEX = "Hex"
+        TEXT = "Text"
+
+    class Option(object):
+        Mode = Label("mode", "Mode:")
+        Key = Label("key", "Key:")
+        KeyFormat = Label("key_format", "Key Format:")
+        MaxKeyLength = Label("max_key_length", "Max. Key Length:")
+        Top = Label("top", "Top Keys:")
+
+    def __init__(self, context: 'dpp.core.context.Context'):
+        # Name, Author, Dependencies, Icon
+        super().__init__('XOR', "Thomas Engel", [], context, Icon.EDIT)
+        self._logger = logging.getLogger(__name__)
+        self._init_config()
+
+    def _init_config(self):
+        def _validate_key(input_text: str):
+            if self.config.value(Plugin.Option.Mode) != Plugin.Mode.APPLY_KEY:
+                return
+            try:
+                if not self._key():
+                    raise ValidationError("Key should not be empty.")
+            except ValueError:
+                raise ValidationError("Key should be a hex string (e.g. 0a1b2c).")
+
+        self.config.add(ComboBox(
+            label=Plugin.Option.Mode,
+            value=Plugin.Mode.APPLY_KEY,
+            values=[Plugin.Mode.APPLY_KEY, Plugin.Mode.RECOVER_SINGLE_BYTE_KEY, Plugin.Mode.RECOVER_REPEATING_KEY],
+            description="whether to apply the key or to recover the most likely keys.",
+            is_required=True
+        ))
+        self.config.add(String(
+            label=Plugin.Option.Key,
+            value="",
+            description="the key which is applied to the input.",
+            is_required=False
+        ), validator=_validate_key)
+        self.config.add(ComboBox(
+            label=Plugin.Option.KeyFormat,
+            value=Plugin.KeyFormat.HEX,
+            values=[Plugin.KeyFormat.HEX, Plugin.KeyFormat.TEXT],
+            description="whether the key is specified as hex string or as text.",
+            is_required=True
+        ))
+        self.config.add(Integer(
+            label=Plugin.Option.MaxKeyLength,
+            value=40,
+            description="the maximum length of repeating keys which are recovered.",
+            is_required=True
+        ), validator=integer_validator(self.config, Plugin.Option.MaxKeyLength, 1))
+        self.config.add(Integer(
+            label=Plugin.Option.Top,
+            value=5,
+            description="the number of most likely keys which are listed.",
+            is_required=True
+        ), validator=integer_validator(self.config, Plugin.Option.Top, 1))
+
+    def _key(self) -> bytes:
+        key = self.config.value(Plugin.Option.Key)
+        if self.config.value(Plugin.Option.KeyFormat) == Plugin.KeyFormat.HEX:
+            return bytes.fromhex(key)
+        return key.encode('utf-8', errors='surrogateescape')
+
+    @property
+    def title(self):
+        if self.config.value(Plugin.Option.Mode) == Plugin.Mode.APPLY_KEY:
+            return "XOR with key '{}'".format(self.config.value(Plugin.Option.Key))
+        return "XOR {}".format(self.config.value(Plugin.Option.Mode))
+
+    def run(self, input_text: str) -> str:
+        from dpp.core import xor
+        data = input_text.encode('utf-8', errors='surrogateescape')
+        mode = self.config.value(Plugin.Option.Mode)
+        if mode == Plugin.Mode.APPLY_KEY:
+            try:
+                key = self._key()
+            except ValueError as err:
+                self._logger.debug(err, exc_info=True)
+                raise CodecException('XOR failed! Key should be a hex string (e.g. 0a1b2c).')
+            return xor.xor(data, key).decode('utf-8', errors='surrogateescape')
+
+        max_key_length = 1 if mode == Plugin.Mode.RECOVER_SINGLE_BYTE_KEY \
+            else int(self.config.value(Plugin.Option.MaxKeyLength))
+        top = int(self.config.value(Plugin.Option.Top))
+        candidates = xor.recover_keys(data, max_key_length, key_lengths=top, top=top)
+        # Non-printable characters of the previews are replaced, since they would break the table.
+        return '\n'.join('{}\t{:.2f}\t{}'.format(
+            candidate.key.hex(),
+            candidate.score,
+            ''.join(chr(b) if 32 <= b < 127 else '.' for b in candidate.preview)
+        ) for candidate in candidates)
@@ -14,8 +14,10 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
-from lxml.etree import XMLSyntaxError
+import os
+from typing import Iterable, Iterator
 
+from dpp.core.exceptions import CodecException, ValidationError
 from dpp.core.icons import Icon
 from dpp.core.plugin import ScriptPlugin, PluginConfig
 from dpp.core.plugin.config import Label
@@ -26,7 +28,7 @@ class Plugin(ScriptPlugin):
 	"""
 	Opens a dialog to filter xml text by certain xpath expression.
 
-	Example:
+	Example 1:
 
 		Input:
 			<a><b>text</b></a>
@@ -37,42 +39,84 @@ class Plugin(ScriptPlugin):
 		Output:
 			<b>text</b>
 
+	Example 2:
+
+		Streams the records of large documents when a record tag is specified.
+
+		Input:
+			<items><item><name>a</name></item><item><name>b</name></item></items>
+
+		Expression:
+			./name/text()
+
+		Record Tag:
+			item
+
+		Output:
+			a
+			b
+
 	"""
 
 	class Option(object):
 		Expression = Label("xpath_expression", "XPath:")
+		RecordTag = Label("record_tag", "Record Tag:")
 
 	class Codec:
 
 		def run(self, config: PluginConfig, text: str):
-			try:
-				from lxml import etree
-				expression = config.value(Plugin.Option.Expression)
-				root = etree.fromstring(text)
-				return "".join(etree.tostring(item).decode('utf-8', errors="surrogateescape")
-					for item in root.xpath(expression)
-				)
-			except XMLSyntaxError as e:
-				raise Exception("Error decoding XML!")
-			except Exception as e:
-				# Ignore exceptions - most likely an error in the xpath expression
-				pass
+			return os.linesep.join(self.run_stream(config, [text]))
+
+		def run_stream(self, config: PluginConfig, chunks: Iterable[str]) -> Iterator[str]:
+			from dpp.core import xpath
+			expression = config.value(Plugin.Option.Expression)
+			record_tag = config.value(Plugin.Option.RecordTag)
+			# Passing bytes lets lxml detect the encoding using the XML declaration.
+			data = (chunk.encode('utf-8', errors='surrogateescape') for chunk in chunks)
+			if record_tag:
+				return xpath.query_stream(data, expression, record_tag)
+			return xpath.query(b''.join(data), expression)
 
 	def __init__(self, context: 'dpp.core.context.Context'):
 		# Name, Author, Dependencies, Icon
 		super().__init__('XPath', "Thomas Engel", ["lxml"], context, Icon.FILTER)
 		self._context = context
 		self._codec = Plugin.Codec()
+		self._init_config()
+
+	def _init_config(self):
+		def _validate_expression(input_text: str):
+			from dpp.core import xpath
+			try:
+				xpath.compile_expression(self.config.value(Plugin.Option.Expression))
+			except CodecException as err:
+				raise ValidationError(str(err))
+
 		self.config.add(String(
 			label=Plugin.Option.Expression,
 			value="",
 			description="xpath expression to filter by",
 			is_required=True
+		), validator=_validate_expression)
+		self.config.add(String(
+			label=Plugin.Option.RecordTag,
+			value="",
+			description="tag of the records to which the xpath expression is applied one by one (streaming)",
+			is_required=False
 		))
 
 	@property
 	def title(self) -> str:
+		if self.config.value(Plugin.Option.RecordTag):
+			return "Filter '{}' records by XPath expression '{}'".format(
+				self.config.value(Plugin.Option.RecordTag), self.config.value(Plugin.Option.Expression))
 		return "Filter by XPath expression '{}'".format(self.config.value(Plugin.Option.Expression))
 
 	def run(self, input_text: str) -> str:
 		return self._codec.run(self.config, input_text)
+
+	def run_stream(self, chunks: Iterable[str]) -> Iterator[str]:
+		separator = ''
+		for result in self._codec.run_stream(self.config, chunks):
+			yield separator + result
+			separator = os.linesep
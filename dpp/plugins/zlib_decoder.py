@@ -14,7 +14,10 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from dpp.core.compression import Inflate, decode_stream
 from dpp.core.plugin import DecoderPlugin
+from dpp.core.plugin.config import Label, integer_validator
+from dpp.core.plugin.config.options import Integer
 
 
 class Plugin(DecoderPlugin):
@@ -32,21 +35,55 @@ class Plugin(DecoderPlugin):
             0123456789
     """
 
+    class Option(object):
+        MaxOutputSize = Label("max_output_size", "Max. Output Size:")
+        MaxRatio = Label("max_ratio", "Max. Ratio:")
+
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies
         super().__init__('Zlib', "Thomas Engel", ["zlib"], context)
+        self._init_config()
+
+    def _init_config(self):
+        self.config.add(Integer(
+            label=Plugin.Option.MaxOutputSize,
+            value=256,
+            description="the maximum size of the decompressed output in MiB (0 = unlimited)",
+            is_required=False
+        ), validator=integer_validator(self.config, Plugin.Option.MaxOutputSize))
+        self.config.add(Integer(
+            label=Plugin.Option.MaxRatio,
+            value=0,
+            description="the maximum ratio between decompressed and compressed size (0 = unlimited)",
+            is_required=False
+        ), validator=integer_validator(self.config, Plugin.Option.MaxRatio))
+
+    def _inflate(self) -> Inflate:
+        return Inflate(
+            max_output_size=int(self.config.value(Plugin.Option.MaxOutputSize)) * 1024 * 1024,
+            max_ratio=int(self.config.value(Plugin.Option.MaxRatio))
+        )
+
+    @property
+    def releases_gil(self) -> bool:
+        return True
 
     def run(self, input_text: str) -> str:
-        import zlib
-        return zlib.decompress(input_text.encode('utf-8', errors='surrogateescape'))\
+        return self._inflate().decompress(input_text.encode('utf-8', errors='surrogateescape'))\
             .decode('utf-8', errors='surrogateescape')
 
+    def run_stream(self, chunks):
+        # Compressed data is binary, hence multi-byte sequences may be split across chunks.
+        return decode_stream(self._inflate().decompress_stream(
+            chunk.encode('utf-8', errors='surrogateescape') for chunk in chunks))
+
     def can_decode_input(self, input_text: str) -> bool:
         if input_text:
             input_bytes = input_text.encode('utf-8', errors='surrogateescape')
             if len(input_bytes) > 2:
                 return (input_bytes[0] == 0x78) and (input_bytes[1] in (
                     0x01, # No Compression/Low
+                    0x5e, # Fast Compression
                     0x9c, # Default Compression
                     0xda  # Best Compression
                 ))
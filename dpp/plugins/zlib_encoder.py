@@ -14,7 +14,10 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+from dpp.core.compression import ParallelDeflate, Format, decode_stream
 from dpp.core.plugin import EncoderPlugin
+from dpp.core.plugin.config import Label, integer_validator
+from dpp.core.plugin.config.options import Integer, Slider
 
 
 class Plugin(EncoderPlugin):
@@ -32,10 +35,63 @@ class Plugin(EncoderPlugin):
                 [bytes]
         """
 
+    class Option(object):
+        Level = Label("level", "Level:")
+        WindowBits = Label("window_bits", "Window:")
+        BlockSize = Label("block_size", "Block Size:")
+        Workers = Label("workers", "Workers:")
+
     def __init__(self, context: 'dpp.core.context.Context'):
         # Name, Author, Dependencies
         super().__init__('Zlib', "Thomas Engel", ["zlib"], context)
+        self._init_config()
+
+    def _init_config(self):
+        self.config.add(Slider(
+            label=Plugin.Option.Level,
+            value=6,
+            description="the compression level (0 = no compression, 9 = best compression)",
+            is_required=False,
+            range=[0, 9]
+        ))
+        self.config.add(Slider(
+            label=Plugin.Option.WindowBits,
+            value=15,
+            description="the base two logarithm of the window size",
+            is_required=False,
+            range=[9, 15]
+        ))
+        self.config.add(Integer(
+            label=Plugin.Option.BlockSize,
+            value=128,
+            description="the size of the blocks in KiB which are compressed in parallel",
+            is_required=False
+        ), validator=integer_validator(self.config, Plugin.Option.BlockSize, 1))
+        self.config.add(Integer(
+            label=Plugin.Option.Workers,
+            value=0,
+            description="the number of threads used for compression (0 = number of cpus)",
+            is_required=False
+        ), validator=integer_validator(self.config, Plugin.Option.Workers, 0))
+
+    def _deflate(self) -> ParallelDeflate:
+        return ParallelDeflate(
+            Format.ZLIB,
+            level=int(self.config.value(Plugin.Option.Level)),
+            block_size=int(self.config.value(Plugin.Option.BlockSize)) * 1024,
+            window_bits=int(self.config.value(Plugin.Option.WindowBits)),
+            max_workers=int(self.config.value(Plugin.Option.Workers)) or None
+        )
+
+    @property
+    def releases_gil(self) -> bool:
+        return True
 
     def run(self, input_text: str) -> str:
-        import zlib
-        return zlib.compress(input_text.encode('utf-8', errors='surrogateescape')).decode('utf-8', errors='surrogateescape')
+        return self._deflate().compress(input_text.encode('utf-8', errors='surrogateescape'))\
+            .decode('utf-8', errors='surrogateescape')
+
+    def run_stream(self, chunks):
+        # Compressed data is binary, hence multi-byte sequences may be split across chunks.
+        return decode_stream(self._deflate().compress_stream(
+            chunk.encode('utf-8', errors='surrogateescape') for chunk in chunks))
@@ -15,6 +15,7 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import io
 import logging
 import os
 import signal
@@ -23,14 +24,7 @@ import argparse
 from collections import namedtuple
 from typing import List
 
-# Load fuzzywuzzy while ignoring unnecessary warning about missing levenstein package.
-import warnings
-
-
-with warnings.catch_warnings():
-    warnings.simplefilter("ignore")
-    from fuzzywuzzy import process
-
+from qtpy.QtCore import QTimer
 from qtpy.QtWidgets import QApplication
 
 # FIX #27: Add 'dpp' to package path if not present. 
@@ -115,38 +109,19 @@ def init_builder(context: 'dpp.core.context.Context'):
 
                 print()
 
-            def natural_join(list):
-                """ Joins a list of strings (e.g. ["1", "2", "3"] => "1, 2 and 3"). """
-                if not list:
-                    return ""
-                elif len(list) == 1:
-                    return f"'{list[0]}'"
-                else:
-                    joined_list = "' and '".join(["', '".join(list[:-1]), list[-1]])
-                    return f"'{joined_list}'"
-
-            def update_plugin_config(config):
-                invalid_keys = [key for key in config.keys() if key not in plugin.config.keys()]
-                if invalid_keys:
-                    invalid_plugin_option = invalid_keys[0]
-                    suggestions = [result for result in
-                                   process.extract(invalid_plugin_option, plugin.config.keys())]
-                    suggestion = 'Did you mean "{}"?'.format(suggestions[0][0]) if suggestions else ""
-                    raise Exception("Invalid configuration option {}. {}".format(invalid_plugin_option, suggestion))
-                plugin.config.update(config)
-
             def _runner(self, **kwargs):
                 do_show_help = kwargs.pop('help', False)
 
-                update_plugin_config(kwargs)
+                from dpp.core import batch
+                batch.update_config(plugin, kwargs)
                 if do_show_help:
                     show_help()
                     return sys_exit(0)
 
-                unconfigured_plugin_options = plugin.is_unconfigured()
-                if unconfigured_plugin_options:
-                    context.logger.error("Can not run '{}'! Missing required option {}.".format(
-                        plugin.safe_name, natural_join(unconfigured_plugin_options)))
+                try:
+                    batch.check_configured(plugin)
+                except Exception as err:
+                    context.logger.error(str(err))
                     return sys_exit(1)
 
                 self._input_text = plugin.run(self._input_text)
@@ -217,41 +192,152 @@ def get_input_text(context, args):
         return args.input
 
 
+def warm_up_plugins(context):
+    """ Lets plugins prepare expensive resources (e.g. models) in the background. """
+    for plugin in context.plugins().plugins():
+        try:
+            plugin.warm_up()
+        except Exception as err:
+            context.logger.debug(f'Warming up {plugin.safe_name} failed! {err}', exc_info=True)
+
+
+def identify_batch(context, paths, per_line=False, engine='magika'):
+    """
+    Identifies the file types of the files (or the files within the directories) using either a shared Magika session
+    or the shared pool of libmagic handles. When per_line is set each line of the files is identified instead.
+    """
+    import itertools
+    from dpp.core import identify
+    identifier = identify.magic_pool() if engine == 'filemagic' else identify.magika_session()
+    if per_line:
+        records = identify.iter_records(paths)
+        while True:
+            batch = list(itertools.islice(records, identify.BATCH_SIZE))
+            if not batch:
+                return
+            for (name, _), label in zip(batch, identifier.identify_batch([data for _, data in batch])):
+                print(f'{name}\t{label}')
+    files = identify.iter_files(paths)
+    while True:
+        batch = list(itertools.islice(files, identify.BATCH_SIZE))
+        if not batch:
+            return
+        for path, label in zip(batch, identifier.identify_paths(batch)):
+            print(f'{path}\t{label}')
+
+
+def build_index(context, wordlist, algorithms):
+    """ Builds the digest indexes of the wordlist, which are used by the reverse hash lookup. """
+    from dpp.core import digest_index
+    for algorithm in algorithms:
+        try:
+            print(digest_index.build_index(wordlist, algorithm))
+        except Exception as err:
+            context.logger.error(f'Building {algorithm} index of {wordlist} failed! {err}')
+            sys.exit(1)
+
+
+def generate_payloads(context, args):
+    """ Streams the payloads generated by the Generate Payloads script to stdout or to the output file. """
+    from dpp.core.plugin import PluginType
+    plugin = context.plugins().plugin('Generate Payloads', PluginType.SCRIPT)
+    plugin.config.update(get_plugin_config(context, args.generate_payloads))
+    for key in plugin.config.keys():
+        error = plugin.config.validate(plugin.config.option(key), '')
+        if error:
+            context.logger.error(f"Can not run '{plugin.safe_name}'! {error}")
+            sys.exit(1)
+    if args.file:
+        payloads = open(args.file, 'r', errors='surrogateescape')
+    else:
+        payloads = io.StringIO(args.input or '')
+    output = open(args.output, 'w', errors='surrogateescape') if args.output else sys.stdout
+    try:
+        with payloads:
+            for line in plugin.run_lines(line.rstrip('\r\n') for line in payloads):
+                output.write(line + '\n')
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+def get_actions(context, args):
+    """ :returns the actions specified by the ordered arguments (e.g. -d base64 -s search_and_replace ...). """
+    from dpp.core import batch
+    actions = []
+    for name, values in args.ordered_args:
+        try:
+            actions.append(batch.action(name, values))
+        except ValueError as err:
+            context.logger.error(str(err))
+            sys.exit(1)
+    return actions
+
+
+def follow(context, args):
+    """ Transforms the data which is appended to the file (or written to stdin) as soon as it arrives. """
+    from dpp.core import batch
+    from dpp.core.follow import Follower, process
+    # Plugins are configured once and reused for all appended data.
+    plugins = batch.resolve(context, get_actions(context, args))
+
+    def _write(data: bytes):
+        sys.stdout.buffer.write(data)
+        sys.stdout.buffer.flush()
+
+    def _on_error(data: bytes, err: Exception):
+        context.logger.error(f'Transforming {data[:64]!r} failed! {err}')
+
+    process(Follower(args.file), lambda data: batch.transform(plugins, data), _write,
+            per_line=args.per_line, on_error=_on_error)
+
+
+def run_batch(context, args):
+    """ Applies the actions to each file matching the glob pattern (or listed on stdin) and writes the outputs. """
+    from dpp.core import batch
+    if args.file == '-':
+        paths = [line.strip() for line in sys.stdin if line.strip()]
+        base = batch.common_base(paths)
+    else:
+        base, paths = batch.expand(args.file)
+    if not paths:
+        context.logger.error("No files found!")
+        sys.exit(1)
+
+    actions = get_actions(context, args)
+    jobs = [(path, batch.output_path(path, base, args.out_dir)) for path in paths]
+    summary = batch.Summary()
+    for result in batch.run(context, actions, jobs):
+        summary.add(result)
+        if result.error is not None:
+            context.logger.debug(f'{result.path}: {result.error}')
+    for result in summary.failures:
+        context.logger.error(f'Failed processing {result.path}! {result.error}')
+    context.logger.info(str(summary))
+    sys.exit(1 if summary.failures else 0)
+
+
 def get_action_type(context, builder, name):
     return getattr(builder, name)
 
 
 def get_plugin_action(context, action_type_name, action_type_method, method_name):
+    from dpp.core import batch
     try:
-        return getattr(action_type_method(), method_name)
-    except Exception as e:
-        plugin_names = [name[:name.rindex('_')] for name in context.plugins().safe_names()]
-        suggestions = [result for result in process.extract(method_name, plugin_names)]
-        suggestion = 'Did you mean "{}"?'.format(suggestions[0][0]) if suggestions else ""
-        context.logger.error(
-            'No {type} named "{name}". {suggestion}'.format(
-                type=action_type_name, name=method_name, suggestion=suggestion))
+        batch.find_plugin(context, batch.TYPES[action_type_name], method_name)
+    except Exception as err:
+        context.logger.error(str(err))
         sys.exit(1)
+    return getattr(action_type_method(), method_name)
 
 
 def get_plugin_config(context, arguments):
-    result = {}
-    for argument in arguments:
-        sep_index = argument.find('=')
-        if sep_index < 1:
-            context.logger.error('Invalid argument specification! Expected key=value, got {}'.format(argument))
-            sys.exit(1)
-
-        # Parse key=value into name and value
-        name = argument[:sep_index]
-        value = argument[sep_index+1:]
-
-        # Handle boolean values
-        if value == "True" or value == "False":
-            value = value == "True"
-
-        result[name] = value
-    return result
+    from dpp.core import batch
+    try:
+        return batch.parse_config(arguments)
+    except ValueError as err:
+        context.logger.error(str(err))
+        sys.exit(1)
 
 
 def main():
@@ -279,7 +365,8 @@ def main():
         parser.add_argument('input', nargs='?',
                             help="specifies the input-text")
         parser.add_argument('-f', '--file', action=SingleArgs,
-                            help="specifies the input-file")
+                            help="specifies the input-file (or a glob pattern/- for a file list on stdin when using "
+                                 "--out-dir).")
         parser.add_argument('--new-instance', action='store_true',
                             help="opens new instance instead of new tab in already running instance.")
         parser.add_argument('--dialog', action='store_true',
@@ -294,6 +381,32 @@ def main():
                             help="transforms the input using the specified hash-functions")
         parser.add_argument('-s', '--script', nargs='+', action=OrderedMultiArgs, metavar="OPTION=VALUE",
                             help="transforms the input using the specified script (optional arguments)")
+        parser.add_argument('--identify-batch', nargs='+', metavar="PATH",
+                            help="identifies the file types of the specified files or directories.")
+        parser.add_argument('--identify-with', choices=['magika', 'filemagic'], default='magika',
+                            help="the library which identifies the file types when using --identify-batch "
+                                 "(default: magika).")
+        parser.add_argument('--build-index', nargs='+', metavar=("WORDLIST", "ALGORITHM"),
+                            help="builds digest indexes of a wordlist for reverse hash lookups (e.g. md5 sha1 nt lm)")
+        parser.add_argument('--generate-payloads', nargs='*', metavar="OPTION=VALUE",
+                            help="encodes each payload of the input by each chain of encoders "
+                                 "(see -s generate_payloads help).")
+        parser.add_argument('-o', '--output', metavar="FILE",
+                            help="writes the generated payloads to a file instead of stdout.")
+        parser.add_argument('--out-dir', metavar="DIR",
+                            help="processes all files specified by --file in parallel and writes the outputs to DIR.")
+        parser.add_argument('--follow', action='store_true',
+                            help="transforms the data appended to the file specified by --file (or - for stdin) "
+                                 "as soon as it arrives.")
+        parser.add_argument('--per-line', action='store_true',
+                            help="transforms (or identifies) each line individually when using --follow "
+                                 "(or --identify-batch).")
+        parser.add_argument('--serve', action='store_true',
+                            help="starts a daemon which keeps the plugins loaded for subsequent command line calls.")
+        parser.add_argument('--client', action='store_true',
+                            help="forwards the command line call to the daemon (used by default when it is running).")
+        parser.add_argument('--jsonl', action='store_true',
+                            help="processes requests read from stdin as JSON Lines and writes the responses to stdout.")
         parser.add_argument('--debug', action='store_true',
                             help="activates debug mode with additional logging.")
         parser.add_argument('--trace', action='store_true',
@@ -309,13 +422,17 @@ def main():
             args.input = scripts.pop(-1).pop(-1)
 
         # Start GUI when no other parameters were used.
-        if not args.encode and not args.decode and not args.script and not args.hash and not type(args.list_codecs) == list:
+        if not args.encode and not args.decode and not args.script and not args.hash and not args.identify_batch \
+                and not args.build_index and args.generate_payloads is None and not args.serve and not args.jsonl \
+                and not type(args.list_codecs) == list:
             # Setup excepthook to handle uncaught exceptions.
             setup_excepthook(context.logger)
             # Update application mode
             context.setMode(Context.Mode.GUI_MODERN)
             try:
                 app = QApplication(sys.argv)
+                # Warm up plugins as soon as the event loop is idle.
+                QTimer.singleShot(0, lambda: warm_up_plugins(context))
                 instance_handler = InstanceHandler(app, context.getAppID())
                 input_text = get_input_text(context, args)
                 if args.dialog:
@@ -364,10 +481,62 @@ def main():
             print()
             sys.exit(0)
 
+        if args.jsonl:
+            context.setMode(Context.Mode.COMMAND_LINE)
+            from dpp.core import jsonl
+            jsonl.serve(context, sys.stdin, sys.stdout)
+            sys.exit(0)
+
+        if args.serve:
+            context.setMode(Context.Mode.COMMAND_LINE)
+            from dpp.core.daemon import Daemon
+            daemon = Daemon(context)
+            # Remove the socket when being terminated.
+            signal.signal(signal.SIGINT, lambda signum, frame: daemon.shutdown())
+            signal.signal(signal.SIGTERM, lambda signum, frame: daemon.shutdown())
+            daemon.serve_forever()
+            sys.exit(0)
+
+        if args.identify_batch:
+            context.setMode(Context.Mode.COMMAND_LINE)
+            identify_batch(context, args.identify_batch, per_line=args.per_line, engine=args.identify_with)
+            sys.exit(0)
+
+        if args.build_index:
+            context.setMode(Context.Mode.COMMAND_LINE)
+            if len(args.build_index) < 2:
+                context.logger.error("Argument --build-index requires a wordlist and at least one algorithm.")
+                sys.exit(1)
+            build_index(context, args.build_index[0], args.build_index[1:])
+            sys.exit(0)
+
+        if args.generate_payloads is not None:
+            context.setMode(Context.Mode.COMMAND_LINE)
+            if not args.file and not args.input:
+                context.logger.error("No input specified!")
+                sys.exit(1)
+            generate_payloads(context, args)
+            sys.exit(0)
+
         if not args.encode and not args.decode and not args.script and not args.hash:
             context.logger.error("No action specified!")
             sys.exit(1)
 
+        if args.follow:
+            context.setMode(Context.Mode.COMMAND_LINE)
+            if not args.file:
+                context.logger.error("Argument --follow requires --file.")
+                sys.exit(1)
+            follow(context, args)
+            sys.exit(0)
+
+        if args.out_dir:
+            context.setMode(Context.Mode.COMMAND_LINE)
+            if not args.file:
+                context.logger.error("Argument --out-dir requires --file.")
+                sys.exit(1)
+            run_batch(context, args)
+
         if not args.file and not args.input:
             context.logger.error("No input specified!")
             sys.exit(1)
@@ -65,6 +65,7 @@ setup(
             'jsonpath_ng>=1.5.0',
             'PyJWT>=2.8.0',
             'magika>=0.5.0',
+            'numpy>=1.21.0',
             'passlib>=1.7.0',
             'pycryptodome>=3.15.0',
             'validators>=0.20.0'
@@ -80,7 +81,8 @@ setup(
     include_package_data=True,
     entry_points={
         'console_scripts': [
-            'dpp=dpp.runner:main',
+            'dpp=dpp.__main__:main',
+            'dpp-client=dpp.client:main',
         ]
     },
 )
@@ -0,0 +1,94 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from dpp.core import batch
+from dpp.core.aio import AsyncRunner, Chain
+from dpp.core.plugin import PluginType
+from tests.utils import context
+
+
+class TestAsyncRunner(unittest.TestCase):
+
+    def _run(self, coroutine_function, **kwargs):
+        async def _main():
+            async with AsyncRunner(context, **kwargs) as runner:
+                return await coroutine_function(runner)
+        return asyncio.run(_main())
+
+    def testChain(self):
+        chain = Chain().decode().base64().script().search_and_replace(search_term='a', replace_term='o')
+        self.assertEqual(chain.actions, [
+            batch.Action(PluginType.DECODER, 'base64', {}),
+            batch.Action(PluginType.SCRIPT, 'search_and_replace', {'search_term': 'a', 'replace_term': 'o'})])
+
+    def testRun(self):
+        async def _main(runner):
+            return await asyncio.gather(
+                runner.run(Chain().decode().base64().hash().md5(), 'aGVsbG8='),
+                runner.run(Chain().script().search_and_replace(search_term='a', replace_term='o'), 'banana'),
+                runner.run([batch.Action(PluginType.ENCODER, 'hex_str', {})], b'\xff'))
+        for max_workers in (1, 2):
+            self.assertEqual(self._run(_main, max_workers=max_workers),
+                             ['5d41402abc4b2a76b9719d911017c592', 'bonono', b'ff'])
+
+    def testStream(self):
+        async def _inputs():
+            for number in range(20):
+                yield str(number)
+
+        async def _main(runner):
+            return [output async for output in runner.stream(Chain().encode().hex_str(), _inputs())]
+        self.assertEqual(self._run(_main, max_workers=2, max_concurrency=3),
+                         [str(number).encode().hex() for number in range(20)])
+
+    def testErrors(self):
+        async def _main(runner):
+            with self.assertRaisesRegex(Exception, 'Did you mean "base64"?'):
+                await runner.run(Chain().decode().bas64(), 'x')
+            with self.assertRaises(Exception):
+                await runner.run(Chain().decode().gzip(), 'x')
+        self._run(_main, max_workers=1)
+
+    def testTimeout(self):
+        plugin = next(plugin for plugin in context.plugins().filter(type=PluginType.HASHER)
+                      if plugin.method_name == 'md5')
+        started, finished = threading.Event(), threading.Event()
+        runs = []
+
+        def _run(self, text):
+            runs.append(text)
+            started.set()
+            time.sleep(0.2)
+            finished.set()
+            return text
+
+        async def _main(runner):
+            with self.assertRaises(asyncio.TimeoutError):
+                await runner.run(Chain().hash().md5().hash().md5(), 'a', timeout=0.05)
+            # The slot is released as soon as the first plugin finished, the second plugin is not run anymore.
+            self.assertTrue(started.is_set())
+            self.assertEqual(await runner.run(Chain().encode().hex_str(), 'a'), '61')
+            self.assertTrue(finished.is_set())
+            return runs
+
+        with mock.patch.object(type(plugin), 'run', _run):
+            self.assertEqual(self._run(_main, max_workers=1, max_concurrency=1), ['a'])
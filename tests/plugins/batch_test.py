@@ -0,0 +1,78 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import re
+import tempfile
+import unittest
+
+from dpp.core import batch
+from dpp.core.plugin import PluginType
+from tests.utils import context
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.directory.name, 'in')
+        self.out_dir = os.path.join(self.directory.name, 'out')
+        os.makedirs(os.path.join(self.input_dir, 'sub'))
+        for path, data in [('a.txt', b'abc'), ('sub/b.bin', b'\xff\x00'), ('sub/c.txt', b'')]:
+            with open(os.path.join(self.input_dir, path), 'wb') as f:
+                f.write(data)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _run(self, actions, max_workers):
+        base, paths = batch.expand(os.path.join(self.input_dir, '**', '*'))
+        self.assertEqual(base, self.input_dir)
+        jobs = [(path, batch.output_path(path, base, self.out_dir)) for path in paths]
+        return list(batch.run(context, actions, jobs, max_workers=max_workers))
+
+    def _read(self, path):
+        with open(os.path.join(self.out_dir, path), 'rb') as f:
+            return f.read()
+
+    def testRun(self):
+        for max_workers in [1, 2]:
+            results = self._run([batch.Action(PluginType.ENCODER, 'base64', {})], max_workers)
+            self.assertEqual([result.error for result in results], [None, None, None])
+            self.assertEqual(self._read('a.txt'), b'YWJj')
+            self.assertEqual(self._read(os.path.join('sub', 'b.bin')), b'/wA=')
+            self.assertEqual(self._read(os.path.join('sub', 'c.txt')), b'')
+
+    def testFailures(self):
+        summary = batch.Summary()
+        for result in self._run([batch.Action(PluginType.DECODER, 'gzip', {})], 1):
+            summary.add(result)
+        self.assertEqual(summary.files, 3)
+        self.assertEqual(summary.bytes, 5)
+        self.assertEqual([os.path.basename(result.path) for result in summary.failures], ['a.txt', 'b.bin'])
+        self.assertIn('3 file(s)', str(summary))
+
+    def testInvalidAction(self):
+        with self.assertRaises(Exception):
+            self._run([batch.Action(PluginType.ENCODER, 'unknown', {})], 1)
+        with self.assertRaisesRegex(Exception, re.escape('No decoder named "bas64". Did you mean "base64"?')):
+            batch.resolve(context, [batch.Action(PluginType.DECODER, 'bas64', {})])
+        with self.assertRaisesRegex(Exception, re.escape(
+                'Invalid configuration option serch_term. Did you mean "search_term"?')):
+            batch.resolve(context, [batch.Action(PluginType.SCRIPT, 'search_and_replace', {'serch_term': 'a'})])
+        with self.assertRaisesRegex(Exception, re.escape(
+                "Can not run 'search_and_replace_script'! Missing required option 'search_term' and 'replace_term'.")):
+            batch.resolve(context, [batch.Action(PluginType.SCRIPT, 'search_and_replace', {})])
@@ -28,3 +28,16 @@ class TestBinStrEncoder(unittest.TestCase):
         self.assertEqual(self.plugin.run(
             'abcd'
         ), '01100001 01100010 01100011 01100100')
+
+    def testLargeInput(self):
+        decoder = load_plugin("Bin (str)", PluginType.DECODER)
+        input_text = ''.join(chr(1 + i % 0x24f) for i in range(100000))
+        self.assertEqual(decoder.run(self.plugin.run(input_text)), input_text)
+
+    def testLeadingZeroBytes(self):
+        decoder = load_plugin("Bin (str)", PluginType.DECODER)
+        self.assertEqual(self.plugin.run('\0A'), '00000000 01000001')
+        self.assertEqual(decoder.run('00000000 01000001'), '\0A')
+        self.assertEqual(decoder.run('1000001'), 'A')
+        input_text = '\0\0' + ''.join(chr(1 + i % 0x24f) for i in range(100000))
+        self.assertEqual(decoder.run(self.plugin.run(input_text)), input_text)
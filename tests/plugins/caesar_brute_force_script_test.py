@@ -0,0 +1,37 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import unittest
+
+from dpp.core.plugin import PluginType
+from tests.utils import load_plugin
+
+
+class TestCaesarBruteForceScript(unittest.TestCase):
+
+    plugin = load_plugin("Caesar Brute Force", PluginType.SCRIPT)
+
+    def testPlugin(self):
+        lines = self.plugin.run('Uryyb Jbeyq,\nguvf vf n frperg zrffntr.').splitlines()
+        self.assertEqual(len(lines), 26)
+        shift, score, text = lines[0].split('\t')
+        self.assertEqual(shift, '13')
+        self.assertEqual(text, 'Hello World, this is a secret message.')
+
+    def testLogLikelihood(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({"scoring": "log-likelihood", "preview": 5})
+        self.assertEqual(plugin.run('Uryyb Jbeyq, guvf vf n frperg zrffntr.').splitlines()[0].split('\t')[2], 'Hello')
@@ -24,6 +24,12 @@ class TestCaesarCipherScript(unittest.TestCase):
 
     plugin = load_plugin("Caesar Cipher", PluginType.SCRIPT)
 
-    @unittest.skip("Missing configuration")
     def testPlugin(self):
-        ...
\ No newline at end of file
+        plugin = self.plugin.clone()
+        plugin.config.update({"shift": 3})
+        self.assertEqual(plugin.run('Hello World, xyz!'), 'Khoor Zruog, abc!')
+
+    def testCalculateOffset(self):
+        cipher = 'Uryyb Jbeyq, guvf vf n frperg zrffntr.'
+        self.assertEqual(self.plugin._codec.calculate_offset(cipher), 13)
+        self.assertEqual(self.plugin._codec.calculate_offset(cipher * 100000), 13)
\ No newline at end of file
@@ -14,8 +14,11 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import unittest
+import zlib
 
+from dpp.core.checksum import CRC32
 from dpp.core.plugin import PluginType
 from tests.utils import load_plugin
 
@@ -30,3 +33,21 @@ class TestCRC32Hasher(unittest.TestCase):
             '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
             '0123456789'
         ), '0x4d9dcc47')
+
+    def testRunStream(self):
+        self.assertEqual(next(self.plugin.run_stream([
+            'abcdefghijklmnopqrstuvwxyz\n',
+            '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n',
+            '0123456789'
+        ])), self.plugin.run(
+            'abcdefghijklmnopqrstuvwxyz\n'
+            '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
+            '0123456789'
+        ))
+
+    def testParallel(self):
+        data = os.urandom(100003)
+        checksum = CRC32(block_size=1000, max_workers=4)
+        checksum.update(data[:17])
+        checksum.update(data[17:])
+        self.assertEqual(checksum.value, zlib.crc32(data))
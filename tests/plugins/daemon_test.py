@@ -0,0 +1,82 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
+import threading
+import unittest
+
+import dpp.client as client
+from dpp.core.daemon import Daemon
+from tests.utils import context
+
+
+class TestDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'dpp.sock')
+        self.daemon = Daemon(context, self.path, max_workers=2)
+        self.thread = threading.Thread(target=self.daemon.serve_forever, daemon=True)
+        self.thread.start()
+        while not os.path.exists(self.path):
+            self.thread.join(0.01)
+
+    def tearDown(self):
+        self.daemon.shutdown()
+        self.thread.join(5)
+        self.directory.cleanup()
+
+    def testRequest(self):
+        self.assertEqual(client.request([('encode', ['base64'])], b'\xff\x00', path=self.path), b'/wA=')
+        self.assertEqual(client.request([('decode', ['base64']), ('script', [
+            'search_and_replace', 'search_term=a', 'replace_term=b'])], b'YWJj', path=self.path), b'bbc')
+        with self.assertRaisesRegex(Exception, 'No encoder named "unknown"'):
+            client.request([('encode', ['unknown'])], b'', path=self.path)
+        with self.assertRaises(ConnectionError):
+            client.request([('encode', ['base64'])], b'', path=self.path + '.missing')
+
+    def testVerifySocket(self):
+        client.verify_socket(self.path)
+        # A socket which is accessible by other users might have been created by them.
+        os.chmod(self.path, 0o666)
+        with self.assertRaisesRegex(ConnectionError, 'Refusing to use'):
+            client.request([('encode', ['base64'])], b'', path=self.path)
+        with self.assertRaises(PermissionError):
+            client.verify_socket(self.directory.name)
+
+    def testConcurrentRequests(self):
+        results = {}
+
+        def _request(number: int):
+            results[number] = client.request([('encode', ['hex_str'])], str(number).encode(), path=self.path)
+
+        threads = [threading.Thread(target=_request, args=(number,)) for number in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {number: str(number).encode().hex().encode() for number in range(20)})
+
+    def testParseArguments(self):
+        self.assertEqual(client.parse_arguments(['-d', 'base64', '--client', '-e', 'url', 'abc']),
+                         ([('decode', ['base64']), ('encode', ['url'])], 'abc', None))
+        self.assertEqual(client.parse_arguments(['-f', 'in.txt', '-s', 'search_and_replace', 'search_term=a']),
+                         ([('script', ['search_and_replace', 'search_term=a'])], None, 'in.txt'))
+        self.assertEqual(client.parse_arguments(['-s', 'search_and_replace', 'search_term=a', 'abc']),
+                         ([('script', ['search_and_replace', 'search_term=a'])], 'abc', None))
+        self.assertIsNone(client.parse_arguments(['--follow', '-f', 'app.log', '-d', 'base64']))
+        self.assertIsNone(client.parse_arguments(['abc']))
@@ -34,3 +34,8 @@ class TestDecStrDecoder(unittest.TestCase):
             '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
             '0123456789'
         )
+
+    def testLargeInput(self):
+        encoder = load_plugin("Dec (str)", PluginType.ENCODER)
+        for input_text in [''.join(chr(i % 256) for i in range(100000)), ''.join(chr(i % 0x3000) for i in range(100000))]:
+            self.assertEqual(self.plugin.run(encoder.run(input_text)), input_text)
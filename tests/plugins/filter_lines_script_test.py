@@ -14,8 +14,10 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import unittest
 
+from dpp.core.exceptions import CodecException, ValidationError
 from dpp.core.plugin import PluginType
 from tests.utils import load_plugin
 
@@ -24,10 +26,50 @@ class TestFilterLinesScript(unittest.TestCase):
 
     plugin = load_plugin("Filter Lines", PluginType.SCRIPT)
 
-    @unittest.skip("Missing configuration")
+    text = 'GET /index.html\nPOST /login\nget /admin\nPUT /upload'
+
+    def _run(self, text, **config):
+        plugin = self.plugin.clone()
+        plugin.config.update(config)
+        return plugin.run(text)
+
     def testPlugin(self):
-        self.assertEqual(self.plugin.run(
-            'abcdefghijklmnopqrstuvwxyz\n'
-            '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
-            '0123456789'
-        ), '0xc713178c')
+        self.assertEqual(self._run(self.text, filter_term='GET'), 'GET /index.html')
+        self.assertEqual(self._run(self.text, filter_term='GET', should_match_case=False),
+                         os.linesep.join(['GET /index.html', 'get /admin']))
+        self.assertEqual(self._run(self.text, filter_term='GET', should_match_case=False, should_invert_match=True),
+                         os.linesep.join(['POST /login', 'PUT /upload']))
+
+    def testRegex(self):
+        self.assertEqual(self._run(self.text, filter_term='P[A-Z]+', is_regex=True), os.linesep.join(['POST', 'PUT']))
+        self.assertEqual(self._run(self.text, filter_term='get', is_regex=True, should_match_case=False),
+                         os.linesep.join(['GET', 'get']))
+        self.assertEqual(self._run(self.text, filter_term='P[A-Z]+', is_regex=True, should_invert_match=True),
+                         os.linesep.join(['GET /index.html', 'get /admin']))
+
+    def testMultipleTerms(self):
+        self.assertEqual(self._run(self.text, filter_term='login,upload', terms='Any Of'),
+                         os.linesep.join(['POST /login', 'PUT /upload']))
+        self.assertEqual(self._run(self.text, filter_term='GET;.html', terms='All Of', term_separator=';'),
+                         'GET /index.html')
+        self.assertEqual(self._run(self.text, filter_term='GET|POST', terms='Any Of', term_separator='|', is_regex=True),
+                         os.linesep.join(['GET', 'POST']))
+
+    def testEmptyTermSeparator(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({'filter_term': 'GET', 'terms': 'Any Of', 'term_separator': ''})
+        with self.assertRaisesRegex(ValidationError, 'Term separator should not be empty.'):
+            plugin._validate_term_separator(self.text)
+        with self.assertRaises(CodecException):
+            plugin.run(self.text)
+        # The separator is not used when filtering by a single term.
+        plugin.config.update({'terms': 'Single Term'})
+        plugin._validate_term_separator(self.text)
+        self.assertEqual(plugin.run(self.text), 'GET /index.html')
+
+    def testRunStream(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({'filter_term': 'needle'})
+        text = ''.join(f'{i} needle\n' if i % 3 == 0 else f'{i} hay\r\n' for i in range(30000))
+        chunks = [text[i:i + 1000] for i in range(0, len(text), 1000)]
+        self.assertEqual(''.join(plugin.run_stream(chunks)), plugin.run(text))
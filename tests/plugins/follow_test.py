@@ -0,0 +1,69 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import base64
+import os
+import tempfile
+import unittest
+
+from dpp.core.follow import Follower, iter_line_batches, process
+
+
+class TestFollow(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'app.log')
+        self._append(b'old\n')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def _append(self, data: bytes, path: str = None):
+        with open(path or self.path, 'ab') as f:
+            f.write(data)
+
+    def testFollower(self):
+        chunks = iter(Follower(self.path, poll_interval=0.001))
+        self._append(b'a\n')
+        self.assertEqual(next(chunks), b'a\n')
+        # Rotation: the remaining data of the old file is read before switching to the new file.
+        self._append(b'b\n')
+        os.rename(self.path, self.path + '.1')
+        self._append(b'c\n')
+        self.assertEqual(next(chunks), b'b\n')
+        self.assertEqual(next(chunks), b'c\n')
+        # Truncation: the file is read from the start.
+        with open(self.path, 'wb'):
+            pass
+        self._append(b'd')
+        self.assertEqual(next(chunks), b'd')
+        chunks.close()
+
+    def testIterLineBatches(self):
+        self.assertEqual(list(iter_line_batches([b'a\r\nb', b'c\n', b'', b'd\ne\n', b'f'])),
+                         [[b'a'], [b'bc'], [b'd', b'e'], [b'f']])
+
+    def testProcess(self):
+        chunks = [base64.b64encode(b'a') + b'\n' + base64.b64encode(b'b')[:2], base64.b64encode(b'b')[2:] + b'\n!\n']
+        outputs, errors = [], []
+        process(chunks, lambda data: base64.b64decode(data, validate=True), outputs.append, per_line=True,
+                on_error=lambda data, err: errors.append(data))
+        self.assertEqual(outputs, [b'a\n', b'b\n'])
+        self.assertEqual(errors, [b'!'])
+        outputs = []
+        process([b'YQ==\nYg==\n'], lambda data: data.upper(), outputs.append)
+        self.assertEqual(outputs, [b'YQ==\nYG==\n'])
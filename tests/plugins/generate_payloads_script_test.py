@@ -0,0 +1,83 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import unittest
+
+from dpp.core.plugin import PluginType
+from tests.utils import load_plugin
+
+
+class TestGeneratePayloadsScript(unittest.TestCase):
+
+    plugin = load_plugin("Generate Payloads", PluginType.SCRIPT)
+
+    def testPlugin(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({'encoders': 'url,html', 'depth': 2, 'workers': 1})
+        self.assertEqual(plugin.run('<a b>'), '\n'.join([
+            '<a b>\thtml\t&lt;a b&gt;',
+            '<a b>\turl\t%3Ca%20b%3E',
+            '<a b>\thtml,html\t&amp;lt;a b&amp;gt;',
+            '<a b>\thtml,url\t%26lt%3Ba%20b%26gt%3B',
+            '<a b>\turl,url\t%253Ca%2520b%253E',
+        ]))
+
+    def testJsonLines(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({'encoders': 'base*', 'exclude': 'base64_url,base45', 'depth': 1, 'format': 'JSONL',
+                              'workers': 1})
+        results = [json.loads(line) for line in plugin.run('a\tb\n\na\tb').splitlines()]
+        self.assertEqual([result['chain'] for result in results], [['base16'], ['base32'], ['base64']])
+        self.assertEqual(results[2], {'payload': 'a\tb', 'chain': ['base64'], 'output': 'YQli'})
+
+    def testConfiguredEncoders(self):
+        from dpp.core import payloads
+        from tests.utils import context
+        gzip = context.plugins().plugin('Gzip', PluginType.ENCODER)
+        level = gzip.config.value('level')
+        gzip.config.update({'level': 1})
+        try:
+            # Worker processes use the encoders as configured within the parent.
+            expected = list(payloads.generate(context, ['a' * 1000], [('gzip',)], max_workers=1))
+            self.assertEqual(list(payloads.generate(context, ['a' * 1000], [('gzip',)], max_workers=2)), expected)
+            self.assertEqual(expected[0].output, gzip.run('a' * 1000))
+        finally:
+            gzip.config.update({'level': level})
+
+    def testEncoderChains(self):
+        from dpp.core import payloads
+        self.assertEqual(payloads.encoder_chains(['url', 'html', 'gzip'], 2, exclude=['gzip']), [
+            ('url',), ('html',), ('url', 'url'), ('url', 'html'), ('html', 'url'), ('html', 'html')])
+        self.assertEqual(payloads.format_result(payloads.Result('a\tb', ('url',), 'c\nd'), payloads.Format.TSV),
+                         'a\\tb\turl\tc\\nd')
+
+    def testValidation(self):
+        plugin = self.plugin.__class__(self.plugin._context)
+        plugin.config.update({'depth': 0, 'workers': -1})
+        self.assertEqual(plugin.config.validate(plugin.config.option(plugin.Option.Depth), ''), 'Depth should be at least 1.')
+        self.assertEqual(plugin.config.validate(plugin.config.option(plugin.Option.Workers), ''), 'Workers should not be negative.')
+
+    def testGUIMode(self):
+        from unittest import mock
+        from dpp.core import payloads
+        plugin = self.plugin.clone()
+        plugin.config.update({'encoders': 'url', 'depth': 1, 'workers': 0})
+        plugin._context = mock.Mock(wraps=plugin._context, **{'isGUIMode.return_value': True})
+        with mock.patch.object(payloads, 'generate', return_value=iter([])) as generate:
+            list(plugin.run_lines(['a']))
+        # Worker processes are not spawned from within the GUI.
+        self.assertEqual(generate.call_args.kwargs['max_workers'], 1)
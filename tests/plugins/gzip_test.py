@@ -14,8 +14,10 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import gzip
 import unittest
 
+from dpp.core.exceptions import CodecException
 from dpp.core.plugin import PluginType
 from tests.utils import load_plugin
 
@@ -34,3 +36,47 @@ class TestGZip(unittest.TestCase):
             ),
             output_text
         )
+
+    def testMultipleBlocks(self):
+        encoder = self.encoder.clone()
+        encoder.config.update({'block_size': '1', 'workers': '4', 'level': 1})
+        input_text = ''.join(chr(32 + i % 0x250) for i in range(10000))
+        input_bytes = input_text.encode('utf-8', errors='surrogateescape')
+        output_bytes = encoder.run(input_text).encode('utf-8', errors='surrogateescape')
+        self.assertEqual(gzip.decompress(output_bytes), input_bytes)
+        self.assertEqual(self.decoder.run(encoder.run(input_text)), input_text)
+
+    def testRunStream(self):
+        input_text = 'abcdefghijklmnopqrstuvwxyz\n'
+        self.assertEqual(''.join(self.encoder.run_stream(list(input_text))), self.encoder.run(input_text))
+
+    def testRunStreamSplitSequences(self):
+        input_text = 'äöü€' * 10000
+        compressed_text = self.encoder.run(input_text)
+        # Multi-byte sequences of the decompressed output are split across chunks.
+        chunks = [compressed_text[i:i + 7] for i in range(0, len(compressed_text), 7)]
+        self.assertEqual(''.join(self.decoder.run_stream(chunks)), input_text)
+        self.assertEqual(''.join(self.encoder.run_stream([input_text[:5], input_text[5:]])), compressed_text)
+
+    def testConcatenatedMembers(self):
+        input_bytes = gzip.compress(b'abc') + gzip.compress(b'def')
+        self.assertEqual(self.decoder.run(input_bytes.decode('utf-8', errors='surrogateescape')), 'abcdef')
+
+    def testMaxOutputSize(self):
+        decoder = self.decoder.clone()
+        decoder.config.update({'max_output_size': '1'})
+        input_text = gzip.compress(b'\0' * 2 * 1024 * 1024).decode('utf-8', errors='surrogateescape')
+        with self.assertRaises(CodecException):
+            decoder.run(input_text)
+        output_text = ''
+        with self.assertRaises(CodecException):
+            for chunk in decoder.run_stream([input_text]):
+                output_text += chunk
+        self.assertEqual(len(output_text), 1024 * 1024)
+
+    def testMaxRatio(self):
+        decoder = self.decoder.clone()
+        decoder.config.update({'max_ratio': '10'})
+        input_text = gzip.compress(b'\0' * 1024 * 1024).decode('utf-8', errors='surrogateescape')
+        with self.assertRaises(CodecException):
+            decoder.run(input_text)
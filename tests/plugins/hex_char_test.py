@@ -27,3 +27,13 @@ class TestHexCharDecoder(unittest.TestCase):
         self.assertEqual(self.plugin.run(
             '0x61 0x62 0x63 0x64 0x65 0x66 0x67 0x68 0x69 0x6a 0x6b'
         ), 'abcdefghijk')
+
+    def testMixedInput(self):
+        self.assertEqual(self.plugin.run('0x61 0x620x63 0xb0 x0x64'), 'abc\u00b0xd')
+
+
+class TestHexCharEncoder(unittest.TestCase):
+    plugin = load_plugin("Hex (char)", PluginType.ENCODER)
+
+    def testPlugin(self):
+        self.assertEqual(self.plugin.run('ab\u00b0\u20ac'), '0x61 0x62 0xb0 0x20ac')
@@ -14,6 +14,7 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import unittest
 
 from dpp.core.plugin import PluginType
@@ -34,3 +35,7 @@ class TestHexInt(unittest.TestCase):
         self.assertEqual(self.decoder.run(
             '0x75bcd15'
         ), '123456789')
+
+    def testMultipleLines(self):
+        self.assertEqual(self.decoder.run(self.encoder.run('1  2 3\n\n123456789012345678901234567890')),
+                         os.linesep.join(['1 2 3', '', '123456789012345678901234567890']))
@@ -23,7 +23,6 @@ from tests.utils import load_plugin
 class TestHexShellDecoder(unittest.TestCase):
     plugin = load_plugin("Hex (shell)", PluginType.DECODER)
 
-    @unittest.skip("Test fails due to unknown reason")
     def testPlugin(self):
         self.assertEqual(self.plugin.run(
             '\\x61\\x62\\x63\\x64\\x65\\x66\\x67\\x68\\x69\\x6a\\x6b\\x6c\\x6d\\x6e'
@@ -37,3 +36,22 @@ class TestHexShellDecoder(unittest.TestCase):
             '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
             '0123456789'
         )
+
+    def testMixedInput(self):
+        self.assertEqual(self.plugin.run('a\\x62 \\XC3\\xa4 \\xZZ'), 'ab \u00e4 \\xZZ')
+
+    def testInvalidUtf8(self):
+        self.assertEqual(self.plugin.run('\\xff'), '\udcff')
+
+
+class TestHexShellEncoder(unittest.TestCase):
+    plugin = load_plugin("Hex (shell)", PluginType.ENCODER)
+
+    def testPlugin(self):
+        self.assertEqual(self.plugin.run('a\u00b0'), '\\x61\\xc2\\xb0')
+        self.assertEqual(self.plugin.run(''), '')
+
+    def testRoundTrip(self):
+        decoder = load_plugin("Hex (shell)", PluginType.DECODER)
+        text = 'abc\n\u00e4\u20ac\udcff' * 1000
+        self.assertEqual(decoder.run(self.plugin.run(text)), text)
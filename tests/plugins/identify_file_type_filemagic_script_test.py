@@ -24,6 +24,41 @@ class TestIdentifyFileTypeScript(unittest.TestCase):
 
     plugin = load_plugin("Identify File Type (filemagic)", PluginType.IDENTIFY)
 
-    @unittest.skip("Missing configuration")
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
     def testPlugin(self):
-        ...
+        self.assertEqual(self.plugin.run('Hello, world!'), 'ASCII text, with no line terminators')
+        gzip = b'\x1f\x8b\x08\x00\x00\x00\x00\x00\x00\x03' + bytes(range(256))
+        self.assertTrue(self.plugin.run(gzip.decode('utf-8', errors='surrogateescape')).startswith('gzip'))
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testIdentifyBatch(self):
+        from dpp.core import identify
+        pool = identify.MagicPool(window_size=64, size=4)
+        items = [b'Hello, world!', b'\x1f\x8b\x08\x00' + bytes(64), b'%PDF-1.4\n' + b'a' * 1000] * 10
+        try:
+            expected = [pool.identify(item) for item in items]
+            for _ in range(5):
+                self.assertEqual(pool.identify_batch(items, max_workers=4), expected)
+            # Handles are reused across calls instead of being opened by each new thread.
+            self.assertLessEqual(len(pool._handles), 4)
+        finally:
+            pool.close()
+        self.assertEqual(len(pool._handles), 0)
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testIdentifyPaths(self):
+        import os
+        import tempfile
+        from dpp.core import identify
+        pool = identify.MagicPool(size=2)
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for i, content in enumerate([b'Hello, world!', b'%PDF-1.4\n'] * 3):
+                paths.append(os.path.join(directory, str(i)))
+                with open(paths[-1], 'wb') as f:
+                    f.write(content)
+            try:
+                self.assertEqual(pool.identify_paths(paths), [pool.identify(b'Hello, world!'),
+                                                              pool.identify(b'%PDF-1.4\n')] * 3)
+            finally:
+                pool.close()
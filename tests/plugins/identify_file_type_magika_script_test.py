@@ -14,6 +14,8 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
 import unittest
 
 from dpp.core.plugin import PluginType
@@ -24,6 +26,39 @@ class TestIdentifyFileTypeMagikaScript(unittest.TestCase):
 
     plugin = load_plugin("Identify File Type (magika)", PluginType.IDENTIFY)
 
-    @unittest.skip("Missing configuration")
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
     def testPlugin(self):
-        ...
+        self.assertEqual(self.plugin.run(''), 'empty')
+        # Binary content must not be altered by encoding it as UTF-8.
+        png = b'\x89PNG\r\n\x1a\n' + bytes(range(256)) * 8
+        self.assertEqual(self.plugin.run(png.decode('utf-8', errors='surrogateescape')), 'png')
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testIdentifyPaths(self):
+        from dpp.core import identify
+        session = identify.magika_session()
+        session.warm_up().join()
+        items = [b'', b'{"a": 1}' * 100, b'']
+        with tempfile.TemporaryDirectory() as directory:
+            paths = []
+            for index, item in enumerate(items):
+                paths.append(os.path.join(directory, str(index)))
+                with open(paths[-1], 'wb') as file:
+                    file.write(item)
+            self.assertEqual(session.identify_paths(paths), [session.identify(item) for item in items])
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testIdentifyBatch(self):
+        from dpp.core import identify
+        session = identify.magika_session()
+        items = [b'', b'{"a": 1}' * 100, b'']
+        self.assertEqual(session.identify_batch(items), [session.identify(item) for item in items])
+
+    def testIterRecords(self):
+        from dpp.core import identify
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'records.txt')
+            with open(path, 'wb') as file:
+                file.write(b'{"a": 1}\r\n\n\xff\xd8\xff\n')
+            self.assertEqual(list(identify.iter_records([directory])),
+                             [(f'{path}:1', b'{"a": 1}'), (f'{path}:3', b'\xff\xd8\xff')])
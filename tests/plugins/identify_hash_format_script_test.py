@@ -24,9 +24,51 @@ class TestIdentifyHashFormatScript(unittest.TestCase):
 
     plugin = load_plugin("Identify Hash Format", PluginType.IDENTIFY)
 
-    @unittest.skip("Missing valid input/output")
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
     def testPlugin(self):
-        #self.assertEqual(self.plugin.run(
-        #    '0xc713178c'
-        #), '0xc713178c')
-        ...
+        names = self.plugin.run('5d41402abc4b2a76b9719d911017c592').splitlines()
+        self.assertIn('MD5', names)
+        self.assertIn('NTLM', names)
+        self.assertEqual(names, sorted(names))
+        self.assertEqual(self.plugin.run('$2a$10$N9qo8uLOickgx2ZMRZoMyeIjZAgcfl7p92ldGxad68LJZdL17lhWy'),
+                         'Blowfish(OpenBSD)\nWoltlab Burning Board 4.x\nbcrypt')
+        self.assertEqual(self.plugin.run('not a hash!'), '')
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testSummary(self):
+        md5 = '5d41402abc4b2a76b9719d911017c592'
+        sha1 = 'aaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d'
+        output = self.plugin.run('\n'.join([md5, md5, sha1, 'not a hash!', '']))
+        rows = dict(row.split('\t') for row in output.splitlines())
+        self.assertEqual(rows['MD5'], '2')
+        self.assertEqual(rows['SHA-1'], '1')
+        self.assertEqual(rows['Unknown'], '1')
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testHashIdentifier(self):
+        import hashid
+        from dpp.core.hash_format import HashIdentifier
+        identifier = HashIdentifier()
+        for text in ['', '0xc713178c', '{SSHA}abcdefghijklmnopqrstuvwxyz', '$1$abcdefgh$abcdefghijklmnopqrstuv',
+                     '$P$984478476IagS59wHZvyQMArzfx58u.', 'admin:5d41402abc4b2a76b9719d911017c592', '*' + 'A' * 40]:
+            self.assertEqual(identifier.names(text), sorted(mode.name for mode in hashid.HashID().identifyHash(text)))
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testGUIMode(self):
+        from unittest import mock
+        from dpp.core import hash_format
+        plugin = self.plugin.clone()
+        plugin._context = mock.Mock(**{'isGUIMode.return_value': True})
+        with mock.patch.object(hash_format.HashIdentifier, 'summarize', autospec=True,
+                               return_value={}) as summarize:
+            plugin.run('5d41402abc4b2a76b9719d911017c592\naaf4c61ddcc5e8a2dabede0f3b482cd9aea9434d')
+        self.assertEqual(summarize.call_args.kwargs['max_workers'], 1)
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testSummarizeParallel(self):
+        from unittest import mock
+        from dpp.core import hash_format
+        lines = ['%032x' % i for i in range(100)] + ['not a hash!'] * 3
+        expected = hash_format.hash_identifier().summarize(lines)
+        with mock.patch.object(hash_format, 'BATCH_SIZE', 10):
+            self.assertEqual(hash_format.hash_identifier().summarize(lines, max_workers=2), expected)
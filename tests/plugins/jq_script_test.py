@@ -14,6 +14,7 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import unittest
 
 from dpp.core.plugin import PluginType
@@ -24,11 +25,10 @@ class TestJQScript(unittest.TestCase):
 
     plugin = load_plugin("JQ", PluginType.SCRIPT)
 
-    @unittest.skip("Missing configuration")
+    @unittest.skipIf(plugin.check_dependencies(), "pyjq is not installed")
     def testPlugin(self):
-        self.plugin.setup(
-            {"expression": ".a[].b"}
-        )
-        self.assertEqual(self.plugin.run(
+        plugin = self.plugin.clone()
+        plugin.config.update({"expression": ".a[].b"})
+        self.assertEqual(plugin.run(
             '{"a": [{"b": "c"}, {"b": "d"}]}'
-        ), '"a"\n"d"')
+        ), os.linesep.join(['"c"', '"d"']))
@@ -14,6 +14,8 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
 import unittest
 
 from dpp.core.plugin import PluginType
@@ -24,6 +26,51 @@ class TestJsonifyScript(unittest.TestCase):
 
     plugin = load_plugin("Jsonify", PluginType.SCRIPT)
 
-    @unittest.skip("Missing configuration")
+    def _plugin(self, **config):
+        plugin = self.plugin.clone()
+        plugin.config.update(config)
+        return plugin
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
     def testPlugin(self):
-        ...
\ No newline at end of file
+        self.assertEqual(self._plugin(format='csv').run('a,b\n1,2'), '[{"a": "1", "b": "2"}]')
+        self.assertEqual(self._plugin(format='csv', pretty=True).run('a,b\n1,2'),
+                         json.dumps([{"a": "1", "b": "2"}], indent=4))
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testStreamingParser(self):
+        plugin = self._plugin(format='csv-s')
+        text = 'a,b\n' + ''.join(f'{i},{i * 2}\n' for i in range(1000))
+        expected = os.linesep.join(json.dumps({"a": str(i), "b": str(i * 2)}) for i in range(1000))
+        self.assertEqual(plugin.run(text), expected)
+        chunks = [text[i:i + 7] for i in range(0, len(text), 7)]
+        self.assertEqual(''.join(plugin.run_stream(chunks)), expected)
+        # Records are returned before the whole input was consumed.
+        self.assertEqual(next(iter(plugin.run_stream(iter(['a,b\n1,2\n', '3,4\n'])))), '{"a": "1", "b": "2"}')
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testAutoDetect(self):
+        plugin = self.plugin.clone()
+        detect = lambda text: plugin._codec.auto_detect_format(plugin.config, text)
+        self.assertEqual(detect('a,b,c\n' + ''.join(f'{i},{i * 2},x\n' for i in range(10000))), 'csv')
+        self.assertEqual(detect('Filesystem      Size  Used Avail Use% Mounted on\n'
+                                '/dev/sda1        99G   50G   49G  51% /\n'), 'df')
+        self.assertEqual(detect('<a><b>x</b></a>'), 'xml')
+        self.assertEqual(detect('user@example.com'), 'email-address')
+        self.assertEqual(detect('root:x:0:0:root:/root:/bin/bash\nbin:x:1:1:bin:/bin:/sbin/nologin\n'), 'passwd')
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testDetectFormat(self):
+        from dpp.core import jsonify
+        large_text = 'a,b\n' + ''.join(f'{i},{i * 2}\n' for i in range(2000))
+        self.assertGreater(len(large_text), jsonify.MIN_PARALLEL_SAMPLE_SIZE)
+        for max_workers in (1, 2):
+            jsonify._cache.clear()
+            # Large samples are parsed by the shared process pool when more than one worker is allowed.
+            self.assertEqual(jsonify.detect_format(['kv', 'xml', 'csv'], large_text, max_workers=max_workers), 'csv')
+        text = 'a,b\n1,2\n'
+        self.assertEqual(jsonify.detect_format(['kv', 'xml', 'csv'], text, max_workers=2), 'csv')
+        # Detected formats are cached per input digest.
+        self.assertEqual(jsonify.detect_format(['kv', 'xml', 'csv'], text, pre_check=lambda *args: False), 'csv')
+        self.assertIsNone(jsonify.detect_format(['csv'], text, pre_check=lambda *args: False))
+        self.assertEqual(jsonify.head_sample('ab\ncd\nef', 7), 'ab\ncd')
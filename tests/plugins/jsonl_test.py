@@ -0,0 +1,65 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import io
+import json
+import unittest
+
+from dpp.core import jsonl
+from tests.utils import context
+
+
+class TestJsonLines(unittest.TestCase):
+
+    def setUp(self):
+        self.processor = jsonl.Processor(context)
+
+    def _process(self, request) -> dict:
+        return self.processor.process(json.dumps(request))
+
+    def testProcess(self):
+        self.assertEqual(self._process({'id': 1, 'input': 'aGVsbG8=',
+                                        'chain': [['decode', 'base64'], ['hash', 'md5']]}),
+                         {'id': 1, 'output': '5d41402abc4b2a76b9719d911017c592', 'output_encoding': 'utf8'})
+        self.assertEqual(self._process({'id': 'a', 'input': '/wA=', 'input_encoding': 'base64',
+                                        'chain': [['encode', 'base64']]}),
+                         {'id': 'a', 'output': 'L3dBPQ==', 'output_encoding': 'base64'})
+        self.assertEqual(self._process({'id': 2, 'input': 'banana', 'chain': [
+            ['script', 'search_and_replace', {'search_term': 'a', 'replace_term': 'o', 'is_regex': False}]]})['output'],
+            'bonono')
+        self.assertEqual(self._process({'id': 3, 'input': 'banana', 'chain': [
+            ['script', 'search_and_replace', 'search_term=n', 'replace_term=m']]})['output'], 'bamama')
+
+    def testErrors(self):
+        self.assertEqual(self.processor.process('{'), {'id': None, 'error': self.processor.process('{')['error']})
+        self.assertIn('Did you mean "base64"?', self._process({'id': 1, 'input': '', 'chain': [
+            ['decode', 'bas64']]})['error'])
+        self.assertIn('Did you mean "search_term"?', self._process({'id': 2, 'input': '', 'chain': [
+            ['script', 'search_and_replace', 'serch_term=a']]})['error'])
+        self.assertIn('Invalid action', self._process({'id': 3, 'input': '', 'chain': [['run', 'base64']]})['error'])
+        self.assertIn('Invalid chain', self._process({'id': 4, 'input': ''})['error'])
+        self.assertIn('Invalid base64', self._process({'id': 5, 'input': '!', 'input_encoding': 'base64',
+                                                       'chain': [['encode', 'url']]})['error'])
+        self.assertIn('error', self._process({'id': 6, 'input': 'x', 'chain': [['decode', 'gzip']]}))
+
+    def testServe(self):
+        requests = '\n'.join(json.dumps({'id': number, 'input': str(number), 'chain': [['encode', 'hex_str']]})
+                             for number in range(50)) + '\n\n'
+        output = io.StringIO()
+        jsonl.serve(context, io.StringIO(requests), output, max_workers=4)
+        responses = {response['id']: response['output']
+                     for response in map(json.loads, output.getvalue().splitlines())}
+        self.assertEqual(responses, {number: str(number).encode().hex() for number in range(50)})
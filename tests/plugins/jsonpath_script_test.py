@@ -14,8 +14,11 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import json
+import os
 import unittest
 
+from dpp.core.exceptions import CodecException
 from dpp.core.plugin import PluginType
 from tests.utils import load_plugin
 
@@ -24,10 +27,57 @@ class TestJsonPathScript(unittest.TestCase):
 
     plugin = load_plugin("JSONPath", PluginType.SCRIPT)
 
-    @unittest.skip("Missing valid input/output")
+    def _plugin(self, **config):
+        plugin = self.plugin.clone()
+        plugin.config.update(config)
+        return plugin
+
     def testPlugin(self):
-        self.assertEqual(self.plugin.run(
-            'abcdefghijklmnopqrstuvwxyz\n'
-            '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
-            '0123456789'
-        ), '0xc713178c')
+        self.assertEqual(self._plugin(expression='foo[*].baz').run(
+            '{"foo": [{"baz": 1}, {"baz": 2}]}'
+        ), os.linesep.join(['1', '2']))
+
+    def testJsonLines(self):
+        plugin = self._plugin(expression='a', format='JSON Lines', workers=1)
+        self.assertEqual(plugin.run('{"a": 1}\n\n{"a": "b"}\n{"c": 2}'), os.linesep.join(['1', '"b"']))
+        with self.assertRaisesRegex(CodecException, 'line 2'):
+            plugin.run('{"a": 1}\n{"a": ')
+
+    def testJsonArrayItems(self):
+        plugin = self._plugin(expression='a', format='JSON Array Items')
+        text = json.dumps([{"a": i, "b": "x" * (i % 7)} for i in range(2000)], indent=2)
+        chunks = [text[i:i + 100] for i in range(0, len(text), 100)]
+        self.assertEqual(''.join(plugin.run_stream(chunks)), os.linesep.join(map(str, range(2000))))
+        self.assertEqual(plugin.run('[1, {"a": 12}, [] ]'), '12')
+        with self.assertRaises(CodecException):
+            plugin.run('[{"a": 1} {"a": 2}]')
+
+    def testLosslessParsing(self):
+        plugin = self._plugin(expression='a')
+        self.assertEqual(plugin.run('{"a": 1180591620717411303424}'), '1180591620717411303424')
+        self.assertEqual(plugin.run('{"a": -18446744073709551617}'), '-18446744073709551617')
+        self.assertEqual(plugin.run('{"a": NaN}'), 'NaN')
+        self.assertEqual(plugin.run('{"a": 1e400}'), 'Infinity')
+        self.assertEqual(plugin.run('{"a": 0.1}'), '0.1')
+        # Bytes which are not valid UTF-8 are passed as surrogate escapes.
+        text = b'{"a": "\xff\xfe"}'.decode('utf-8', errors='surrogateescape')
+        self.assertEqual(plugin.run(text), '"\\udcff\\udcfe"')
+        plugin = self._plugin(expression='a', format='JSON Lines', workers=1)
+        self.assertEqual(plugin.run('{"a": 1180591620717411303424}\n[NaN]\n' + text),
+                         os.linesep.join(['1180591620717411303424', '"\\udcff\\udcfe"']))
+
+    def testJsonLinesProcessPool(self):
+        from dpp.core import json_query, pool
+        plugin = self._plugin(expression='a', format='JSON Lines', workers=2)
+        count = json_query.BATCH_SIZE * json_query.MIN_PARALLEL_BATCHES * 2
+        text = '\n'.join(f'{{"a": {i}}}' for i in range(count))
+        self.assertEqual(plugin.run(text), os.linesep.join(map(str, range(count))))
+        executor = pool.process_pool(2)
+        self.assertEqual(plugin.run(text), os.linesep.join(map(str, range(count))))
+        self.assertIs(pool.process_pool(2), executor)
+
+    def testInvalidInput(self):
+        with self.assertRaises(CodecException):
+            self._plugin(expression='foo').run('{"foo": ')
+        with self.assertRaises(CodecException):
+            self._plugin(expression='foo[').run('{}')
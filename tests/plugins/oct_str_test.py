@@ -37,3 +37,8 @@ class TestOctStrEncoder(unittest.TestCase):
             '4005405605507307213704305304705217'
             '6012060061062063064065066067070071'
         )
+
+    def testLargeInput(self):
+        decoder = load_plugin("Oct (str)", PluginType.DECODER)
+        input_text = ''.join(chr(i % 512) for i in range(100000))
+        self.assertEqual(decoder.run(self.plugin.run(input_text)), input_text)
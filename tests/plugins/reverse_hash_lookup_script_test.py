@@ -0,0 +1,82 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import hashlib
+import os
+import tempfile
+import unittest
+
+from dpp.core import digest_index
+from dpp.core.exceptions import CodecException
+from dpp.core.plugin import PluginType
+from tests.utils import load_plugin
+
+
+class TestReverseHashLookupScript(unittest.TestCase):
+
+    plugin = load_plugin("Reverse Hash Lookup", PluginType.SCRIPT)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.wordlist = os.path.join(self.directory.name, 'words.txt')
+        words = [f'word{number}' for number in range(1000)] + ['password', 'pässwörd', 'password']
+        with open(self.wordlist, 'wb') as f:
+            f.write('\r\n'.join(words).encode('utf-8'))
+        for algorithm in ['md5', 'sha1', 'nt']:
+            digest_index.build_index(self.wordlist, algorithm, max_workers=1, chunk_size=1024)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testPlugin(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({'index': self.wordlist})
+        self.assertEqual(plugin.run('\n'.join([
+            '5f4dcc3b5aa765d61d8327deb882cf99',
+            '67133d2455e80e2c81b2471e46e7adc842b930c7',
+            '8846F7EAEE8FB117AD06BDD830B7586C',
+            'd41d8cd98f00b204e9800998ecf8427e',
+            'not a hash',
+        ])).splitlines(), [
+            '5f4dcc3b5aa765d61d8327deb882cf99:password',
+            '67133d2455e80e2c81b2471e46e7adc842b930c7:word999',
+            '8846F7EAEE8FB117AD06BDD830B7586C:password',
+            'd41d8cd98f00b204e9800998ecf8427e',
+            'not a hash',
+        ])
+        self.assertEqual(''.join(plugin.run_stream(['5f4dcc3b5aa765d', '61d8327deb882cf99\n', 'x'])),
+                         os.linesep.join(['5f4dcc3b5aa765d61d8327deb882cf99:password', 'x']))
+
+    def testIndex(self):
+        with digest_index.DigestIndex(digest_index.index_path(self.wordlist, 'md5')) as index:
+            self.assertEqual(len(index), 1002)
+            self.assertEqual(index.algorithm, 'md5')
+            for word in ['word0', 'word500', 'pässwörd']:
+                self.assertEqual(index.lookup(hashlib.md5(word.encode('utf-8')).digest()), word.encode('utf-8'))
+            self.assertIsNone(index.lookup(hashlib.md5(b'missing').digest()))
+
+    def testMultiPassMerge(self):
+        path = os.path.join(self.directory.name, 'multi-pass.idx')
+        # The small chunks result in more runs than are merged at once.
+        digest_index.build_index(self.wordlist, 'md5', path, max_workers=1, chunk_size=64, fan_in=3)
+        with open(path, 'rb') as multi_pass, open(digest_index.index_path(self.wordlist, 'md5'), 'rb') as single_pass:
+            self.assertEqual(multi_pass.read(), single_pass.read())
+
+    def testMissingIndex(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({'index': os.path.join(self.directory.name, 'missing.txt')})
+        with self.assertRaises(CodecException):
+            plugin.run('5f4dcc3b5aa765d61d8327deb882cf99')
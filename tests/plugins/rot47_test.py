@@ -0,0 +1,36 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import unittest
+
+from dpp.core.plugin import PluginType
+from tests.utils import load_plugin
+
+
+class TestRot47Encoder(unittest.TestCase):
+
+    plugin = load_plugin("ROT47", PluginType.ENCODER)
+
+    def testPlugin(self):
+        self.assertEqual(self.plugin.run('Hello World!\n0123456789 ~'), 'w6==@ (@C=5P\n_`abcdefgh O')
+
+
+class TestRot47Decoder(unittest.TestCase):
+
+    plugin = load_plugin("ROT47", PluginType.DECODER)
+
+    def testPlugin(self):
+        self.assertEqual(self.plugin.run('w6==@ (@C=5P\n_`abcdefgh O'), 'Hello World!\n0123456789 ~')
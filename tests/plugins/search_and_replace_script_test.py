@@ -14,6 +14,8 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
 import unittest
 
 from dpp.core.plugin import PluginType
@@ -24,16 +26,16 @@ class TestSearchAndReplaceScript(unittest.TestCase):
 
     plugin = load_plugin("Search & Replace", PluginType.SCRIPT)
 
-    @unittest.skip("Setup fails")
+    def _plugin(self, **config):
+        plugin = self.plugin.clone()
+        plugin.config.update(config)
+        return plugin
+
     def testPlugin(self):
-        self.plugin.setup({
-            'search_term': 'abcdefghijklmnopqrstuvwxyz',
-            'replace_term': 'zyxwvutsrqponmlkjihgfedcba',
-            'should_match_case': False,
-            'is_regex': False
-        })
-        self.assertEqual(self.plugin.run(
-            'abcdefghijklmnopqrstuvwxyz\n'
+        plugin = self._plugin(search_term='abcdefghijklmnopqrstuvwxyz', replace_term='zyxwvutsrqponmlkjihgfedcba',
+                              should_match_case=False, is_regex=False)
+        self.assertEqual(plugin.run(
+            'ABCDEFGHIJKLMNOPQRSTUVWXYZ\n'
             '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
             '0123456789'
         ),
@@ -41,3 +43,34 @@ class TestSearchAndReplaceScript(unittest.TestCase):
             '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
             '0123456789'
         )
+
+    def testRegex(self):
+        self.assertEqual(self._plugin(search_term='(a)(b)', replace_term='\\2\\1', is_regex=True).run('abAB'), 'baAB')
+        self.assertEqual(self._plugin(search_term='a', replace_term='x', is_regex=True,
+                                      should_match_case=False).run('abAB'), 'xbxB')
+
+    def testRulesFile(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False) as f:
+            f.write('cat\tdog\ndog\tcat\n\ncatalog\tlist\n')
+        try:
+            plugin = self._plugin(rules_file=f.name)
+            self.assertEqual(plugin.run('cat dog catalog'), 'dog cat list')
+            replacer = plugin._codec.replacer(plugin.config)
+            replacer.replace('cat cat catalog')
+            self.assertEqual(replacer.hits, [2, 0, 1])
+        finally:
+            os.remove(f.name)
+
+    def testRegexRules(self):
+        from dpp.core.replace import Replacer, Rule
+        replacer = Replacer([Rule(r'(\d+)px', r'\1em'), Rule('#([0-9a-f]{3})', r'0x\1')], is_regex=True)
+        self.assertEqual(replacer.replace('12px #fff 3px'), '12em 0xfff 3em')
+        self.assertEqual(replacer.hits, [2, 1])
+
+    def testRunStream(self):
+        plugin = self._plugin(search_term='needle', replace_term='pin', should_match_case=False)
+        text = ''.join(f'{i} NeedLe hay ' for i in range(50000))
+        for size in (1, 7, 1000):
+            chunks = [text[i:i + size] for i in range(0, len(text), size)] if size > 1 else list(text[:5000])
+            expected = plugin.run(''.join(chunks))
+            self.assertEqual(''.join(plugin.run_stream(chunks)), expected)
@@ -30,6 +30,14 @@ class TestUnescapeStringScript(unittest.TestCase):
             '0123456789'
         ),
             'abcdefghijklmnopqrstuvwxyz\n'
-            '^Â°!"Â§$%&/()=?Â´`<>| ,.-;:_#+\'*~\n'
+            '^°!"§$%&/()=?´`<>| ,.-;:_#+\'*~\n'
             '0123456789'
         )
+
+    def testEscapeSequences(self):
+        self.assertEqual(self.plugin.run(
+            r'\x61\n\t\\ \'\" \101 ä \U0001f600 \N{DEGREE SIGN} \q'
+        ), 'a\n\t\\ \'" A ä \U0001f600 ° \\q')
+
+    def testMultiByteSequence(self):
+        self.assertEqual(self.plugin.run(r'\xc3\xa4 \303\244'), 'ä ä')
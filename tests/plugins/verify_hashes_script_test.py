@@ -0,0 +1,71 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
+import tempfile
+import unittest
+
+from dpp.core.exceptions import CodecException
+from dpp.core.plugin import PluginType
+from tests.utils import load_plugin
+
+
+class TestVerifyHashesScript(unittest.TestCase):
+
+    plugin = load_plugin("Verify Hashes", PluginType.SCRIPT)
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.wordlist = os.path.join(self.directory.name, 'words.txt')
+        with open(self.wordlist, 'wb') as f:
+            f.write('\r\n'.join([f'word{number}' for number in range(50)] + ['pässwörd', 'letmein']).encode('utf-8'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testPlugin(self):
+        from passlib.hash import apr_md5_crypt, phpass
+        plugin = self.plugin.clone()
+        plugin.config.update({'wordlist': self.wordlist})
+        apache_md5 = apr_md5_crypt.hash('pässwörd')
+        php = phpass.using(rounds=7).hash('word42')
+        unknown = '$P$9IQRaTwmfeRo7ud9Fh4E2PdI0S3r.L0'
+        self.assertEqual(plugin.run('\n'.join([apache_md5, php, unknown])).splitlines(), [
+            f'{apache_md5}:pässwörd',
+            f'{php}:word42',
+            unknown,
+        ])
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testVerify(self):
+        from passlib.hash import bsd_nthash, sun_md5_crypt
+        from dpp.core import hash_verify
+        hashes = [bsd_nthash.hash('letmein'), sun_md5_crypt.using(rounds=0).hash('word7')]
+        targets = hash_verify.identify(hashes + ['unknown'], ['phpass', 'bsd_nthash', 'sun_md5_crypt'])
+        self.assertEqual(targets, {hashes[0]: ['bsd_nthash'], hashes[1]: ['sun_md5_crypt']})
+        progress = []
+        found = hash_verify.verify(targets, self.wordlist, max_workers=1, chunk_size=5, progress=progress.append)
+        self.assertEqual(found, {hashes[0]: b'letmein', hashes[1]: b'word7'})
+        self.assertEqual(progress[-1].tested, 52)
+        self.assertEqual(progress[-1].cracked, 2)
+
+    @unittest.skipIf(plugin.check_dependencies(), "Missing dependencies")
+    def testNoSupportedHash(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({'wordlist': self.wordlist})
+        with self.assertRaises(CodecException):
+            plugin.run('not a hash')
@@ -0,0 +1,55 @@
+# vim: ts=8:sts=8:sw=8:noexpandtab
+#
+# This file is part of Decoder++
+#
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import unittest
+
+from dpp.core.plugin import PluginType
+from tests.utils import load_plugin
+
+PLAINTEXT = (
+    'Decoder++ is an extensible application for penetration testers and software developers to decode or encode data '
+    'into various formats. It supports a wide range of codecs and scripts, which can be chained together, and it can '
+    'be used either from the graphical user interface or from the command line. '
+)
+
+
+class TestXorScript(unittest.TestCase):
+
+    plugin = load_plugin("XOR", PluginType.SCRIPT)
+
+    def _xor(self, text: str, key: str, key_format: str = "Text") -> str:
+        plugin = self.plugin.clone()
+        plugin.config.update({"mode": "Apply Key", "key": key, "key_format": key_format})
+        return plugin.run(text)
+
+    def testApplyKey(self):
+        self.assertEqual(self._xor('abc', '01', 'Hex'), '`cb')
+        self.assertEqual(self._xor(self._xor(PLAINTEXT, 'secret'), 'secret'), PLAINTEXT)
+
+    def testRecoverSingleByteKey(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({"mode": "Recover Single-Byte Key", "top": 3})
+        lines = plugin.run(self._xor(PLAINTEXT, '2a', 'Hex')).splitlines()
+        self.assertEqual(len(lines), 3)
+        key, score, preview = lines[0].split('\t')
+        self.assertEqual(key, '2a')
+        self.assertTrue(PLAINTEXT.startswith(preview))
+
+    def testRecoverRepeatingKey(self):
+        plugin = self.plugin.clone()
+        plugin.config.update({"mode": "Recover Repeating Key"})
+        lines = plugin.run(self._xor(PLAINTEXT * 20, 'secret')).splitlines()
+        self.assertEqual(lines[0].split('\t')[0], 'secret'.encode().hex())
@@ -14,8 +14,10 @@
 #
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
+import os
 import unittest
 
+from dpp.core.exceptions import CodecException
 from dpp.core.plugin import PluginType
 from tests.utils import load_plugin
 
@@ -23,11 +25,30 @@ from tests.utils import load_plugin
 class TestXPathScript(unittest.TestCase):
     plugin = load_plugin("XPath", PluginType.SCRIPT)
 
-    @unittest.skip("Missing configuration")
+    def _plugin(self, **config):
+        plugin = self.plugin.clone()
+        plugin.config.update(config)
+        return plugin
+
     def testPlugin(self):
-        self.plugin.setup({
-            'xpath_expression', '//b'
-        })
-        self.assertEqual(self.plugin.run(
-            '<a><b>text</b></a>'
-        ), 'text')
+        self.assertEqual(self._plugin(xpath_expression='//b').run('<a><b>text</b>tail</a>'), '<b>text</b>')
+        self.assertEqual(self._plugin(xpath_expression='//b/text()').run('<a><b>x</b><b>y</b></a>'),
+                         os.linesep.join(['x', 'y']))
+        self.assertEqual(self._plugin(xpath_expression='count(//b)').run('<a><b/><b/></a>'), '2')
+
+    def testEncodingDeclaration(self):
+        self.assertEqual(self._plugin(xpath_expression='//b/text()').run(
+            '<?xml version="1.0" encoding="UTF-8"?><a><b>\u00e4</b></a>'), '\u00e4')
+
+    def testInvalidInput(self):
+        with self.assertRaises(CodecException):
+            self._plugin(xpath_expression='//b').run('<a><b>')
+        with self.assertRaises(CodecException):
+            self._plugin(xpath_expression='//b[').run('<a/>')
+
+    def testRecordTag(self):
+        plugin = self._plugin(xpath_expression='./name/text()', record_tag='item')
+        text = '<items>' + ''.join(f'<item><name>{i}</name><x/></item>' for i in range(5000)) + '</items>'
+        chunks = [text[i:i + 100] for i in range(0, len(text), 100)]
+        self.assertEqual(''.join(plugin.run_stream(chunks)), os.linesep.join(map(str, range(5000))))
+        self.assertEqual(plugin.run(text), os.linesep.join(map(str, range(5000))))
@@ -15,6 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 import unittest
+import zlib
 
 from dpp.core.plugin import PluginType
 from tests.utils import load_plugin
@@ -22,10 +23,9 @@ from tests.utils import load_plugin
 
 class TestZLibDecoder(unittest.TestCase):
 
-    encoder = load_plugin("ZLib", PluginType.DECODER)
+    encoder = load_plugin("ZLib", PluginType.ENCODER)
     decoder = load_plugin("ZLib", PluginType.DECODER)
 
-    @unittest.skip("decode(encode(text)) != text")
     def testEncodeDecode(self):
         input_text = 'abcdefghijklmnopqrstuvwxyz\n'
         self.assertEqual(self.decoder.run(
@@ -33,3 +33,19 @@ class TestZLibDecoder(unittest.TestCase):
                 input_text
             )
         ), input_text)
+
+    def testMultipleBlocks(self):
+        encoder = self.encoder.clone()
+        encoder.config.update({'block_size': '1', 'workers': '4'})
+        input_text = ''.join(chr(32 + i % 0x250) for i in range(10000))
+        input_bytes = input_text.encode('utf-8', errors='surrogateescape')
+        output_bytes = encoder.run(input_text).encode('utf-8', errors='surrogateescape')
+        self.assertEqual(zlib.decompress(output_bytes), input_bytes)
+
+    def testRunStream(self):
+        input_text = 'abcdefghijklmnopqrstuvwxyz\n'
+        self.assertEqual(''.join(self.encoder.run_stream(list(input_text))), self.encoder.run(input_text))
+
+    def testFormatDetection(self):
+        for input_bytes in [zlib.compress(b'abc'), zlib.compress(b'abc', wbits=-15), zlib.compress(b'abc', wbits=31)]:
+            self.assertEqual(self.decoder.run(input_bytes.decode('utf-8', errors='surrogateescape')), 'abc')